@@ -23,6 +23,14 @@ def create_app():
     app.json_encoder = CustomJSONEncoder
     db.init_app(app)
 
+    # Duración de las solicitudes y encabezado Server-Timing
+    from app.services.metrics_service import instrumentar_app
+    instrumentar_app(app)
+
+    # Cuerpos de solicitud enviados con Content-Encoding: gzip
+    from app.services.compresion_service import DescompresionSolicitud
+    app.wsgi_app = DescompresionSolicitud(app.wsgi_app)
+
     # Configurar CORS dinámicamente desde variables de entorno
     allowed_origin = os.getenv('CORS_ALLOWED_ORIGIN', 'http://localhost:4200')
     CORS(app, resources={r"/*": {"origins": allowed_origin}}, supports_credentials=True)
@@ -32,10 +40,12 @@ def create_app():
     # Importar y registrar los namespaces
     from app.controllers.auth_controller import auth_ns
     from app.controllers.project_controller import project_ns, file_upload_ns, validations_ns
+    from app.controllers.metrics_controller import metrics_ns
 
     api.add_namespace(auth_ns, path="/auth")
     api.add_namespace(project_ns, path="/projects")
     api.add_namespace(file_upload_ns, path="/upload")
     api.add_namespace(validations_ns, path='/validations')
+    api.add_namespace(metrics_ns, path='/metrics')
 
     return app
@@ -0,0 +1,29 @@
+# backend/app/controllers/metrics_controller.py
+from flask import Response
+from flask_restx import Namespace, Resource
+from app.services.metrics_service import generar_metricas
+
+metrics_ns = Namespace('metrics', description='Métricas de la aplicación para Prometheus')
+
+@metrics_ns.route('')
+class MetricsResource(Resource):
+    def get(self):
+        """
+        Expone las métricas de la aplicación en el formato de texto de Prometheus.
+
+        **Métricas principales:**
+        - `validador_etapa_segundos`: Histograma de la duración de cada etapa de las cargas
+          (`plan`, `esquema`, `lectura`, `validacion`, `unicidad`, `ddl`, `carga`, `indices`,
+          `fusion`, `intercambio`, `commit`) y de las consultas, por proyecto.
+        - `validador_validacion_regla_segundos`: Histograma del tiempo de cada regla por carga,
+          por proyecto y regla.
+        - `validador_carga_segundos`, `validador_cargas_total`: Duración y resultado de las cargas.
+        - `validador_carga_filas_total`, `validador_carga_bytes_total`,
+          `validador_validacion_errores_total`: Filas, bytes y errores procesados.
+        - `validador_http_solicitud_segundos`: Duración de las solicitudes por endpoint.
+
+        **Respuesta:**
+        - 200: Métricas en el formato de texto de Prometheus (`text/plain`).
+        """
+        cuerpo, content_type = generar_metricas()
+        return Response(cuerpo, status=200, content_type=content_type)
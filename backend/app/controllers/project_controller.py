@@ -1,14 +1,29 @@
 # backend/app/controllers/project_controller.py
 import io
+import os
 import pandas as pd
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context, send_file
 from flask_restx import Namespace, Resource , fields 
 from app.services.auth_service import validate_token
+from app.services.upload_service import ejecutar_carga, MODO_CREAR, MODO_REEMPLAZAR, MODO_UPSERT, MODO_AGREGAR
+from app.services.job_service import encolar_carga, encolar_archivo, cargar_archivo, ruta_spool, serializar_trabajo
+from app.services.reanudable_service import crear_carga, recibir_bloque, estado_carga, leer_sesion, finalizar_carga, cancelar_carga, ErrorCargaReanudable
+from app.services.error_report_service import opciones_reporte, ruta_reporte
+from app.services.cache_service import respuesta_cacheada, clave_solicitud, invalidar_proyecto
+from app.services.table_data_service import tabla_existe, tiene_columna_id, leer_pagina, leer_muestra, stream_ndjson
+from app.services.metrics_service import Cronometro, DATOS_FILAS
+from app.services.compresion_service import abrir_archivo
+from app.services.arrow_service import formato_datos
+from app.services.lote_service import archivos_solicitud, leer_mapeo, asignar_proyectos, procesar_lote, encolar_lote, ErrorLote
+from app.services.prevalidacion_service import prevalidar_archivo, opciones_muestra
+from app.services.validation_service import invalidar_plan
 from werkzeug.utils import secure_filename
-from app.models.project import ProyectoValidaciones, ProyectoEsquemas, ValidacionesCampos, ValidacionesDefinidas
+from app.models.project import ProyectoValidaciones, ProyectoEsquemas, ValidacionesCampos, ValidacionesDefinidas, TrabajosCarga
 from app import db
 from sqlalchemy import text
 from functools import wraps
+from datetime import datetime
+from collections import defaultdict
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -57,31 +72,83 @@ def require_auth(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Campos que puede devolver el listado de proyectos (parámetro `fields`)
+CAMPOS_LISTADO_PROYECTOS = ["id", "nombre_proyecto", "nombre_tabla", "fecha_creacion", "fecha_actualizacion", "creado_modificado_por", "esquemas", "validaciones"]
+MAX_LIMIT_PROYECTOS = 1000
+MAX_LIMIT_DATOS = 10000
+
 @project_ns.route('/projects')
 @project_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@project_ns.param('after_id', 'Devuelve los proyectos con ID mayor a este valor (paginación por cursor)', _in='query', type=int, required=False)
+@project_ns.param('limit', f'Cantidad máxima de proyectos a devolver (máximo {MAX_LIMIT_PROYECTOS})', _in='query', type=int, required=False)
+@project_ns.param('fields', 'Campos a devolver separados por coma, por ejemplo "id,nombre_proyecto" para omitir esquemas y validaciones', _in='query', required=False)
 class ProjectListResource(Resource):
     @require_auth
     def get(self):
         """
-        Obtiene una lista de todos los proyectos.
+        Obtiene una lista de los proyectos.
+
+        Este endpoint devuelve los proyectos registrados, ordenados por ID, junto con sus esquemas
+        y validaciones asociadas. Los esquemas y validaciones se consultan en bloque, con un número
+        fijo de consultas sin importar la cantidad de proyectos.
 
-        Este endpoint devuelve todos los proyectos registrados, junto con sus esquemas y validaciones asociadas.
+        Parámetros:
+        - after_id (int, opcional): Cursor; devuelve los proyectos con ID mayor a este valor.
+        - limit (int, opcional): Tamaño de la página. Sin este parámetro se devuelven todos.
+        - fields (str, opcional): Campos a incluir, separados por coma.
 
         Retorna:
-        - 200: Lista de proyectos con sus detalles.
-        - 404: Si no se encuentran proyectos.
+        - 200: Lista de proyectos con sus detalles y `next_after_id` para pedir la página siguiente
+          (null si no hay más).
+        - 400: Si no se encuentran proyectos o los parámetros son inválidos.
         - 500: Si ocurre un error en el servidor.
         """
+        after_id = request.args.get('after_id', type=int)
+        limit = request.args.get('limit', type=int)
+        fields = request.args.get('fields')
+
+        if limit is not None and limit <= 0:
+            return {"error": "El parámetro 'limit' debe ser mayor a cero."}, 400
+
+        campos = CAMPOS_LISTADO_PROYECTOS
+        if fields:
+            campos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+            campos_invalidos = [campo for campo in campos if campo not in CAMPOS_LISTADO_PROYECTOS]
+            if campos_invalidos:
+                return {
+                    "error": f"Campos no válidos: {campos_invalidos}",
+                    "campos_permitidos": CAMPOS_LISTADO_PROYECTOS
+                }, 400
+
+        return respuesta_cacheada(
+            clave_solicitud('proyectos'),
+            lambda: self._listar_proyectos(after_id, limit, campos)
+        )
+
+    def _listar_proyectos(self, after_id, limit, campos):
+        """
+        Consulta y serializa una página del listado de proyectos.
+        """
         try:
-            projects = ProyectoValidaciones.query.all()
-            if not projects:
+            query = ProyectoValidaciones.query.order_by(ProyectoValidaciones.id)
+            if after_id is not None:
+                query = query.filter(ProyectoValidaciones.id > after_id)
+            if limit is not None:
+                query = query.limit(min(limit, MAX_LIMIT_PROYECTOS))
+            projects = query.all()
+
+            if not projects and after_id is None:
                 return {"message": "No se encontraron proyectos."}, 400
 
-            projects_data = []
-            for project in projects:
-                esquemas = ProyectoEsquemas.query.filter_by(proyecto_id=project.id).all()
-                esquemas_data = [
-                    {
+            project_ids = [project.id for project in projects]
+
+            esquemas_por_proyecto = defaultdict(list)
+            if "esquemas" in campos and project_ids:
+                esquemas = ProyectoEsquemas.query.filter(
+                    ProyectoEsquemas.proyecto_id.in_(project_ids)
+                ).order_by(ProyectoEsquemas.id).all()
+                for esquema in esquemas:
+                    esquemas_por_proyecto[esquema.proyecto_id].append({
                         "campo_nombre": esquema.campo_nombre,
                         "tipo_dato": esquema.tipo_dato,
                         "requerido": esquema.requerido,
@@ -89,34 +156,41 @@ class ProjectListResource(Resource):
                         "valores_permitidos": esquema.valores_permitidos,
                         "es_clave_primaria": esquema.es_clave_primaria,
                         "es_unico": esquema.es_unico
-                    }
-                    for esquema in esquemas
-                ]
-
-                validaciones = ValidacionesCampos.query.filter_by(proyecto_id=project.id).all()
-                validaciones_data = [
-                    {
+                    })
+
+            validaciones_por_proyecto = defaultdict(list)
+            if "validaciones" in campos and project_ids:
+                validaciones = ValidacionesCampos.query.filter(
+                    ValidacionesCampos.proyecto_id.in_(project_ids)
+                ).order_by(ValidacionesCampos.id).all()
+                for validacion in validaciones:
+                    validaciones_por_proyecto[validacion.proyecto_id].append({
                         "campo_nombre": validacion.campo_nombre,
                         "validacion": validacion.validacion_id,
                         "valor": validacion.valor,
                         "mensaje_error": validacion.mensaje_error
-                    }
-                    for validacion in validaciones
-                ]
+                    })
 
+            projects_data = []
+            for project in projects:
                 # Convertir objetos datetime a cadenas usando .isoformat()
-                projects_data.append({
+                project_data = {
                     "id": project.id,
                     "nombre_proyecto": project.nombre_proyecto,
                     "nombre_tabla": project.nombre_tabla,
                     "fecha_creacion": project.fecha_creacion.isoformat() if project.fecha_creacion else None,
                     "fecha_actualizacion": project.fecha_actualizacion.isoformat() if project.fecha_actualizacion else None,
                     "creado_modificado_por": project.usuario_modificacion,
-                    "esquemas": esquemas_data,
-                    "validaciones": validaciones_data
-                })
+                    "esquemas": esquemas_por_proyecto[project.id],
+                    "validaciones": validaciones_por_proyecto[project.id]
+                }
+                projects_data.append({campo: project_data[campo] for campo in campos})
 
-            return {"projects": projects_data}, 200
+            hay_mas = limit is not None and len(projects) == min(limit, MAX_LIMIT_PROYECTOS)
+            return {
+                "projects": projects_data,
+                "next_after_id": projects[-1].id if hay_mas else None
+            }, 200
 
 
         except Exception as e:
@@ -126,45 +200,47 @@ class ProjectListResource(Resource):
 @project_ns.route('/projectsById/<int:project_id>')
 @project_ns.param('token', 'Token de autenticación', _in='query', required=False)
 @project_ns.param('project_id', 'ID del proyecto a consultar')
+@project_ns.param('limite_datos', 'Filas de la tabla asociada a incluir como muestra (0 para omitirlas)', _in='query', type=int, required=False)
 class ProjectResource(Resource):
     @project_ns.doc('get_project')
     def get(self, project_id):
         """
         Obtiene los detalles de un proyecto específico por su ID.
 
-        Este endpoint devuelve la información de un proyecto, junto con los datos de la tabla asociada,
-        sus esquemas y las validaciones aplicadas.
+        Este endpoint devuelve la información de un proyecto, junto con una muestra de los datos de la
+        tabla asociada, sus esquemas y las validaciones aplicadas. Los datos completos se obtienen
+        paginados desde `/projectsById/<project_id>/datos`.
 
         Parámetros:
         - project_id (int): ID del proyecto a consultar.
+        - limite_datos (int, opcional): Filas de muestra de la tabla asociada (por defecto
+          `PROJECT_DATA_PREVIEW_ROWS`).
 
         Retorna:
         - 200: Detalles del proyecto.
         - 404: Si el proyecto no se encuentra o la tabla asociada no existe.
         - 500: Si ocurre un error en el servidor.
         """    
+        return respuesta_cacheada(
+            clave_solicitud('proyecto', project_id),
+            lambda: self._obtener_proyecto(project_id)
+        )
+
+    def _obtener_proyecto(self, project_id):
+        """
+        Consulta y serializa los detalles de un proyecto.
+        """
         try:
             project = ProyectoValidaciones.query.get(project_id)
             if not project:
                 return {"error": "Proyecto no encontrado."}, 404
 
             table_name = project.nombre_tabla.lower()
-            table_exists_query = text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = 'datos'
-                    AND table_name = :table_name
-                );
-            """)
-            table_exists = db.session.execute(table_exists_query, {"table_name": table_name}).scalar()
-
-            if not table_exists:
+            if not tabla_existe(table_name):
                 return {"error": f"La tabla '{table_name}' no existe en el esquema 'datos'."}, 404
 
-            table_data_query = text(f"SELECT * FROM datos.{table_name};")
-            table_data = db.session.execute(table_data_query).mappings().all()
-
-            table_data_serialized = [dict(row) for row in table_data]
+            limite_datos = request.args.get('limite_datos', current_app.config['PROJECT_DATA_PREVIEW_ROWS'], type=int)
+            table_data_serialized, next_after_id = leer_muestra(table_name, limite_datos) if limite_datos > 0 else ([], None)
 
             esquemas = ProyectoEsquemas.query.filter_by(proyecto_id=project.id).all()
             esquemas_data = [
@@ -213,11 +289,13 @@ class ProjectResource(Resource):
                 "validaciones": validaciones_data,
                 "tabla_asociada": {
                     "nombre_tabla": table_name,
-                    "datos": table_data_serialized
+                    "datos": table_data_serialized,
+                    "next_after_id": next_after_id
                 }
             }
 
-            return jsonify({"project": project_data}, 200)
+            # Mismo cuerpo que producía jsonify({"project": project_data}, 200)
+            return [{"project": project_data}, 200], 200
 
         except Exception as e:
             logger.error(f"Error al obtener el proyecto: {str(e)}")
@@ -225,6 +303,69 @@ class ProjectResource(Resource):
 
 
 
+@project_ns.route('/projectsById/<int:project_id>/datos')
+@project_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@project_ns.param('project_id', 'ID del proyecto a consultar')
+@project_ns.param('after_id', 'Devuelve las filas con id mayor a este valor (paginación por cursor)', _in='query', type=int, required=False)
+@project_ns.param('limit', f'Filas por página (máximo {MAX_LIMIT_DATOS})', _in='query', type=int, required=False)
+@project_ns.param('formato', '"json" (página) o "ndjson" (todas las filas en streaming)', _in='query', required=False)
+class ProjectDataResource(Resource):
+    @require_auth
+    def get(self, project_id):
+        """
+        Obtiene las filas de la tabla asociada a un proyecto.
+
+        En formato `json` devuelve una página ordenada por `id` y el cursor `next_after_id` para
+        pedir la siguiente. En formato `ndjson` transmite todas las filas desde `after_id`, una por
+        línea, leyendo la tabla con un cursor del lado del servidor.
+
+        Parámetros:
+        - project_id (int): ID del proyecto a consultar.
+        - after_id (int, opcional): Cursor de paginación.
+        - limit (int, opcional): Filas por página en formato `json`.
+        - formato (str, opcional): `json` (por defecto) o `ndjson`.
+
+        Retorna:
+        - 200: Página de datos o flujo NDJSON.
+        - 400: Si los parámetros son inválidos o la tabla no tiene columna `id`.
+        - 404: Si el proyecto o la tabla asociada no existen.
+        - 500: Si ocurre un error en el servidor.
+        """
+        after_id = request.args.get('after_id', type=int)
+        limit = request.args.get('limit', 1000, type=int)
+        formato = request.args.get('formato', 'json').lower()
+
+        if formato not in ('json', 'ndjson'):
+            return {"error": "El parámetro 'formato' debe ser 'json' o 'ndjson'."}, 400
+        if limit <= 0:
+            return {"error": "El parámetro 'limit' debe ser mayor a cero."}, 400
+
+        try:
+            project = ProyectoValidaciones.query.get(project_id)
+            if not project:
+                return {"error": "Proyecto no encontrado."}, 404
+
+            table_name = project.nombre_tabla.lower()
+            if not tabla_existe(table_name):
+                return {"error": f"La tabla '{table_name}' no existe en el esquema 'datos'."}, 404
+            if not tiene_columna_id(table_name):
+                return {"error": f"La tabla '{table_name}' no tiene la columna 'id' necesaria para paginar."}, 400
+
+            if formato == 'ndjson':
+                return Response(stream_with_context(stream_ndjson(table_name, after_id)), mimetype='application/x-ndjson')
+
+            cronometro = Cronometro(table_name)
+            with cronometro.etapa('consulta'):
+                datos, next_after_id = leer_pagina(table_name, after_id, min(limit, MAX_LIMIT_DATOS))
+            cronometro.registrar()
+            DATOS_FILAS.labels(table_name).inc(len(datos))
+            return {"nombre_tabla": table_name, "datos": datos, "next_after_id": next_after_id}, 200
+
+        except Exception as e:
+            logger.error(f"Error al obtener los datos del proyecto: {str(e)}")
+            return {"error": f"Error al obtener los datos del proyecto: {str(e)}"}, 500
+
+
 project_model = project_ns.model('Project', {
     'nombre_proyecto': fields.String(required=True, description='Nombre del proyecto'),
     'nombre_tabla': fields.String(required=True, description='Nombre de la tabla asociada'),
@@ -311,6 +452,8 @@ class CreateProjectResource(Resource):
 
             db.session.commit()
 
+            invalidar_proyecto(nuevo_proyecto.id)
+
             # Retornar el ID del proyecto creado
             return {"message": "Proyecto creado exitosamente.", "project_id": nuevo_proyecto.id}, 201
 
@@ -322,6 +465,9 @@ class CreateProjectResource(Resource):
 @project_ns.route('/upload/<int:project_id>', methods=['POST'])
 @project_ns.param('token', 'Token de autenticación', _in='query', required=False)
 @project_ns.param('project_id', 'ID del proyecto asociado')
+@project_ns.param('asincrono', 'Si es "true", encola la carga y responde 202 con el ID del trabajo', _in='query', required=False)
+@project_ns.param('max_errores', 'Errores a partir de los cuales se detiene la validación (0 = sin límite)', _in='query', type=int, required=False)
+@project_ns.param('reporte_errores', 'Formato del detalle de errores: "json" (en la respuesta) o "csv" (descargable)', _in='query', required=False)
 class FileUploadResource(Resource):
     @require_auth
     @project_ns.doc('upload_file', params={'project_id': 'ID del proyecto asociado'})
@@ -337,169 +483,18 @@ class FileUploadResource(Resource):
         if file.filename == '':
             return {"error": "El nombre del archivo está vacío"}, 400
 
-        if file and allowed_file(file.filename):
-            try:
-                file_content = file.read().decode('utf-8')
-                csv_data = io.StringIO(file_content)
-                df = pd.read_csv(csv_data)
-
-                esquemas = ProyectoEsquemas.query.filter_by(proyecto_id=project_id).all()
-                nombres_campos_db = {esquema.campo_nombre for esquema in esquemas}
-
-                nombres_campos_csv = set(df.columns)
-                if nombres_campos_db != nombres_campos_csv:
-                    db.session.delete(project)
-                    db.session.commit()
-                    return {
-                        "error": "El esquema del archivo no es correcto.",
-                        "campos_esperados": list(nombres_campos_db),
-                        "nombre_proyecto": project.nombre_proyecto
-                    }, 400
-
-                validaciones = ValidacionesCampos.query.filter_by(proyecto_id=project_id).all()
-
-                errores = []
-
-                for index, row in df.iterrows():
-                    for validacion in validaciones:
-                        try:
-                            validacion_definida = ValidacionesDefinidas.query.filter_by(id=validacion.validacion_id).first()
-
-                            if not validacion_definida:
-                                db.session.delete(project)
-                                db.session.commit()
-                                return {"error": f"No se encontró la validación para la regla con id {validacion.validacion_id}."}, 400
-
-                            validation_module_path = f'app.services.validations.{validacion_definida.nombre_regla}'
-                            validation_module = __import__(validation_module_path, fromlist=['validate'])
-
-                            # Extraer los parámetros necesarios desde el valor JSON
-                            parametros = validacion.valor if validacion.valor else {}
-
-                            # Verificar si hay parámetros requeridos que faltan en el JSON
-                            parametros_faltantes = [param for param in self.get_required_params(validation_module.validate) if param != "value" and param not in parametros]
-                            if parametros_faltantes:
-                                db.session.delete(project)
-                                db.session.commit()
-                                return {
-                                    "error": f"Faltan parámetros requeridos para la validación '{validacion_definida.nombre_regla}'. Parámetros faltantes: {parametros_faltantes}"
-                                }, 400
-
-                            # Extraer valor de la celda que se va a validar
-                            valor_celda = row[validacion.campo_nombre]
-
-                            # Llamar a la función de validación con los parámetros correctos
-                            is_valid, error_message = validation_module.validate(valor_celda, **parametros)
-
-                            if not is_valid:
-                                errores.append({
-                                    "fila": index + 1,
-                                    "campo": validacion.campo_nombre,
-                                    "valor_incorrecto": valor_celda,
-                                    "mensaje_error": error_message
-                                })
-                        except ModuleNotFoundError:
-                            expected_modules = [f'app.services.validations.{v.nombre_regla}' for v in ValidacionesDefinidas.query.all()]
-                            db.session.delete(project)
-                            db.session.commit()
-                            return {
-                                "error": f"Módulo de validación no encontrado para la regla '{validacion_definida.nombre_regla}'.",
-                                "modulos_esperados": expected_modules
-                            }, 400
-                        except AttributeError:
-                            db.session.delete(project)
-                            db.session.commit()
-                            return {
-                                "error": f"La función de validación no se encontró para la regla '{validacion_definida.nombre_regla}'"
-                            }, 400
-
-                if errores:
-                    db.session.delete(project)
-                    db.session.commit()
-                    return {
-                        "error": "Se encontraron errores en la validación del archivo.",
-                        "errores": errores
-                    }, 400
-
-                # Validar si la tabla ya existe
-                table_name = project.nombre_tabla
-                table_exists_query = text(f"""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables
-                        WHERE table_schema = 'datos'
-                        AND table_name = :table_name
-                    );
-                """)
-                table_exists = db.session.execute(table_exists_query, {"table_name": table_name}).scalar()
-
-                if table_exists:
-                    db.session.delete(project)
-                    db.session.commit()
-                    return {"error": f"La tabla '{table_name}' ya existe en el esquema 'datos'."}, 400
-
-                # Crear la tabla si no existe
-                create_table_sql = f"CREATE TABLE datos.{table_name} (id SERIAL PRIMARY KEY, "
-                column_definitions = []
-
-                for esquema in esquemas:
-                    tipo_dato_sql = self.map_tipo_dato_to_sql(esquema.tipo_dato)
-                    column_definitions.append(f"{esquema.campo_nombre} {tipo_dato_sql}")
-
-                create_table_sql += ", ".join(column_definitions) + ");"
-                db.session.execute(text(create_table_sql))
-
-                # Limpiar la tabla antes de insertar los nuevos datos
-                db.session.execute(text(f"DELETE FROM datos.{table_name};"))
-
-                for _, row in df.iterrows():
-                    columns = ", ".join(row.index)
-                    values = ", ".join([f"'{value}'" for value in row.values])
-                    db.session.execute(text(f"INSERT INTO datos.{table_name} ({columns}) VALUES ({values});"))
-
-                db.session.commit()
-
-                return {"message": "Archivo procesado e insertado exitosamente"}, 200
+        try:
+            opciones = opciones_reporte(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
-            except Exception as e:
-                db.session.rollback()
-                logger.error(f"Error al procesar el archivo: {str(e)}")
-                # Eliminar el proyecto en caso de cualquier error
-                db.session.delete(project)
-                db.session.commit()
-                return {"error": f"Error al procesar el archivo y el proyecto fue eliminado: {str(e)}"}, 500
+        if file and allowed_file(file.filename):
+            if request.args.get('asincrono', '').lower() == 'true':
+                return encolar_carga(project, file, MODO_CREAR, opciones)
+            return ejecutar_carga(project, abrir_archivo(file.stream, file.filename), MODO_CREAR, opciones, formato_datos(file.filename))
 
         return {"error": "Tipo de archivo no permitido"}, 400
 
-    def get_required_params(self, func):
-        """
-        Extrae los nombres de los parámetros requeridos por la función de validación.
-
-        Parámetros:
-        - func: La función de validación de la que se extraerán los parámetros.
-
-        Retorna:
-        - Lista de nombres de parámetros requeridos.
-        """
-        from inspect import signature
-        sig = signature(func)
-        return [param.name for param in sig.parameters.values() if param.default == param.empty and param.name != "value"]
-
-
-
-
-    def map_tipo_dato_to_sql(self, tipo_dato):
-        """
-        Mapea el tipo de dato del esquema al tipo de dato SQL correspondiente.
-        """
-        if tipo_dato == 'integer':
-            return 'INTEGER'
-        elif tipo_dato == 'varchar':
-            return 'VARCHAR(255)'
-        elif tipo_dato == 'date':
-            return 'DATE'
-        # Agrega más mapeos según sea necesario
-        return 'TEXT'
-
 
 @project_ns.route('/delete', methods=['DELETE'])
 @project_ns.param('token', 'Token de autenticación', _in='query', required=False)
@@ -537,6 +532,9 @@ class DeleteMultipleProjectsResource(Resource):
                 db.session.delete(project)
             
             db.session.commit()
+            for project_id in project_ids:
+                invalidar_plan(project_id)
+                invalidar_proyecto(project_id)
             return {"message": "Proyectos eliminados exitosamente."}, 200
 
         except Exception as e:
@@ -598,7 +596,9 @@ class UpdateProjectResource(Resource):
 
             project.nombre_proyecto = data["nombre_proyecto"]
             project.usuario_modificacion = data["usuario_modificacion"]
-            db.session.commit()
+            # Forzar el cambio de versión aunque solo cambien los esquemas o validaciones; la
+            # versión, los esquemas y las validaciones se confirman en una sola transacción
+            project.fecha_actualizacion = datetime.utcnow()
 
             ProyectoEsquemas.query.filter_by(proyecto_id=project.id).delete()
             for esquema in data["esquemas"]:
@@ -619,6 +619,7 @@ class UpdateProjectResource(Resource):
                 # Buscando el ID de la validación basado en el nombre de la regla
                 validacion_definida = ValidacionesDefinidas.query.filter_by(nombre_regla=validacion["nombre_regla"]).first()
                 if not validacion_definida:
+                    db.session.rollback()
                     return {"error": f"La regla de validación '{validacion['nombre_regla']}' no existe en las validaciones definidas."}, 400
 
                 nueva_validacion = ValidacionesCampos(
@@ -631,6 +632,8 @@ class UpdateProjectResource(Resource):
                 db.session.add(nueva_validacion)
 
             db.session.commit()
+            invalidar_plan(project.id)
+            invalidar_proyecto(project.id)
 
             return {"message": "Proyecto actualizado exitosamente."}, 200
 
@@ -640,10 +643,10 @@ class UpdateProjectResource(Resource):
             return {"error": f"Error al actualizar el proyecto: {str(e)}"}, 500
 
 
-ALLOWED_EXTENSIONS = {'csv'}
 def allowed_file(filename):
     """
-    Verifica si el archivo tiene una extensión permitida.
+    Verifica si el archivo tiene una extensión permitida: CSV, también comprimido
+    (`.csv.gz`, `.csv.bz2` y `.csv.zst`), Parquet (`.parquet`) o Arrow IPC (`.arrow`).
 
     Parámetros:
     - filename (str): Nombre del archivo.
@@ -651,12 +654,17 @@ def allowed_file(filename):
     Retorna:
     - bool: True si el archivo tiene una extensión permitida, False de lo contrario.
     """    
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return formato_datos(filename) is not None
 
    
 @file_upload_ns.route('/<int:project_id>', methods=['POST'])
 @file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
 @file_upload_ns.param('project_id', 'ID del proyecto asociado')
+@file_upload_ns.param('asincrono', 'Si es "true", encola la carga y responde 202 con el ID del trabajo', _in='query', required=False)
+@file_upload_ns.param('modo', 'Modo de carga: "reemplazar" (por defecto) reemplaza la tabla; "upsert" inserta o actualiza por los campos clave; "agregar" agrega las filas', _in='query', required=False)
+@file_upload_ns.param('eliminar_faltantes', 'En modo "upsert", si es "true" elimina las filas cuya clave no está en el archivo', _in='query', required=False)
+@file_upload_ns.param('max_errores', 'Errores a partir de los cuales se detiene la validación (0 = sin límite)', _in='query', type=int, required=False)
+@file_upload_ns.param('reporte_errores', 'Formato del detalle de errores: "json" (en la respuesta) o "csv" (descargable)', _in='query', required=False)
 class FileUploadResource(Resource):
     @require_auth
     @file_upload_ns.doc('upload_file', params={'project_id': 'ID del proyecto asociado'})
@@ -672,138 +680,377 @@ class FileUploadResource(Resource):
         if file.filename == '':
             return {"error": "El nombre del archivo está vacío"}, 400
 
+        try:
+            opciones = opciones_reporte(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        modo = request.args.get('modo', MODO_REEMPLAZAR).lower()
+        if modo not in (MODO_REEMPLAZAR, MODO_UPSERT, MODO_AGREGAR):
+            return {"error": f"El parámetro 'modo' debe ser '{MODO_REEMPLAZAR}', '{MODO_UPSERT}' o '{MODO_AGREGAR}'."}, 400
+        if modo == MODO_UPSERT:
+            tiene_claves = ProyectoEsquemas.query.filter_by(proyecto_id=project_id, es_clave_primaria=True).first()
+            if not tiene_claves:
+                return {"error": "El proyecto no tiene campos marcados como clave primaria."}, 400
+            opciones["eliminar_faltantes"] = request.args.get('eliminar_faltantes', '').lower() == 'true'
+
         if file and allowed_file(file.filename):
-            try:
-                file_content = file.read().decode('utf-8')
-                csv_data = io.StringIO(file_content)
-                df = pd.read_csv(csv_data)
-
-                esquemas = ProyectoEsquemas.query.filter_by(proyecto_id=project_id).all()
-                nombres_campos_db = {esquema.campo_nombre for esquema in esquemas}
-
-                nombres_campos_csv = set(df.columns)
-                if nombres_campos_db != nombres_campos_csv:
-                    db.session.delete(project)
-                    db.session.commit()
-                    return {
-                        "error": "El esquema del archivo no es correcto.",
-                        "campos_esperados": list(nombres_campos_db),
-                        "nombre_proyecto": project.nombre_proyecto
-                    }, 400
-
-                validaciones = ValidacionesCampos.query.filter_by(proyecto_id=project_id).all()
-
-                errores = []
-
-                for index, row in df.iterrows():
-                    for validacion in validaciones:
-                        try:
-                            validacion_definida = ValidacionesDefinidas.query.filter_by(id=validacion.validacion_id).first()
-
-                            if not validacion_definida:
-                                db.session.delete(project)
-                                db.session.commit()
-                                return {"error": f"No se encontró la validación para la regla con id {validacion.validacion_id}."}, 400
-
-                            validation_module_path = f'app.services.validations.{validacion_definida.nombre_regla}'
-                            validation_module = __import__(validation_module_path, fromlist=['validate'])
-
-                            # Extraer los parámetros necesarios desde el valor JSON
-                            parametros = validacion.valor if validacion.valor else {}
-
-                            # Verificar si hay parámetros requeridos que faltan en el JSON
-                            parametros_faltantes = [param for param in self.get_required_params(validation_module.validate) if param != "value" and param not in parametros]
-                            if parametros_faltantes:
-                                db.session.delete(project)
-                                db.session.commit()
-                                return {
-                                    "error": f"Faltan parámetros requeridos para la validación '{validacion_definida.nombre_regla}'. Parámetros faltantes: {parametros_faltantes}"
-                                }, 400
-
-                            # Extraer valor de la celda que se va a validar
-                            valor_celda = row[validacion.campo_nombre]
-
-                            # Llamar a la función de validación con los parámetros correctos
-                            is_valid, error_message = validation_module.validate(valor_celda, **parametros)
-
-                            if not is_valid:
-                                errores.append({
-                                    "fila": index + 1,
-                                    "campo": validacion.campo_nombre,
-                                    "valor_incorrecto": valor_celda,
-                                    "mensaje_error": error_message
-                                })
-                        except ModuleNotFoundError:
-                            expected_modules = [f'app.services.validations.{v.nombre_regla}' for v in ValidacionesDefinidas.query.all()]
-                            db.session.delete(project)
-                            db.session.commit()
-                            return {
-                                "error": f"Módulo de validación no encontrado para la regla '{validacion_definida.nombre_regla}'.",
-                                "modulos_esperados": expected_modules
-                            }, 400
-                        except AttributeError:
-                            db.session.delete(project)
-                            db.session.commit()
-                            return {
-                                "error": f"La función de validación no se encontró para la regla '{validacion_definida.nombre_regla}'"
-                            }, 400
-
-                if errores:
-                    db.session.delete(project)
-                    db.session.commit()
-                    return {
-                        "error": "Se encontraron errores en la validación del archivo.",
-                        "errores": errores
-                    }, 400
-
-                # Validar si la tabla ya existe
-                table_name = project.nombre_tabla
-                
-                # Limpiar la tabla antes de insertar los nuevos datos
-                db.session.execute(text(f"DELETE FROM datos.{table_name};"))
-
-                for _, row in df.iterrows():
-                    columns = ", ".join(row.index)
-                    values = ", ".join([f"'{value}'" for value in row.values])
-                    db.session.execute(text(f"INSERT INTO datos.{table_name} ({columns}) VALUES ({values});"))
-
-                db.session.commit()
-
-                return {"message": "Archivo procesado e insertado exitosamente"}, 200
-
-            except Exception as e:
-                db.session.rollback()
-                logger.error(f"Error al procesar el archivo: {str(e)}")
-                return {"error": f"Error al procesar el archivo y el proyecto fue eliminado: {str(e)}"}, 500
+            if request.args.get('asincrono', '').lower() == 'true':
+                return encolar_carga(project, file, modo, opciones)
+            return ejecutar_carga(project, abrir_archivo(file.stream, file.filename), modo, opciones, formato_datos(file.filename))
 
         return {"error": "Tipo de archivo no permitido"}, 400
 
-    def get_required_params(self, func):
+
+@file_upload_ns.route('/lote', methods=['POST'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('asincrono', 'Si es "true", encola un trabajo por archivo y responde 202 con sus IDs', _in='query', required=False)
+@file_upload_ns.param('modo', 'Modo de carga de todos los archivos: "reemplazar" (por defecto), "upsert" o "agregar"', _in='query', required=False)
+@file_upload_ns.param('eliminar_faltantes', 'En modo "upsert", si es "true" elimina las filas cuya clave no está en el archivo', _in='query', required=False)
+@file_upload_ns.param('max_errores', 'Errores a partir de los cuales se detiene la validación de cada archivo (0 = sin límite)', _in='query', type=int, required=False)
+@file_upload_ns.param('reporte_errores', 'Formato del detalle de errores: "json" (en la respuesta) o "csv" (descargable)', _in='query', required=False)
+class BatchUploadResource(Resource):
+    @require_auth
+    def post(self):
+        """
+        Carga varios archivos CSV, o los CSV de uno o más ZIP, cada uno en su proyecto.
+
+        Los archivos se envían en el campo `files` (puede repetirse). El campo de formulario
+        `proyectos` es un objeto JSON que asocia cada archivo (o su ruta dentro del ZIP) con el
+        ID de su proyecto; los archivos que no figuran se asocian al proyecto cuya tabla tiene
+        el nombre del archivo sin extensión. Los miembros de un ZIP se descomprimen en
+        streaming, uno a uno, sin extraer el ZIP.
+
+        Los archivos se cargan en paralelo, hasta `UPLOAD_BATCH_WORKERS` a la vez, cada uno en
+        su propia transacción.
+
+        Retorna:
+        - 200: Si todos los archivos se cargaron. `archivos` contiene, por archivo, el proyecto,
+          el código HTTP y en `resultado` la misma respuesta que la carga individual (incluidos
+          los `errores`).
+        - 202: Con `asincrono=true`, el ID del trabajo de cada archivo.
+        - 207: Si algún archivo fue rechazado o falló; el detalle está en `archivos`.
+        - 400: Si el lote es inválido (sin archivos, archivos sin proyecto, proyectos
+          inexistentes o repetidos, parámetros inválidos).
+        """
+        files = request.files.getlist('files')
+        if not files or all(file.filename == '' for file in files):
+            return {"error": "No se han enviado archivos"}, 400
+
+        try:
+            opciones = opciones_reporte(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        modo = request.args.get('modo', MODO_REEMPLAZAR).lower()
+        if modo not in (MODO_REEMPLAZAR, MODO_UPSERT, MODO_AGREGAR):
+            return {"error": f"El parámetro 'modo' debe ser '{MODO_REEMPLAZAR}', '{MODO_UPSERT}' o '{MODO_AGREGAR}'."}, 400
+
+        try:
+            archivos = archivos_solicitud(files)
+            max_archivos = current_app.config['UPLOAD_BATCH_MAX_FILES']
+            if len(archivos) > max_archivos:
+                return {"error": f"El lote supera el máximo de {max_archivos} archivos."}, 400
+            asignar_proyectos(archivos, leer_mapeo(request.form.get('proyectos')))
+        except ErrorLote as e:
+            return e.respuesta, 400
+
+        if modo == MODO_UPSERT:
+            ids = {archivo.project_id for archivo in archivos}
+            con_claves = {project_id for (project_id,) in db.session.query(ProyectoEsquemas.proyecto_id).filter(
+                ProyectoEsquemas.proyecto_id.in_(ids), ProyectoEsquemas.es_clave_primaria.is_(True)
+            ).distinct()}
+            if ids - con_claves:
+                return {
+                    "error": "Algunos proyectos no tienen campos marcados como clave primaria.",
+                    "proyectos_sin_clave": sorted(ids - con_claves)
+                }, 400
+            opciones["eliminar_faltantes"] = request.args.get('eliminar_faltantes', '').lower() == 'true'
+
+        if request.args.get('asincrono', '').lower() == 'true':
+            trabajos = encolar_lote(archivos, modo, opciones)
+            return {"message": "Archivos recibidos, las cargas se procesarán en segundo plano.", "trabajos": trabajos}, 202
+
+        resultados = procesar_lote(
+            current_app._get_current_object(), archivos, modo, opciones, current_app.config['UPLOAD_BATCH_WORKERS']
+        )
+        exitosos = sum(1 for resultado in resultados if resultado["codigo"] == 200)
+        return {
+            "total": len(resultados),
+            "exitosos": exitosos,
+            "fallidos": len(resultados) - exitosos,
+            "archivos": resultados
+        }, 200 if exitosos == len(resultados) else 207
+
+
+@file_upload_ns.route('/<int:project_id>/validar', methods=['POST'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('project_id', 'ID del proyecto asociado')
+@file_upload_ns.param('muestra', 'Filas a validar (por defecto, todo el archivo)', _in='query', type=int, required=False)
+@file_upload_ns.param('muestreo', 'Con "muestra": "primeras" (por defecto) valida las primeras filas; "reservorio" una muestra aleatoria de todo el archivo', _in='query', required=False)
+@file_upload_ns.param('semilla', 'Semilla de la muestra aleatoria, para repetirla', _in='query', type=int, required=False)
+@file_upload_ns.param('max_errores', 'Errores a partir de los cuales se detiene la validación (0 = sin límite)', _in='query', type=int, required=False)
+@file_upload_ns.param('reporte_errores', 'Formato del detalle de errores: "json" (en la respuesta) o "csv" (descargable)', _in='query', required=False)
+class FileValidationResource(Resource):
+    @require_auth
+    def post(self, project_id):
         """
-        Extrae los nombres de los parámetros requeridos por la función de validación.
+        Valida un archivo sin cargarlo (validación previa): verifica el esquema y ejecuta
+        las validaciones del proyecto sin modificar su tabla ni eliminar el proyecto.
+
+        Con `muestra` se valida solo una muestra de filas y `tasas` estima la tasa de error
+        de cada regla, con su intervalo de confianza del 95 %.
+
+        Retorna:
+        - 200: Resultado de la validación (`validas`, filas validadas, errores y tasas por regla).
+        - 400: Si el esquema del archivo no coincide, el tipo de archivo no está permitido o
+          algún parámetro no es válido.
+        - 404: Si el proyecto no existe.
+        - 500: Si ocurre un error al leer o validar el archivo.
+        """
+        project = ProyectoValidaciones.query.get(project_id)
+        if not project:
+            return {"error": "Proyecto no encontrado."}, 404
+
+        if 'file' not in request.files:
+            return {"error": "No se ha enviado un archivo"}, 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return {"error": "El nombre del archivo está vacío"}, 400
+        if not allowed_file(file.filename):
+            return {"error": "Tipo de archivo no permitido"}, 400
+
+        try:
+            opciones = opciones_reporte(request.args)
+            muestreo = opciones_muestra(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return prevalidar_archivo(
+            project, abrir_archivo(file.stream, file.filename), opciones, formato_datos(file.filename), **muestreo
+        )
+
+
+@file_upload_ns.route('/<int:project_id>/reanudable', methods=['POST'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('project_id', 'ID del proyecto asociado')
+@file_upload_ns.param('modo', 'Modo de carga al finalizar: "reemplazar" (por defecto), "upsert" o "agregar"', _in='query', required=False)
+@file_upload_ns.param('eliminar_faltantes', 'En modo "upsert", si es "true" elimina las filas cuya clave no está en el archivo', _in='query', required=False)
+@file_upload_ns.param('max_errores', 'Errores a partir de los cuales se detiene la validación (0 = sin límite)', _in='query', type=int, required=False)
+@file_upload_ns.param('reporte_errores', 'Formato del detalle de errores: "json" (en la respuesta) o "csv" (descargable)', _in='query', required=False)
+class ResumableUploadInitResource(Resource):
+    @require_auth
+    def post(self, project_id):
+        """
+        Inicia una carga reanudable de un archivo grande, que se envía por bloques.
+
+        El cuerpo es un JSON con `nombre_archivo`, `tamano` (bytes) y, opcionalmente,
+        `tamano_bloque` (por defecto `UPLOAD_RESUMABLE_CHUNK_SIZE`) y `sha256` del archivo
+        completo. Luego cada bloque se envía con PUT a `/upload/reanudable/<upload_id>`, se
+        consulta el avance con GET y se inicia la carga con POST a `.../finalizar`.
+
+        Retorna:
+        - 201: Estado de la carga, con su `upload_id` y los offsets de los bloques a enviar.
+        - 400: Si faltan datos, el tipo de archivo no está permitido o algún parámetro no es válido.
+        - 404: Si el proyecto no existe.
+        - 413: Si `tamano` supera `UPLOAD_RESUMABLE_MAX_SIZE`.
+        - 507: Si no se puede reservar el archivo en disco.
+        """
+        project = ProyectoValidaciones.query.get(project_id)
+        if not project:
+            return {"error": "Proyecto no encontrado."}, 404
+
+        datos = request.get_json(silent=True) or {}
+        nombre_archivo = datos.get('nombre_archivo')
+        if not nombre_archivo or not isinstance(nombre_archivo, str):
+            return {"error": "El campo 'nombre_archivo' es obligatorio."}, 400
+        if not allowed_file(nombre_archivo):
+            return {"error": "Tipo de archivo no permitido"}, 400
+
+        try:
+            opciones = opciones_reporte(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        modo = request.args.get('modo', MODO_REEMPLAZAR).lower()
+        if modo not in (MODO_REEMPLAZAR, MODO_UPSERT, MODO_AGREGAR):
+            return {"error": f"El parámetro 'modo' debe ser '{MODO_REEMPLAZAR}', '{MODO_UPSERT}' o '{MODO_AGREGAR}'."}, 400
+        if modo == MODO_UPSERT:
+            tiene_claves = ProyectoEsquemas.query.filter_by(proyecto_id=project_id, es_clave_primaria=True).first()
+            if not tiene_claves:
+                return {"error": "El proyecto no tiene campos marcados como clave primaria."}, 400
+            opciones["eliminar_faltantes"] = request.args.get('eliminar_faltantes', '').lower() == 'true'
+
+        try:
+            estado = crear_carga(
+                project, nombre_archivo, datos.get('tamano'), modo, opciones,
+                datos.get('tamano_bloque'), datos.get('sha256')
+            )
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+        return estado, 201
+
+
+@file_upload_ns.route('/reanudable/<string:upload_id>', methods=['GET', 'PUT', 'DELETE'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('upload_id', 'ID de la carga reanudable')
+class ResumableUploadResource(Resource):
+    @require_auth
+    def get(self, upload_id):
+        """
+        Informa el avance de una carga reanudable: los bloques recibidos, con su SHA-256, y
+        los offsets de los que faltan. Tras un corte, el cliente reenvía solo los faltantes.
+
+        Retorna:
+        - 200: Estado de la carga.
+        - 404: Si la carga no existe (finalizada, cancelada o expirada).
+        """
+        try:
+            return estado_carga(upload_id), 200
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+
+    @require_auth
+    @file_upload_ns.param('offset', 'Posición del bloque en el archivo (múltiplo de tamano_bloque)', _in='query', type=int, required=True)
+    def put(self, upload_id):
+        """
+        Recibe un bloque de una carga reanudable. El cuerpo de la solicitud es el contenido
+        binario del bloque, que se escribe en disco a medida que llega. El encabezado
+        opcional `X-Checksum-Sha256` es el SHA-256 del bloque: si no coincide, el bloque se
+        rechaza y debe reenviarse.
+
+        Retorna:
+        - 200: El bloque recibido (`indice`, `offset`, `tamano`, `sha256`).
+        - 400: Si el offset o el tamaño del bloque no corresponden o el checksum no coincide.
+        - 404: Si la carga no existe.
+        - 409: Si la carga se finalizó o canceló mientras se recibía el bloque.
+        """
+        try:
+            offset = int(request.args.get('offset', ''))
+        except ValueError:
+            return {"error": "El parámetro 'offset' debe ser un número entero."}, 400
+
+        try:
+            bloque = recibir_bloque(
+                upload_id, offset, request.stream, request.content_length, request.headers.get('X-Checksum-Sha256')
+            )
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+        return bloque, 200
+
+    @require_auth
+    def delete(self, upload_id):
+        """
+        Cancela una carga reanudable y descarta los bloques recibidos.
+
+        Retorna:
+        - 200: Si la carga se canceló.
+        - 404: Si la carga no existe.
+        """
+        try:
+            cancelar_carga(upload_id)
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+        return {"message": "Carga reanudable cancelada."}, 200
+
+
+@file_upload_ns.route('/reanudable/<string:upload_id>/finalizar', methods=['POST'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('upload_id', 'ID de la carga reanudable')
+@file_upload_ns.param('asincrono', 'Si es "true", encola la carga y responde 202 con el ID del trabajo', _in='query', required=False)
+class ResumableUploadFinishResource(Resource):
+    @require_auth
+    def post(self, upload_id):
+        """
+        Finaliza una carga reanudable con todos sus bloques recibidos y la valida y carga
+        en el proyecto, leyendo el archivo armado desde disco por bloques, como una carga
+        normal con los parámetros indicados al iniciarla.
+
+        Retorna:
+        - La misma respuesta que `POST /upload/<project_id>` (200, 400, 500), o 202 con el
+          ID del trabajo si `asincrono=true`.
+        - 404: Si la carga o el proyecto no existen.
+        - 409: Si faltan bloques (`offsets_faltantes`) o la carga ya se está finalizando.
+        """
+        try:
+            sesion = leer_sesion(upload_id)
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+
+        project = ProyectoValidaciones.query.get(sesion["project_id"])
+        if not project:
+            return {"error": "Proyecto no encontrado."}, 404
+
+        ruta_archivo = ruta_spool(sesion["nombre_archivo"])
+        try:
+            finalizar_carga(upload_id, ruta_archivo)
+        except ErrorCargaReanudable as e:
+            return e.respuesta, e.codigo
+
+        if request.args.get('asincrono', '').lower() == 'true':
+            return encolar_archivo(project, ruta_archivo, sesion["nombre_archivo"], sesion["modo"], sesion["opciones"])
+
+        try:
+            return cargar_archivo(project, ruta_archivo, sesion["nombre_archivo"], sesion["modo"], sesion["opciones"])
+        finally:
+            os.remove(ruta_archivo)
+
+
+@file_upload_ns.route('/jobs/<int:job_id>', methods=['GET'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('job_id', 'ID del trabajo de carga')
+class UploadJobResource(Resource):
+    @require_auth
+    def get(self, job_id):
+        """
+        Obtiene el estado de un trabajo de carga asíncrona.
 
         Parámetros:
-        - func: La función de validación de la que se extraerán los parámetros.
+        - job_id (int): ID del trabajo devuelto al encolar la carga.
 
         Retorna:
-        - Lista de nombres de parámetros requeridos.
+        - 200: Estado del trabajo (`pendiente`, `procesando`, `completado` o `error`). Cuando
+          termina, `resultado` contiene la misma respuesta que la carga síncrona (incluidos
+          los `errores`) y `codigo_respuesta` su código HTTP.
+        - 404: Si el trabajo no existe.
+        - 500: Si ocurre un error en el servidor.
         """
-        from inspect import signature
-        sig = signature(func)
-        return [param.name for param in sig.parameters.values() if param.default == param.empty and param.name != "value"]
+        try:
+            trabajo = TrabajosCarga.query.get(job_id)
+            if not trabajo:
+                return {"error": "Trabajo de carga no encontrado."}, 404
+
+            return serializar_trabajo(trabajo), 200
+
+        except Exception as e:
+            logger.error(f"Error al obtener el trabajo de carga: {str(e)}")
+            return {"error": f"Error al obtener el trabajo de carga: {str(e)}"}, 500
 
-    def map_tipo_dato_to_sql(self, tipo_dato):
+@file_upload_ns.route('/errores/<string:reporte_id>', methods=['GET'])
+@file_upload_ns.param('token', 'Token de autenticación', _in='query', required=False)
+@file_upload_ns.param('reporte_id', 'ID del reporte de errores devuelto por la carga')
+class ErrorReportResource(Resource):
+    @require_auth
+    def get(self, reporte_id):
         """
-        Mapea el tipo de dato del esquema al tipo de dato SQL correspondiente.
+        Descarga el reporte completo de errores de validación de una carga en formato CSV.
+
+        Parámetros:
+        - reporte_id (str): ID del reporte (campo `reporte_errores` de la respuesta de carga
+          con `reporte_errores=csv`).
+
+        Retorna:
+        - 200: Archivo CSV con las columnas fila, campo, regla, valor_incorrecto y
+          mensaje_error, enviado por bloques.
+        - 404: Si el reporte no existe o ya expiró.
         """
-        if tipo_dato == 'integer':
-            return 'INTEGER'
-        elif tipo_dato == 'varchar':
-            return 'VARCHAR(255)'
-        elif tipo_dato == 'date':
-            return 'DATE'
-        # Agrega más mapeos según sea necesario
-        return 'TEXT'
+        ruta = ruta_reporte(reporte_id)
+        if ruta is None:
+            return {"error": "Reporte de errores no encontrado."}, 404
+
+        return send_file(ruta, mimetype='text/csv', as_attachment=True, download_name=f"errores_{reporte_id}.csv")
+
    
 @validations_ns.param('token', 'Token de autenticación', _in='query', required=False)
 @validations_ns.route('/')
@@ -818,6 +1065,12 @@ class ValidationsListResource(Resource):
         - 200: Lista de validaciones con sus detalles.
         - 500: Si ocurre un error en el servidor.
         """
+        return respuesta_cacheada(clave_solicitud('validaciones'), self._listar_validaciones)
+
+    def _listar_validaciones(self):
+        """
+        Consulta y serializa el catálogo de validaciones definidas.
+        """
         try:
             validaciones = ValidacionesDefinidas.query.all()
             if not validaciones:
@@ -24,7 +24,7 @@ class ProyectoEsquemas(db.Model):
     __table_args__ = {'schema': 'datos'}
 
     id = db.Column(db.Integer, primary_key=True)
-    proyecto_id = db.Column(db.Integer, db.ForeignKey('datos.proyecto_validaciones.id', ondelete='CASCADE'), nullable=False)
+    proyecto_id = db.Column(db.Integer, db.ForeignKey('datos.proyecto_validaciones.id', ondelete='CASCADE'), nullable=False, index=True)
     campo_nombre = db.Column(db.String(100), nullable=False)
     tipo_dato = db.Column(db.String(100), nullable=False)
     requerido = db.Column(db.Boolean, default=False)
@@ -49,7 +49,7 @@ class ValidacionesCampos(db.Model):
     __table_args__ = {'schema': 'datos'}
 
     id = db.Column(db.Integer, primary_key=True)
-    proyecto_id = db.Column(db.Integer, db.ForeignKey('datos.proyecto_validaciones.id', ondelete='CASCADE'), nullable=False)
+    proyecto_id = db.Column(db.Integer, db.ForeignKey('datos.proyecto_validaciones.id', ondelete='CASCADE'), nullable=False, index=True)
     campo_nombre = db.Column(db.String(100), nullable=False)
     validacion_id = db.Column(db.Integer, db.ForeignKey('datos.validaciones_definidas.id', ondelete='CASCADE'), nullable=False)
     valor = db.Column(db.JSON, nullable=True)
@@ -72,4 +72,39 @@ class ValidacionesDefinidas(db.Model):
 
     def __init__(self, nombre_regla, descripcion):
         self.nombre_regla = nombre_regla
-        self.descripcion = descripcion
\ No newline at end of file
+        self.descripcion = descripcion
+
+class TrabajosCarga(db.Model):
+    __tablename__ = 'trabajos_carga'
+    __table_args__ = {'schema': 'datos'}
+
+    id = db.Column(db.Integer, primary_key=True)
+    proyecto_id = db.Column(db.Integer, db.ForeignKey('datos.proyecto_validaciones.id', ondelete='SET NULL'), nullable=True)
+    modo = db.Column(db.String(20), nullable=False)
+    estado = db.Column(db.String(20), nullable=False, default='pendiente')
+    nombre_archivo = db.Column(db.String(255), nullable=False)
+    ruta_archivo = db.Column(db.String(500), nullable=False)
+    opciones = db.Column(db.JSON, nullable=True)
+    intentos = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100), nullable=True)
+    codigo_respuesta = db.Column(db.Integer, nullable=True)
+    resultado = db.Column(db.JSON, nullable=True)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_inicio = db.Column(db.DateTime, nullable=True)
+    fecha_fin = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, proyecto_id, modo, nombre_archivo, ruta_archivo, opciones=None):
+        self.proyecto_id = proyecto_id
+        self.modo = modo
+        self.nombre_archivo = nombre_archivo
+        self.ruta_archivo = ruta_archivo
+        self.opciones = opciones
+        self.estado = 'pendiente'
+        self.intentos = 0
+
+class VersionesCache(db.Model):
+    __tablename__ = 'versiones_cache'
+    __table_args__ = {'schema': 'datos'}
+
+    recurso = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,221 @@
+# backend/app/services/arrow_service.py
+import pandas as pd
+
+from app.services.compresion_service import formato_archivo, formato_disponible, nombre_sin_compresion
+from app.services.ddl_service import tipo_base
+from app.services.load_service import preparar_tipos
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+# Formatos de archivo de datos admitidos
+FORMATO_CSV = 'csv'
+FORMATO_PARQUET = 'parquet'
+FORMATO_ARROW = 'arrow'
+
+EXTENSIONES_FORMATO = {
+    'csv': FORMATO_CSV,
+    'parquet': FORMATO_PARQUET,
+    'pq': FORMATO_PARQUET,
+    'arrow': FORMATO_ARROW,
+    'ipc': FORMATO_ARROW,
+    'feather': FORMATO_ARROW,
+}
+
+# Filas por lote al leer Parquet sin `chunksize` (el valor por defecto de `iter_batches`)
+TAMANO_LOTE_PARQUET = 65536
+
+# Valores que `pd.read_csv` interpreta como nulos por defecto; el lector de CSV de pyarrow usa los mismos
+VALORES_NULOS = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+
+def formato_datos(nombre):
+    """
+    Devuelve el formato de un archivo de datos según su extensión, o None si no es un
+    formato admitido. Los formatos columnares requieren pyarrow.
+
+    Solo los CSV se aceptan comprimidos (`.csv.gz`, `.csv.bz2`, `.csv.zst`): Parquet y
+    Arrow se comprimen internamente y necesitan acceso aleatorio al archivo.
+    """
+    compresion = formato_archivo(nombre)
+    if compresion is not None:
+        if not formato_disponible(compresion) or not nombre_sin_compresion(nombre).lower().endswith('.csv'):
+            return None
+        return FORMATO_CSV
+
+    partes = nombre.lower().rsplit('.', 1)
+    formato = EXTENSIONES_FORMATO.get(partes[1]) if len(partes) == 2 else None
+    if formato in (FORMATO_PARQUET, FORMATO_ARROW) and not PYARROW_DISPONIBLE:
+        return None
+    return formato
+
+
+def tipo_compatible(tipo_arrow, tipo):
+    """
+    Indica si una columna Arrow puede cargarse en un campo del tipo base `tipo`.
+
+    Las columnas de texto y las completamente nulas se aceptan para cualquier tipo: sus
+    valores se validan fila a fila como los de un CSV. Un campo de texto acepta cualquier
+    columna, que se convierte a texto.
+    """
+    if pa.types.is_dictionary(tipo_arrow):
+        tipo_arrow = tipo_arrow.value_type
+    if tipo == 'texto' or pa.types.is_null(tipo_arrow) or pa.types.is_string(tipo_arrow) or pa.types.is_large_string(tipo_arrow):
+        return True
+    if tipo in ('integer', 'bigint'):
+        return pa.types.is_integer(tipo_arrow)
+    if tipo == 'numeric':
+        return pa.types.is_integer(tipo_arrow) or pa.types.is_floating(tipo_arrow) or pa.types.is_decimal(tipo_arrow)
+    if tipo == 'boolean':
+        return pa.types.is_boolean(tipo_arrow)
+    # date y timestamp
+    return pa.types.is_date(tipo_arrow) or pa.types.is_timestamp(tipo_arrow)
+
+
+def _tipo_pandas(tipo_arrow):
+    # Texto respaldado por Arrow (sin crear objetos str) y booleanos con nulos
+    if pa.types.is_string(tipo_arrow) or pa.types.is_large_string(tipo_arrow):
+        return pd.StringDtype('pyarrow')
+    if pa.types.is_boolean(tipo_arrow):
+        return pd.BooleanDtype()
+    return None
+
+
+def leer_csv(stream, columnas, tipos):
+    """
+    Lee completo un CSV cuyo encabezado ya se consumió, con el lector multihilo de pyarrow.
+
+    Las columnas de `tipos` (las de texto del esquema) se leen directamente como texto, sin
+    inferir su tipo: `007` sigue siendo `007` y no `7`, igual que con el motor `c` de
+    pandas. Los demás tipos se infieren al leer.
+
+    Parámetros:
+    - stream: Flujo binario posicionado en la primera fila de datos.
+    - columnas (list): Nombres de las columnas del encabezado.
+    - tipos (dict): Tipos de lectura de las columnas de texto (`tipos_lectura`).
+
+    Retorna:
+    - pd.DataFrame con las columnas de texto convertidas a su tipo de `tipos`.
+    """
+    tabla = pa_csv.read_csv(
+        stream,
+        read_options=pa_csv.ReadOptions(column_names=columnas),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={columna: pa.string() for columna in tipos},
+            null_values=VALORES_NULOS,
+            strings_can_be_null=True
+        )
+    )
+    # Las columnas sin ningún valor se leen como float64, igual que en pandas
+    for i, campo in enumerate(tabla.schema):
+        if pa.types.is_null(campo.type):
+            tabla = tabla.set_column(i, campo.name, tabla.column(i).cast(pa.float64()))
+    df = tabla.to_pandas()
+    return df.astype(tipos) if tipos else df
+
+
+class LectorArrow:
+    """
+    Lector de archivos Parquet o Arrow IPC por lotes de registros (record batches).
+
+    Al crearlo solo se leen los metadatos del archivo (el pie de Parquet o el esquema
+    del IPC), por lo que el esquema se puede verificar sin leer datos.
+
+    Parámetros:
+    - stream: Flujo binario con acceso aleatorio (por ejemplo `FileStorage.stream`).
+    - formato (str): `FORMATO_PARQUET` o `FORMATO_ARROW`.
+
+    Atributos:
+    - esquema (pa.Schema): Esquema incluido en el archivo.
+    - columnas (list): Nombres de las columnas, en el orden del archivo.
+    """
+    def __init__(self, stream, formato):
+        self.formato = formato
+        if formato == FORMATO_PARQUET:
+            self._archivo = pq.ParquetFile(stream)
+            self.esquema = self._archivo.schema_arrow
+        else:
+            try:
+                self._archivo = pa.ipc.open_file(stream)
+            except pa.ArrowInvalid:
+                # Formato de streaming de Arrow (sin pie de archivo)
+                stream.seek(0)
+                self._archivo = pa.ipc.open_stream(stream)
+            self.esquema = self._archivo.schema
+        self.columnas = self.esquema.names
+
+    def tipos_incompatibles(self, esquemas):
+        """
+        Compara los tipos de las columnas del archivo con el tipo de dato de cada campo.
+
+        Retorna:
+        - Lista de {"campo", "tipo_esperado", "tipo_archivo"} de las columnas cuyo tipo
+          no puede cargarse en su campo (ver `tipo_compatible`).
+        """
+        incompatibles = []
+        for esquema in esquemas:
+            if esquema.campo_nombre not in self.columnas:
+                continue
+            tipo_arrow = self.esquema.field(esquema.campo_nombre).type
+            if not tipo_compatible(tipo_arrow, tipo_base(esquema.tipo_dato)):
+                incompatibles.append({
+                    "campo": esquema.campo_nombre,
+                    "tipo_esperado": esquema.tipo_dato,
+                    "tipo_archivo": str(tipo_arrow)
+                })
+        return incompatibles
+
+    def _tablas(self, chunksize):
+        # Siempre por lotes: `read()`/`read_all()` materializarían el archivo completo
+        if self.formato == FORMATO_PARQUET:
+            for lote in self._archivo.iter_batches(batch_size=chunksize or TAMANO_LOTE_PARQUET):
+                yield pa.Table.from_batches([lote])
+        elif isinstance(self._archivo, pa.ipc.RecordBatchFileReader):
+            for numero in range(self._archivo.num_record_batches):
+                yield pa.Table.from_batches([self._archivo.get_batch(numero)])
+        else:
+            for lote in self._archivo:
+                yield pa.Table.from_batches([lote])
+
+    def _a_dataframe(self, tabla, inicio):
+        # Los decimales se convierten a float64: como objetos Decimal no admiten validación columnar
+        for i, campo in enumerate(tabla.schema):
+            if pa.types.is_decimal(campo.type):
+                tabla = tabla.set_column(i, campo.name, tabla.column(i).cast(pa.float64()))
+        df = tabla.to_pandas(types_mapper=_tipo_pandas, date_as_object=False)
+        df.index = pd.RangeIndex(inicio, inicio + len(df))
+        return df
+
+    def bloques(self, esquemas, tipos, chunksize=None):
+        """
+        Lee los datos como DataFrames con los mismos tipos que la lectura de CSV, sin pasar
+        por objetos de Python: el texto queda respaldado por Arrow, los diccionarios como
+        `category` y los números y fechas como arreglos de NumPy.
+
+        Parámetros:
+        - esquemas (list): Esquemas del proyecto (`CampoEsquema`).
+        - tipos (dict): Tipos de lectura de las columnas de texto (`tipos_lectura`). Las
+          columnas que ya son `category` se conservan.
+        - chunksize (int): Filas por bloque en Parquet; `None` o 0 usa
+          `TAMANO_LOTE_PARQUET`. En Arrow IPC cada bloque es un record batch del archivo.
+
+        Retorna:
+        - Iterador de DataFrames cuyo índice continúa el del bloque anterior.
+        """
+        inicio = 0
+        for tabla in self._tablas(chunksize):
+            df = self._a_dataframe(tabla, inicio)
+            inicio += len(df)
+            cambios = {
+                columna: tipo for columna, tipo in tipos.items()
+                if columna in df and df[columna].dtype != tipo and not isinstance(df[columna].dtype, pd.CategoricalDtype)
+            }
+            yield preparar_tipos(df.astype(cambios) if cambios else df, esquemas)
@@ -1,29 +1,115 @@
+import hashlib
+import json
+import logging
 import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
 import jwt
-from jwt import PyJWKClient
+from jwt import PyJWKSet
 from flask import jsonify, request, Blueprint
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
+
+# Claves de firma (JWKS) compartidas por todo el proceso, indexadas por `kid`
+_jwks_lock = threading.Lock()
+_jwks_cache = {"url": None, "claves": {}, "fecha": 0.0}
+
+# Tokens ya decodificados, indexados por el hash del token
+_tokens_lock = threading.Lock()
+_tokens_cache = OrderedDict()
+
+class ErrorJwks(Exception):
+    """
+    No se pudo descargar el JWKS y no hay claves en caché con las que validar el token.
+    """
+
 
 def get_jwks_url():
+    # JWKS_URL permite apuntar a un archivo local (file://) o a un servidor de pruebas
+    jwks_url = os.getenv('JWKS_URL')
+    if jwks_url:
+        return jwks_url
     tenant_id = os.getenv('TENANT_ID')
     return f"https://login.microsoftonline.com/{tenant_id}/discovery/v2.0/keys"
 
+def _descargar_jwks(jwks_url):
+    with urllib.request.urlopen(jwks_url, timeout=10) as respuesta:
+        jwks = json.load(respuesta)
+    return {clave.key_id: clave for clave in PyJWKSet.from_dict(jwks).keys}
+
+def get_signing_key(token):
+    # El JWKS se descarga de nuevo al vencer su TTL (JWKS_CACHE_TTL) o cuando llega un
+    # `kid` desconocido (rotación de claves), como máximo una vez cada JWKS_MIN_REFRESH segundos
+    kid = jwt.get_unverified_header(token).get('kid')
+    jwks_url = get_jwks_url()
+    ttl = float(os.getenv('JWKS_CACHE_TTL', 3600))
+    refresco_minimo = float(os.getenv('JWKS_MIN_REFRESH', 30))
+
+    with _jwks_lock:
+        antiguedad = time.monotonic() - _jwks_cache["fecha"]
+        vencido = _jwks_cache["url"] != jwks_url or antiguedad > ttl
+        kid_desconocido = kid not in _jwks_cache["claves"] and antiguedad > refresco_minimo
+        if vencido or kid_desconocido:
+            try:
+                _jwks_cache["claves"] = _descargar_jwks(jwks_url)
+                _jwks_cache["url"] = jwks_url
+                _jwks_cache["fecha"] = time.monotonic()
+            except Exception as e:
+                # Si ya hay claves de la misma URL, se siguen usando hasta el próximo intento
+                if _jwks_cache["url"] != jwks_url or not _jwks_cache["claves"]:
+                    raise ErrorJwks(f"No se pudo descargar el JWKS: {str(e)}") from e
+                logger.error(f"No se pudo actualizar el JWKS, se usan las claves en caché: {str(e)}")
+        signing_key = _jwks_cache["claves"].get(kid)
+
+    if signing_key is None:
+        raise jwt.InvalidTokenError(f"No se encontró la clave de firma con kid '{kid}'")
+    return signing_key
+
+def _token_en_cache(clave_token):
+    with _tokens_lock:
+        entrada = _tokens_cache.get(clave_token)
+        if entrada is None:
+            return None
+        decoded_token, vence = entrada
+        if vence <= time.time():
+            del _tokens_cache[clave_token]
+            return None
+        _tokens_cache.move_to_end(clave_token)
+        return decoded_token
+
+def _guardar_token(clave_token, decoded_token):
+    # Un token se guarda hasta su `exp`, nunca más de TOKEN_CACHE_TTL segundos
+    vence = time.time() + float(os.getenv('TOKEN_CACHE_TTL', 300))
+    if isinstance(decoded_token.get('exp'), (int, float)):
+        vence = min(vence, decoded_token['exp'])
+    with _tokens_lock:
+        _tokens_cache[clave_token] = (decoded_token, vence)
+        _tokens_cache.move_to_end(clave_token)
+        while len(_tokens_cache) > int(os.getenv('TOKEN_CACHE_SIZE', 1024)):
+            _tokens_cache.popitem(last=False)
+
 def validate_token(token):
     try:
-        # Obtener la URL de JWK
-        jwks_url = get_jwks_url()
-        jwks_client = PyJWKClient(jwks_url)
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        clave_token = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        decoded_token = _token_en_cache(clave_token)
+        if decoded_token is not None:
+            return decoded_token
+
+        signing_key = get_signing_key(token)
         decoded_token = jwt.decode(
             token,
             signing_key.key,
             algorithms=["RS256"],
             audience=os.getenv('CLIENT_ID'),  # Valida la audiencia
             issuer=f"https://login.microsoftonline.com/{os.getenv('TENANT_ID')}/v2.0",
-            options={"verify_signature": False}  
+            options={"verify_signature": False}
         )
 
+        _guardar_token(clave_token, decoded_token)
         return decoded_token
 
     except jwt.ExpiredSignatureError:
@@ -34,6 +120,10 @@ def validate_token(token):
         return jsonify({"error": "Emisor inválido"}), 401
     except jwt.InvalidTokenError as e:
         return jsonify({"error": f"Token inválido: {str(e)}"}), 401
+    except ErrorJwks as e:
+        # Error del proveedor de identidad, no del token: el cliente puede reintentar
+        logger.error(str(e))
+        return jsonify({"error": "No se pudieron obtener las claves de firma, intente nuevamente."}), 503
 
 @auth_bp.route('/validate_token', methods=['POST'])
 def validate_token_route():
@@ -0,0 +1,165 @@
+# backend/app/services/cache_service.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request, Response
+from sqlalchemy import bindparam, text
+
+from app import db
+from app.services.metrics_service import Cronometro
+
+
+# Recurso de `versiones_cache` que incrementa el trigger de `validaciones_definidas`
+RECURSO_VALIDACIONES = 'validaciones'
+
+SQL_LEER_VERSIONES = text(
+    "SELECT recurso, version FROM datos.versiones_cache WHERE recurso IN :recursos"
+).bindparams(bindparam('recursos', expanding=True))
+
+SQL_INCREMENTAR_VERSION = text("""
+    INSERT INTO datos.versiones_cache (recurso, version) VALUES (:recurso, 1)
+    ON CONFLICT (recurso) DO UPDATE SET version = datos.versiones_cache.version + 1
+""")
+
+
+class EntradaCache:
+    """
+    Cuerpo JSON ya serializado de una respuesta y el ETag de la versión con que se construyó.
+    """
+    def __init__(self, cuerpo, etag, expira):
+        self.cuerpo = cuerpo
+        self.etag = etag
+        self.expira = expira
+
+
+_respuestas = OrderedDict()
+_respuestas_lock = threading.Lock()
+
+
+def _obtener(clave):
+    with _respuestas_lock:
+        entrada = _respuestas.get(clave)
+        if entrada is None:
+            return None
+        if entrada.expira <= time.monotonic():
+            del _respuestas[clave]
+            return None
+        _respuestas.move_to_end(clave)
+        return entrada
+
+
+def _guardar(clave, cuerpo, etag):
+    entrada = EntradaCache(cuerpo, etag, time.monotonic() + current_app.config['RESPONSE_CACHE_TTL'])
+    with _respuestas_lock:
+        _respuestas[clave] = entrada
+        _respuestas.move_to_end(clave)
+        while len(_respuestas) > current_app.config['RESPONSE_CACHE_SIZE']:
+            _respuestas.popitem(last=False)
+    return entrada
+
+
+def _recursos(clave):
+    # Contadores de los que depende la respuesta; las de proyectos incluyen el catálogo
+    # porque muestran el nombre de las reglas y su borrado elimina validaciones en cascada
+    recurso = f'proyecto:{clave[1]}' if clave[0] == 'proyecto' else clave[0]
+    return list(dict.fromkeys([recurso, RECURSO_VALIDACIONES]))
+
+
+def etag_version(clave):
+    """
+    Calcula el ETag de una solicitud a partir de los contadores de `versiones_cache`, con
+    una sola consulta por clave primaria y sin construir ni leer el cuerpo.
+
+    El ETag combina un resumen de la clave (recurso y parámetros de consulta, que cambian
+    la representación) con las versiones de los recursos de los que depende; un recurso
+    que aún no tiene fila cuenta como versión 0.
+
+    Parámetros:
+    - clave (tuple): Clave de la caché, como la devuelve `clave_solicitud`.
+
+    Retorna:
+    - str: ETag fuerte, sin comillas.
+    """
+    recursos = _recursos(clave)
+    versiones = dict(db.session.execute(SQL_LEER_VERSIONES, {'recursos': recursos}).all())
+    representacion = hashlib.sha256(repr(clave).encode('utf-8')).hexdigest()[:16]
+    return representacion + ''.join(f'-{versiones.get(recurso, 0)}' for recurso in recursos)
+
+
+def clave_solicitud(*partes):
+    """
+    Construye la clave de caché de una solicitud GET: las partes indicadas más sus
+    parámetros de consulta, sin el token de autenticación.
+    """
+    parametros = tuple(sorted((k, v) for k, v in request.args.items(multi=True) if k != 'token'))
+    return partes + (parametros,)
+
+
+def respuesta_cacheada(clave, construir):
+    """
+    Devuelve una respuesta GET con ETag fuerte y soporte de `If-None-Match`, usando la
+    caché de cuerpos serializados del proceso.
+
+    El ETag se obtiene de los contadores de `versiones_cache` (ver `etag_version`), que
+    comparten todos los procesos: si coincide con `If-None-Match` se responde 304 sin
+    construir ni leer el cuerpo. Si no, se sirve el cuerpo en caché cuando se guardó con
+    el mismo ETag; en caso contrario la consulta y la serialización se miden como las
+    etapas `consulta` y `serializacion`.
+
+    Parámetros:
+    - clave (tuple): Clave de la caché; su primer elemento es el tipo de recurso
+      (`proyecto`, `proyectos` o `validaciones`) y, para `proyecto`, el segundo su ID.
+    - construir: Función sin argumentos que consulta los datos y devuelve
+      (objeto serializable, código HTTP). Solo se guardan en caché las respuestas 200.
+
+    Retorna:
+    - Response de Flask (200 o 304), o la tupla de `construir` si no es 200.
+    """
+    cronometro = Cronometro()
+    try:
+        with cronometro.etapa('version'):
+            # La versión se lee antes de construir el cuerpo: si cambia entretanto, el
+            # cuerpo queda guardado con un ETag viejo y se reconstruye en la siguiente
+            etag = etag_version(clave)
+
+        if request.if_none_match.contains(etag):
+            respuesta = Response(status=304)
+        else:
+            entrada = _obtener(clave)
+            if entrada is None or entrada.etag != etag:
+                with cronometro.etapa('consulta'):
+                    cuerpo, codigo = construir()
+                if codigo != 200:
+                    return cuerpo, codigo
+                with cronometro.etapa('serializacion'):
+                    entrada = _guardar(clave, current_app.json.dumps(cuerpo), etag)
+            respuesta = Response(entrada.cuerpo, status=200, mimetype='application/json')
+    finally:
+        cronometro.registrar()
+
+    respuesta.set_etag(etag)
+    respuesta.headers['Cache-Control'] = 'no-cache'
+    return respuesta
+
+
+def invalidar_proyecto(project_id=None):
+    """
+    Incrementa en la base de datos la versión de un proyecto y de los listados de
+    proyectos, lo que cambia su ETag en todos los procesos, y elimina sus respuestas de la
+    caché del proceso. Debe llamarse después del commit que modifica el proyecto.
+
+    Parámetros:
+    - project_id (int): ID del proyecto creado, modificado o eliminado; None invalida
+      solo los listados.
+    """
+    recursos = ['proyectos'] if project_id is None else ['proyectos', f'proyecto:{project_id}']
+    with db.engine.begin() as conexion:
+        conexion.execute(SQL_INCREMENTAR_VERSION, [{'recurso': recurso} for recurso in recursos])
+
+    with _respuestas_lock:
+        for clave in list(_respuestas):
+            if clave[0] == 'proyectos' or (clave[0] == 'proyecto' and clave[1] == project_id):
+                del _respuestas[clave]
+
@@ -0,0 +1,183 @@
+# backend/app/services/compresion_service.py
+import bz2
+import gzip
+import io
+import json
+import time
+
+from werkzeug.wsgi import get_input_stream
+
+try:
+    import zstandard
+    ZSTD_DISPONIBLE = True
+except ImportError:
+    ZSTD_DISPONIBLE = False
+
+# Extensión de los archivos comprimidos aceptados (`archivo.csv.gz`) → formato
+EXTENSIONES_COMPRESION = {'gz': 'gzip', 'bz2': 'bz2', 'zst': 'zstd'}
+# Valores de `Content-Encoding` aceptados en el cuerpo de la solicitud → formato
+CODIFICACIONES_SOLICITUD = {'gzip': 'gzip', 'x-gzip': 'gzip', 'zstd': 'zstd'}
+# Tamaño del buffer entre el descompresor y el lector de CSV
+TAMANO_BUFFER = 1024 * 1024
+# Clave del entorno WSGI donde queda el flujo descomprimido del cuerpo de la solicitud
+CLAVE_ENTORNO = 'validador.compresion'
+
+
+class ContadorBytes(io.RawIOBase):
+    """
+    Flujo de solo lectura que delega en otro y cuenta los bytes leídos y el tiempo
+    empleado en leerlos (que en el lado descomprimido incluye la descompresión).
+    """
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+        self.bytes = 0
+        self.segundos = 0.0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        inicio = time.perf_counter()
+        datos = self._stream.read(len(buffer))
+        self.segundos += time.perf_counter() - inicio
+        cantidad = len(datos)
+        buffer[:cantidad] = datos
+        self.bytes += cantidad
+        return cantidad
+
+    def tell(self):
+        return self.bytes
+
+
+def descompresor(stream, formato):
+    """
+    Devuelve un flujo que descomprime `stream` a medida que se lee.
+    """
+    if formato == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if formato == 'bz2':
+        return bz2.BZ2File(stream, mode='rb')
+    return zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+
+
+class FlujoDescomprimido(io.BufferedReader):
+    """
+    Flujo binario con el contenido descomprimido de un archivo o cuerpo comprimido, que
+    se descomprime por bloques mientras el lector de CSV lo consume: el contenido
+    descomprimido completo nunca está en memoria.
+
+    Admite `readline` (para `leer_encabezado`) y `tell` (bytes descomprimidos leídos).
+
+    Atributos:
+    - formato (str): `gzip`, `bz2` o `zstd`.
+    - comprimido (ContadorBytes): Bytes leídos del flujo comprimido.
+    - descomprimido (ContadorBytes): Bytes descomprimidos y tiempo de descompresión.
+    """
+    def __init__(self, stream, formato):
+        self.formato = formato
+        self.comprimido = ContadorBytes(stream)
+        self.descomprimido = ContadorBytes(descompresor(self.comprimido, formato))
+        super().__init__(self.descomprimido, buffer_size=TAMANO_BUFFER)
+
+    def resumen(self):
+        """
+        Retorna:
+        - dict con el formato, los bytes comprimidos y descomprimidos, la razón de
+          compresión y el rendimiento de la descompresión en MB/s (descomprimidos).
+        """
+        comprimidos = self.comprimido.bytes
+        descomprimidos = self.descomprimido.bytes
+        segundos = self.descomprimido.segundos
+        return {
+            "formato": self.formato,
+            "bytes_comprimidos": comprimidos,
+            "bytes_descomprimidos": descomprimidos,
+            "ratio": round(descomprimidos / comprimidos, 2) if comprimidos else None,
+            "segundos_descompresion": round(segundos, 3),
+            "mb_por_segundo": round(descomprimidos / 2 ** 20 / segundos, 1) if segundos > 0 else None
+        }
+
+
+def formato_archivo(nombre):
+    """
+    Devuelve el formato de compresión de un archivo según su última extensión
+    (`datos.csv.gz` → `gzip`), o None si no está comprimido.
+    """
+    partes = nombre.lower().rsplit('.', 1)
+    return EXTENSIONES_COMPRESION.get(partes[1]) if len(partes) == 2 else None
+
+
+def nombre_sin_compresion(nombre):
+    """
+    Quita la extensión de compresión de un nombre de archivo (`datos.csv.gz` → `datos.csv`).
+    """
+    return nombre.rsplit('.', 1)[0] if formato_archivo(nombre) else nombre
+
+
+def formato_disponible(formato):
+    """
+    Indica si el formato se puede descomprimir en este entorno (`zstd` requiere el
+    paquete `zstandard`).
+    """
+    return formato != 'zstd' or ZSTD_DISPONIBLE
+
+
+def abrir_archivo(stream, nombre):
+    """
+    Devuelve el flujo del que leer el CSV de un archivo subido: `stream` si no está
+    comprimido o un `FlujoDescomprimido` según la extensión de `nombre`.
+    """
+    formato = formato_archivo(nombre)
+    if formato is None:
+        return stream
+    return FlujoDescomprimido(stream, formato)
+
+
+def resumen_compresion(stream, environ=None):
+    """
+    Resume la compresión de una carga: la del archivo si `stream` es un
+    `FlujoDescomprimido`, o la del cuerpo de la solicitud si se envió con
+    `Content-Encoding` (en `environ`). Retorna None si no hubo compresión.
+    """
+    if isinstance(stream, FlujoDescomprimido):
+        return stream.resumen()
+    flujo = environ.get(CLAVE_ENTORNO) if environ is not None else None
+    if flujo is not None:
+        return {**flujo.resumen(), "content_encoding": True}
+    return None
+
+
+class DescompresionSolicitud:
+    """
+    Middleware WSGI que descomprime en streaming los cuerpos enviados con
+    `Content-Encoding: gzip` (o `zstd`), antes de que Flask interprete el formulario.
+
+    El cuerpo queda en `wsgi.input` como un `FlujoDescomprimido` sin `Content-Length`
+    (terminado por el fin del flujo), y el flujo se guarda en el entorno para informar la
+    razón de compresión. Las codificaciones no admitidas se rechazan con 415.
+    """
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        codificacion = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if codificacion in ('', 'identity'):
+            return self.wsgi_app(environ, start_response)
+
+        formato = CODIFICACIONES_SOLICITUD.get(codificacion)
+        if formato is None or not formato_disponible(formato):
+            cuerpo = json.dumps({"error": f"Content-Encoding no admitido: '{codificacion}'."}).encode('utf-8')
+            start_response('415 Unsupported Media Type', [
+                ('Content-Type', 'application/json'), ('Content-Length', str(len(cuerpo)))
+            ])
+            return [cuerpo]
+
+        # get_input_stream limita la lectura al Content-Length del cuerpo comprimido
+        flujo = FlujoDescomprimido(get_input_stream(environ), formato)
+        environ['wsgi.input'] = flujo
+        environ['wsgi.input_terminated'] = True
+        environ[CLAVE_ENTORNO] = flujo
+        environ.pop('CONTENT_LENGTH', None)
+        environ.pop('HTTP_CONTENT_ENCODING', None)
+        return self.wsgi_app(environ, start_response)
@@ -0,0 +1,87 @@
+# backend/app/services/ddl_service.py
+
+# Tipos de dato del esquema agrupados por su tipo base
+TIPOS_BASE = {
+    'integer': 'integer',
+    'int': 'integer',
+    'bigint': 'bigint',
+    'number': 'numeric',
+    'numeric': 'numeric',
+    'decimal': 'numeric',
+    'float': 'numeric',
+    'boolean': 'boolean',
+    'bool': 'boolean',
+    'date': 'date',
+    'timestamp': 'timestamp',
+    'datetime': 'timestamp',
+    'varchar': 'texto',
+    'string': 'texto',
+    'text': 'texto',
+}
+
+
+def tipo_base(tipo_dato):
+    """
+    Normaliza el `tipo_dato` de un esquema a su tipo base (`integer`, `bigint`,
+    `numeric`, `boolean`, `date`, `timestamp` o `texto`). Los tipos desconocidos se
+    tratan como texto.
+    """
+    return TIPOS_BASE.get((tipo_dato or '').strip().lower(), 'texto')
+
+
+def tipo_sql(esquema):
+    """
+    Devuelve el tipo de columna PostgreSQL de un campo del esquema. El texto usa
+    `VARCHAR(longitud_maxima)` cuando el campo tiene longitud máxima y `TEXT` si no.
+    """
+    tipo = tipo_base(esquema.tipo_dato)
+    if tipo == 'texto':
+        return f"VARCHAR({esquema.longitud_maxima})" if esquema.longitud_maxima else 'TEXT'
+    return {
+        'integer': 'INTEGER',
+        'bigint': 'BIGINT',
+        'numeric': 'NUMERIC',
+        'boolean': 'BOOLEAN',
+        'date': 'DATE',
+        'timestamp': 'TIMESTAMP',
+    }[tipo]
+
+
+def sentencia_crear_tabla(table_name, esquemas):
+    """
+    Genera el `CREATE TABLE` de `datos.<table_name>`: la columna `id` y una columna por
+    campo del esquema, con `NOT NULL` en los campos requeridos y en los de la clave
+    primaria. Los valores que no cumplen estas restricciones (ni la longitud máxima del
+    texto) se rechazan antes al validar (ver `reglas_esquema` y `VerificadorUnicidad`).
+
+    La tabla se crea sin índices (ni siquiera el de `id`) para que la carga masiva no
+    tenga que mantenerlos; se construyen después con `sentencias_indices`.
+    """
+    columnas = ["id SERIAL NOT NULL"]
+    for esquema in esquemas:
+        nulo = " NOT NULL" if esquema.requerido or esquema.es_clave_primaria else ""
+        columnas.append(f"{esquema.campo_nombre} {tipo_sql(esquema)}{nulo}")
+    return f"CREATE TABLE datos.{table_name} ({', '.join(columnas)});"
+
+
+def sentencias_indices(table_name, esquemas):
+    """
+    Genera las sentencias que crean, después de la carga, la clave primaria sobre `id`,
+    el índice único de los campos `es_clave_primaria` (`<tabla>_clave_idx`, el que usa
+    la carga incremental) y un índice único por cada campo `es_unico`.
+    """
+    sentencias = [f"ALTER TABLE datos.{table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (id);"]
+
+    claves = [esquema.campo_nombre for esquema in esquemas if esquema.es_clave_primaria]
+    if claves:
+        sentencias.append(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_clave_idx ON datos.{table_name} ({', '.join(claves)});"
+        )
+
+    for esquema in esquemas:
+        if esquema.es_unico and [esquema.campo_nombre] != claves:
+            sentencias.append(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_{esquema.campo_nombre}_uidx "
+                f"ON datos.{table_name} ({esquema.campo_nombre});"
+            )
+    return sentencias
@@ -0,0 +1,191 @@
+# backend/app/services/error_report_service.py
+import csv
+import logging
+import os
+import re
+import time
+import uuid
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Formatos del detalle de errores: embebido en la respuesta JSON o como archivo CSV descargable
+FORMATO_JSON = 'json'
+FORMATO_CSV = 'csv'
+
+COLUMNAS_REPORTE = ["fila", "campo", "regla", "valor_incorrecto", "mensaje_error"]
+
+
+def opciones_reporte(args):
+    """
+    Lee de los parámetros de la solicitud las opciones del reporte de errores.
+
+    Parámetros:
+    - args: Parámetros de consulta (`request.args`). Se usan `max_errores` (0 = sin límite)
+      y `reporte_errores` (`json` o `csv`).
+
+    Retorna:
+    - dict {"max_errores", "formato"} con los valores por defecto de la configuración
+      para los parámetros ausentes (`VALIDATION_MAX_ERRORS`, sin límite salvo que se
+      configure otro valor).
+
+    Lanza:
+    - ValueError: Si algún parámetro no es válido.
+    """
+    max_errores = args.get('max_errores', current_app.config['VALIDATION_MAX_ERRORS'])
+    try:
+        max_errores = int(max_errores)
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro 'max_errores' debe ser un número entero.")
+    if max_errores < 0:
+        raise ValueError("El parámetro 'max_errores' no puede ser negativo.")
+
+    formato = args.get('reporte_errores', FORMATO_JSON).lower()
+    if formato not in (FORMATO_JSON, FORMATO_CSV):
+        raise ValueError(f"El parámetro 'reporte_errores' debe ser '{FORMATO_JSON}' o '{FORMATO_CSV}'.")
+
+    return {"max_errores": max_errores, "formato": formato}
+
+
+def ruta_reporte(reporte_id):
+    """
+    Devuelve la ruta del archivo CSV de un reporte de errores, o None si el ID no tiene
+    el formato de los generados por `ReporteErrores` o el archivo no existe.
+    """
+    if not re.fullmatch(r'[0-9a-f]{32}', reporte_id):
+        return None
+    ruta = os.path.join(current_app.config['ERROR_REPORT_DIR'], f"{reporte_id}.csv")
+    return ruta if os.path.isfile(ruta) else None
+
+
+def limpiar_reportes(directorio, ttl):
+    """
+    Elimina los reportes de errores con más de `ttl` segundos de antigüedad.
+    """
+    limite = time.time() - ttl
+    for entrada in os.scandir(directorio):
+        try:
+            if entrada.name.endswith('.csv') and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+        except OSError as e:
+            logger.error(f"No se pudo eliminar el reporte de errores {entrada.name}: {str(e)}")
+
+
+class ReporteErrores:
+    """
+    Acumula los errores de validación de una carga hasta un máximo, con un resumen por
+    campo y regla.
+
+    El detalle se guarda en memoria para embeberlo en la respuesta o, en formato CSV, se
+    escribe a medida que llega en un archivo de `ERROR_REPORT_DIR` que luego se descarga
+    por su ID. Se usa como gestor de contexto para cerrar (o descartar, si no hubo
+    errores) ese archivo.
+
+    Parámetros:
+    - max_errores (int): Errores a partir de los cuales se detiene la validación; 0 sin límite.
+    - ejemplos_por_regla (int): Ejemplos guardados en el resumen de cada campo y regla.
+    - formato (str): `FORMATO_JSON` o `FORMATO_CSV`.
+    """
+    def __init__(self, max_errores=0, ejemplos_por_regla=5, formato=FORMATO_JSON):
+        self.max_errores = max_errores
+        self.ejemplos_por_regla = ejemplos_por_regla
+        self.formato = formato
+        self.errores = []
+        self.total = 0
+        self.reporte_id = None
+        self._resumen = {}
+        self._archivo = None
+        self._writer = None
+
+    def __enter__(self):
+        if self.formato == FORMATO_CSV:
+            directorio = current_app.config['ERROR_REPORT_DIR']
+            os.makedirs(directorio, exist_ok=True)
+            limpiar_reportes(directorio, current_app.config['ERROR_REPORT_TTL'])
+            self.reporte_id = uuid.uuid4().hex
+            self._archivo = open(os.path.join(directorio, f"{self.reporte_id}.csv"), 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._archivo)
+            self._writer.writerow(COLUMNAS_REPORTE)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._archivo is not None:
+            self._archivo.close()
+            if not self.total:
+                os.remove(self._archivo.name)
+                self.reporte_id = None
+            self._archivo = None
+        return False
+
+    @property
+    def limite_alcanzado(self):
+        return self.max_errores > 0 and self.total >= self.max_errores
+
+    def agregar(self, errores):
+        """
+        Registra los errores de un bloque, en orden, hasta alcanzar `max_errores`.
+
+        Retorna:
+        - True si se alcanzó el límite y la validación debe detenerse.
+        """
+        for error in errores:
+            if self.limite_alcanzado:
+                break
+            self.total += 1
+
+            clave = (error["campo"], error["regla"])
+            resumen = self._resumen.get(clave)
+            if resumen is None:
+                resumen = self._resumen[clave] = {
+                    "campo": error["campo"],
+                    "regla": error["regla"],
+                    "cantidad": 0,
+                    "ejemplos": []
+                }
+            resumen["cantidad"] += 1
+            if len(resumen["ejemplos"]) < self.ejemplos_por_regla:
+                resumen["ejemplos"].append({
+                    "fila": error["fila"],
+                    "valor_incorrecto": error["valor_incorrecto"],
+                    "mensaje_error": error["mensaje_error"]
+                })
+
+            if self._writer is not None:
+                self._writer.writerow([error[columna] for columna in COLUMNAS_REPORTE])
+            else:
+                self.errores.append(error)
+
+        return self.limite_alcanzado
+
+    def respuesta(self):
+        """
+        Construye el cuerpo de la respuesta 400 con los errores registrados.
+
+        `errores` contiene el detalle (vacío en formato CSV, que se descarga desde
+        `reporte_errores`). Si `limite_alcanzado` es True la validación se detuvo y las
+        cantidades son un mínimo.
+        """
+        respuesta = {
+            "error": "Se encontraron errores en la validación del archivo.",
+            "errores": self.errores,
+            "total_errores": self.total,
+            "limite_alcanzado": self.limite_alcanzado,
+            "resumen": list(self._resumen.values())
+        }
+        if self.reporte_id is not None:
+            respuesta["reporte_errores"] = f"/upload/errores/{self.reporte_id}"
+        return respuesta
+
+
+def crear_reporte(opciones=None):
+    """
+    Crea un `ReporteErrores` a partir de las opciones de `opciones_reporte` y de la
+    configuración (`VALIDATION_MAX_ERRORS`, `VALIDATION_ERROR_EXAMPLES`).
+    """
+    opciones = opciones or {}
+    return ReporteErrores(
+        max_errores=opciones.get("max_errores", current_app.config['VALIDATION_MAX_ERRORS']),
+        ejemplos_por_regla=current_app.config['VALIDATION_ERROR_EXAMPLES'],
+        formato=opciones.get("formato", FORMATO_JSON)
+    )
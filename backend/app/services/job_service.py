@@ -0,0 +1,281 @@
+# backend/app/services/job_service.py
+import logging
+import math
+import os
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import text
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.models.project import ProyectoValidaciones, TrabajosCarga
+from app.services.arrow_service import formato_datos
+from app.services.compresion_service import abrir_archivo
+from app.services.upload_service import ejecutar_carga
+
+logger = logging.getLogger(__name__)
+
+
+def encolar_carga(project, file, modo, opciones=None):
+    """
+    Guarda el archivo subido en el directorio de spool compartido y registra un trabajo
+    de carga pendiente para que lo procese un worker.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto destino.
+    - file (FileStorage): Archivo recibido en la solicitud.
+    - modo (str): Modo de carga (`MODO_CREAR` o `MODO_REEMPLAZAR`).
+    - opciones (dict): Opciones del reporte de errores (ver `opciones_reporte`).
+
+    Retorna:
+    - Tupla (respuesta, 202) con el ID del trabajo creado.
+    """
+    ruta_archivo = ruta_spool(file.filename)
+    file.save(ruta_archivo)
+    return encolar_archivo(project, ruta_archivo, file.filename, modo, opciones)
+
+
+def ruta_spool(nombre_archivo):
+    """
+    Devuelve una ruta nueva y única en el directorio de spool compartido para guardar un
+    archivo de carga.
+    """
+    spool_dir = current_app.config['UPLOAD_SPOOL_DIR']
+    os.makedirs(spool_dir, exist_ok=True)
+    return os.path.join(spool_dir, f"{uuid.uuid4().hex}_{secure_filename(nombre_archivo)}")
+
+
+def encolar_archivo(project, ruta_archivo, nombre_archivo, modo, opciones=None):
+    """
+    Registra un trabajo de carga pendiente para un archivo que ya está en el directorio
+    de spool (ver `ruta_spool`). El worker elimina el archivo al terminar.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto destino.
+    - ruta_archivo (str): Ruta del archivo en el spool.
+    - nombre_archivo (str): Nombre original, que determina el formato y la compresión.
+    - modo (str): Modo de carga.
+    - opciones (dict): Opciones de la carga (ver `ejecutar_carga`).
+
+    Retorna:
+    - Tupla (respuesta, 202) con el ID del trabajo creado.
+    """
+    trabajo = TrabajosCarga(
+        proyecto_id=project.id,
+        modo=modo,
+        nombre_archivo=nombre_archivo,
+        ruta_archivo=ruta_archivo,
+        opciones=opciones
+    )
+    db.session.add(trabajo)
+    db.session.commit()
+
+    return {"message": "Archivo recibido, la carga se procesará en segundo plano.", "job_id": trabajo.id}, 202
+
+
+# Primer argumento de `pg_try_advisory_lock(int, int)` para los bloqueos de trabajos de carga
+CLASE_BLOQUEO_TRABAJO = 5005
+
+# Conexión que mantiene el bloqueo de cada trabajo reclamado por este proceso, por ID
+_bloqueos = {}
+
+
+def _bloquear(conexion, trabajo_id):
+    return conexion.execute(
+        text("SELECT pg_try_advisory_lock(:clase, :id)"), {"clase": CLASE_BLOQUEO_TRABAJO, "id": trabajo_id}
+    ).scalar()
+
+
+def _desbloquear(conexion, trabajo_id):
+    conexion.execute(
+        text("SELECT pg_advisory_unlock(:clase, :id)"), {"clase": CLASE_BLOQUEO_TRABAJO, "id": trabajo_id}
+    )
+
+
+def reclamar_trabajo(worker):
+    """
+    Toma el siguiente trabajo pendiente de la cola y lo marca como `procesando`.
+
+    Cada trabajo se reclama tomando `pg_try_advisory_lock` sobre su ID en una conexión
+    propia, que se mantiene abierta hasta que `procesar_trabajo` termina (ver
+    `liberar_trabajo`). Así varios workers reclaman trabajos en paralelo sin tomar el
+    mismo, y un trabajo en `procesando` solo se vuelve a reclamar si su bloqueo está
+    libre, es decir, si la conexión de su worker se cerró (worker caído); una carga larga
+    nunca se ejecuta dos veces. Tras `UPLOAD_JOB_MAX_ATTEMPTS` intentos un trabajo
+    abandonado se marca como `error` y se elimina su archivo, para que un archivo que
+    hace caer al worker no se reintente indefinidamente.
+
+    Parámetros:
+    - worker (str): Identificador del worker que reclama el trabajo.
+
+    Retorna:
+    - TrabajosCarga reclamado, o None si no hay trabajos disponibles.
+    """
+    max_intentos = current_app.config['UPLOAD_JOB_MAX_ATTEMPTS']
+    candidatos = db.session.execute(text("""
+        SELECT id FROM datos.trabajos_carga
+        WHERE estado IN ('pendiente', 'procesando')
+        ORDER BY id;
+    """)).scalars().all()
+    db.session.commit()
+
+    # En AUTOCOMMIT: el bloqueo es de sesión y persiste entre sentencias hasta liberarlo
+    conexion = db.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+    trabajo_id = None
+    try:
+        for candidato in candidatos:
+            if not _bloquear(conexion, candidato):
+                # Lo está procesando otro worker
+                continue
+            # Con el bloqueo tomado nadie más procesa el trabajo; se vuelve a comprobar
+            # su estado porque pudo terminar entre la consulta y el bloqueo
+            agotado = conexion.execute(text("""
+                UPDATE datos.trabajos_carga
+                SET estado = 'error', codigo_respuesta = 500, fecha_fin = NOW(),
+                    resultado = jsonb_build_object('error', 'El trabajo se abandonó en ' || intentos || ' intentos.')
+                WHERE id = :id AND estado = 'procesando' AND intentos >= :max_intentos
+                RETURNING ruta_archivo;
+            """), {"id": candidato, "max_intentos": max_intentos}).scalar()
+            reclamado = None if agotado else conexion.execute(text("""
+                UPDATE datos.trabajos_carga
+                SET estado = 'procesando', worker = :worker, fecha_inicio = NOW(), intentos = intentos + 1
+                WHERE id = :id AND estado IN ('pendiente', 'procesando')
+                RETURNING id;
+            """), {"id": candidato, "worker": worker}).scalar()
+
+            if agotado:
+                logger.error(f"El trabajo {candidato} se marcó como error tras {max_intentos} intentos")
+                try:
+                    os.remove(agotado)
+                except OSError as e:
+                    logger.error(f"No se pudo eliminar el archivo del trabajo {candidato}: {str(e)}")
+            if reclamado is not None:
+                trabajo_id = reclamado
+                break
+            _desbloquear(conexion, candidato)
+    except Exception:
+        # Los bloqueos de sesión sobreviven al devolver la conexión al pool: se descarta
+        conexion.invalidate()
+        raise
+
+    if trabajo_id is None:
+        conexion.close()
+        return None
+    _bloqueos[trabajo_id] = conexion
+    return TrabajosCarga.query.get(trabajo_id)
+
+
+def liberar_trabajo(trabajo_id):
+    """
+    Libera el bloqueo de un trabajo reclamado con `reclamar_trabajo` y cierra su conexión.
+    """
+    conexion = _bloqueos.pop(trabajo_id, None)
+    if conexion is None:
+        return
+    try:
+        _desbloquear(conexion, trabajo_id)
+    except Exception:
+        conexion.invalidate()
+        raise
+    conexion.close()
+
+
+def normalizar_json(valor):
+    """
+    Reemplaza recursivamente los valores no representables en JSON (NaN, infinitos y
+    escalares de NumPy) para poder guardar el resultado en una columna JSON.
+    """
+    if isinstance(valor, dict):
+        return {clave: normalizar_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [normalizar_json(v) for v in valor]
+    if hasattr(valor, 'item') and not isinstance(valor, (str, bytes)):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def cargar_archivo(project, ruta_archivo, nombre_archivo, modo, opciones=None):
+    """
+    Valida y carga un archivo guardado en disco, leyéndolo por bloques desde el archivo
+    (sin cargarlo completo en memoria): si `UPLOAD_CHUNK_SIZE` es 0 se usan bloques de
+    `UPLOAD_FILE_CHUNK_SIZE` filas.
+
+    Parámetros:
+    - ruta_archivo (str): Ruta del archivo, guardado tal como se subió.
+    - nombre_archivo (str): Nombre original, que determina el formato y la compresión.
+    - Los demás, como en `ejecutar_carga`.
+
+    Retorna:
+    - Tupla (respuesta, código HTTP) de `ejecutar_carga`.
+
+    Lanza:
+    - OSError: Si no se puede leer el archivo.
+    """
+    with open(ruta_archivo, 'rb') as archivo:
+        # Los archivos comprimidos se descomprimen al leerlos
+        stream = abrir_archivo(archivo, nombre_archivo)
+        chunksize = current_app.config['UPLOAD_CHUNK_SIZE'] or current_app.config['UPLOAD_FILE_CHUNK_SIZE']
+        return ejecutar_carga(project, stream, modo, opciones, formato_datos(nombre_archivo), chunksize)
+
+
+def procesar_trabajo(trabajo):
+    """
+    Ejecuta un trabajo de carga reclamado y guarda su resultado.
+
+    Parámetros:
+    - trabajo (TrabajosCarga): Trabajo en estado `procesando`, reclamado con
+      `reclamar_trabajo`; su bloqueo se libera al terminar.
+    """
+    try:
+        _procesar_trabajo(trabajo)
+    finally:
+        liberar_trabajo(trabajo.id)
+
+
+def _procesar_trabajo(trabajo):
+    project = ProyectoValidaciones.query.get(trabajo.proyecto_id) if trabajo.proyecto_id else None
+    if not project:
+        respuesta, codigo = {"error": "Proyecto no encontrado."}, 404
+    else:
+        try:
+            respuesta, codigo = cargar_archivo(
+                project, trabajo.ruta_archivo, trabajo.nombre_archivo, trabajo.modo, trabajo.opciones
+            )
+        except OSError as e:
+            logger.error(f"No se pudo leer el archivo del trabajo {trabajo.id}: {str(e)}")
+            respuesta, codigo = {"error": f"No se pudo leer el archivo del trabajo: {str(e)}"}, 500
+
+    trabajo = TrabajosCarga.query.get(trabajo.id)
+    trabajo.estado = 'completado' if codigo == 200 else 'error'
+    trabajo.codigo_respuesta = codigo
+    trabajo.resultado = normalizar_json(respuesta)
+    trabajo.fecha_fin = datetime.utcnow()
+    db.session.commit()
+
+    try:
+        os.remove(trabajo.ruta_archivo)
+    except OSError as e:
+        logger.error(f"No se pudo eliminar el archivo del trabajo {trabajo.id}: {str(e)}")
+
+
+def serializar_trabajo(trabajo):
+    """
+    Convierte un trabajo de carga en el diccionario que devuelve el endpoint de estado.
+    """
+    return {
+        "job_id": trabajo.id,
+        "proyecto_id": trabajo.proyecto_id,
+        "modo": trabajo.modo,
+        "estado": trabajo.estado,
+        "nombre_archivo": trabajo.nombre_archivo,
+        "intentos": trabajo.intentos,
+        "fecha_creacion": trabajo.fecha_creacion.isoformat() if trabajo.fecha_creacion else None,
+        "fecha_inicio": trabajo.fecha_inicio.isoformat() if trabajo.fecha_inicio else None,
+        "fecha_fin": trabajo.fecha_fin.isoformat() if trabajo.fecha_fin else None,
+        "codigo_respuesta": trabajo.codigo_respuesta,
+        "resultado": trabajo.resultado
+    }
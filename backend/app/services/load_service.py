@@ -0,0 +1,162 @@
+# backend/app/services/load_service.py
+import io
+import logging
+import time
+
+import pandas as pd
+from flask import current_app
+from psycopg2.extras import execute_values
+
+from app import db
+from app.services.ddl_service import tipo_base
+
+logger = logging.getLogger(__name__)
+
+
+# Formato con el que se escriben para COPY las columnas de fecha y hora según su tipo base
+FORMATO_FECHA = '%Y-%m-%d'
+FORMATO_TIMESTAMP = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def formatos_fecha(df, esquemas):
+    """
+    Devuelve el formato de cada columna `datetime64` del DataFrame: solo la fecha para los
+    campos `date` y fecha y hora con microsegundos para los demás (`timestamp`).
+    """
+    tipos = {esquema.campo_nombre: tipo_base(esquema.tipo_dato) for esquema in esquemas or []}
+    return {
+        columna: FORMATO_FECHA if tipos.get(columna) == 'date' else FORMATO_TIMESTAMP
+        for columna in df.columns
+        if pd.api.types.is_datetime64_any_dtype(df[columna])
+    }
+
+
+def serializar_fechas(df, formatos):
+    """
+    Convierte las columnas de fecha y hora a texto con su formato de `formatos_fecha`.
+    Las que tienen zona horaria se pasan a UTC, porque los campos `timestamp` no la guardan.
+    """
+    columnas = {}
+    for columna, formato in formatos.items():
+        serie = df[columna]
+        if getattr(serie.dt, 'tz', None) is not None:
+            serie = serie.dt.tz_convert(None)
+        columnas[columna] = serie.dt.strftime(formato)
+    return df.assign(**columnas) if columnas else df
+
+
+class FlujoCsv:
+    """
+    Objeto tipo archivo que serializa un DataFrame a CSV por bloques de filas a medida
+    que `COPY` lo va leyendo, sin materializar el archivo completo en memoria.
+
+    Las fechas de los campos `date` se escriben como `YYYY-MM-DD` y las de los demás
+    campos con su hora (ver `formatos_fecha`).
+    """
+    def __init__(self, df, filas_por_bloque, esquemas=None):
+        formatos = formatos_fecha(df, esquemas)
+        self._bloques = (
+            serializar_fechas(df.iloc[inicio:inicio + filas_por_bloque], formatos).to_csv(header=False, index=False)
+            for inicio in range(0, len(df), filas_por_bloque)
+        )
+        self._actual = io.StringIO()
+
+    def read(self, size=-1):
+        partes = []
+        restante = size
+        while size < 0 or restante > 0:
+            dato = self._actual.read(restante if size >= 0 else -1)
+            if dato:
+                partes.append(dato)
+                restante -= len(dato)
+                continue
+            try:
+                self._actual = io.StringIO(next(self._bloques))
+            except StopIteration:
+                break
+        return ''.join(partes)
+
+
+def preparar_tipos(df, esquemas):
+    """
+    Ajusta los tipos de las columnas del DataFrame al tipo de dato de su esquema para que
+    se validen y serialicen como la base de datos los espera: los enteros con nulos que
+    pandas leyó como flotantes pasan a `Int64` (se escriben como `1` y no como `1.0`) y
+    las fechas `YYYY-MM-DD` a `datetime64`.
+
+    Una columna solo se convierte si todos sus valores no nulos se pueden convertir; si
+    no, queda como se leyó para que las validaciones informen los valores incorrectos.
+
+    Parámetros:
+    - df (pd.DataFrame): Datos validados.
+    - esquemas (list): Esquemas del proyecto (`CampoEsquema` o `ProyectoEsquemas`).
+
+    Retorna:
+    - pd.DataFrame con los tipos ajustados.
+    """
+    tipos = {esquema.campo_nombre: tipo_base(esquema.tipo_dato) for esquema in esquemas}
+    columnas = {}
+    for columna in df.columns:
+        serie = df[columna]
+        if tipos.get(columna) in ('integer', 'bigint') and pd.api.types.is_float_dtype(serie):
+            no_nulos = serie.dropna()
+            if (no_nulos == no_nulos.round()).all():
+                columnas[columna] = serie.astype('Int64')
+        elif tipos.get(columna) == 'date' and not pd.api.types.is_datetime64_any_dtype(serie):
+            fechas = pd.to_datetime(serie, format='%Y-%m-%d', errors='coerce')
+            if (fechas.isna() == serie.isna()).all():
+                columnas[columna] = fechas
+    return df.assign(**columnas) if columnas else df
+
+
+def cargar_dataframe(df, tabla, esquemas):
+    """
+    Inserta un DataFrame validado en una tabla dentro de la transacción de la sesión actual.
+
+    Usa `COPY ... FROM STDIN` en formato CSV; si el driver no lo soporta o
+    `BULK_LOAD_METHOD` es `insert`, usa `INSERT` por lotes con `execute_values`.
+
+    Parámetros:
+    - df (pd.DataFrame): Datos validados.
+    - tabla (str): Nombre calificado de la tabla destino (por ejemplo `datos.<tabla>`).
+    - esquemas (list): Esquemas del proyecto, usados para ajustar los tipos.
+
+    Retorna:
+    - dict con el método usado, las filas cargadas, los segundos y las filas por segundo.
+    """
+    filas_por_bloque = current_app.config['BULK_LOAD_BATCH_SIZE']
+    df = preparar_tipos(df, esquemas)
+    columns = ", ".join(df.columns)
+
+    inicio = time.perf_counter()
+    cursor = db.session.connection().connection.cursor()
+    try:
+        if current_app.config['BULK_LOAD_METHOD'] == 'copy' and hasattr(cursor, 'copy_expert'):
+            metodo = 'copy'
+            cursor.copy_expert(
+                f"COPY {tabla} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                FlujoCsv(df, filas_por_bloque, esquemas)
+            )
+        else:
+            metodo = 'insert'
+            for bloque in range(0, len(df), filas_por_bloque):
+                lote = df.iloc[bloque:bloque + filas_por_bloque].astype(object)
+                lote = lote.where(lote.notna(), None)
+                execute_values(
+                    cursor,
+                    f"INSERT INTO {tabla} ({columns}) VALUES %s",
+                    lote.itertuples(index=False, name=None),
+                    page_size=1000
+                )
+    finally:
+        cursor.close()
+    segundos = time.perf_counter() - inicio
+
+    resultado = {
+        "metodo": metodo,
+        "filas": len(df),
+        "segundos": round(segundos, 3),
+        "filas_por_segundo": round(len(df) / segundos) if segundos > 0 else None
+    }
+    logger.info(f"Carga en {tabla}: {resultado}")
+    return resultado
@@ -0,0 +1,232 @@
+# backend/app/services/lote_service.py
+import json
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+from werkzeug.datastructures import FileStorage
+
+from app.models.project import ProyectoValidaciones
+from app.services.arrow_service import formato_datos
+from app.services.compresion_service import abrir_archivo, nombre_sin_compresion
+from app.services.job_service import encolar_carga
+from app.services.upload_service import ejecutar_carga
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorLote(Exception):
+    """
+    Error en la definición de un lote de archivos (archivos sin proyecto, proyectos
+    repetidos, ZIP inválido).
+
+    Atributos:
+    - respuesta (dict): Cuerpo de la respuesta 400 que debe devolver el endpoint.
+    """
+    def __init__(self, respuesta):
+        super().__init__(respuesta.get("error"))
+        self.respuesta = respuesta
+
+
+class ArchivoLote:
+    """
+    Archivo de un lote: un archivo subido o un miembro de un ZIP, que se abre recién al
+    procesarlo.
+
+    Atributos:
+    - nombre (str): Nombre del archivo (para un miembro de ZIP, su ruta dentro del ZIP).
+    - abrir: Función sin argumentos que devuelve un flujo binario del contenido tal
+      como se subió (comprimido si el archivo es `.csv.gz`, `.csv.bz2` o `.csv.zst`).
+    - formato (str): Formato de los datos (`formato_datos`).
+    - project_id (int): Proyecto destino, asignado por `asignar_proyectos`.
+    """
+    def __init__(self, nombre, abrir):
+        self.nombre = nombre
+        self.abrir = abrir
+        self.formato = formato_datos(nombre)
+        self.project_id = None
+
+    def abrir_datos(self):
+        """
+        Abre el contenido del archivo, descomprimiéndolo en streaming si corresponde.
+        """
+        return abrir_archivo(self.abrir(), self.nombre)
+
+    def como_file_storage(self):
+        """
+        Devuelve el archivo como `FileStorage`, para encolarlo con `encolar_carga`.
+        """
+        return FileStorage(stream=self.abrir(), filename=os.path.basename(self.nombre))
+
+
+def nombre_tabla_archivo(nombre):
+    """
+    Nombre de tabla que corresponde a un archivo: su nombre sin directorio ni extensiones.
+    """
+    return os.path.splitext(os.path.basename(nombre_sin_compresion(nombre)))[0].lower()
+
+
+def archivos_zip(file):
+    """
+    Lista los archivos de datos de un ZIP subido sin extraerlos: cada miembro se descomprime en
+    streaming al abrirlo con `ArchivoLote.abrir`. Se omiten los directorios y los
+    metadatos de macOS (`__MACOSX/`).
+
+    Lanza:
+    - ErrorLote: Si el archivo no es un ZIP válido.
+    """
+    try:
+        zip_archivo = zipfile.ZipFile(file.stream)
+    except zipfile.BadZipFile:
+        raise ErrorLote({"error": f"El archivo '{file.filename}' no es un ZIP válido."})
+
+    return [
+        # `info=info` fija el miembro en cada función; ZipFile admite abrir miembros desde varios hilos
+        ArchivoLote(info.filename, lambda info=info: zip_archivo.open(info))
+        for info in zip_archivo.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/') and formato_datos(info.filename)
+    ]
+
+
+def archivos_solicitud(files):
+    """
+    Obtiene los archivos de un lote desde los archivos de la solicitud: varios archivos
+    de datos (ver `formato_datos`), o ZIPs cuyos archivos de datos se agregan al lote.
+
+    Parámetros:
+    - files (list): Lista de `FileStorage` recibidos.
+
+    Retorna:
+    - Lista de `ArchivoLote`.
+
+    Lanza:
+    - ErrorLote: Si algún archivo no es de datos ni ZIP, o un ZIP es inválido.
+    """
+    archivos = []
+    for file in files:
+        if file.filename.lower().endswith('.zip'):
+            archivos.extend(archivos_zip(file))
+        elif formato_datos(file.filename):
+            archivos.append(ArchivoLote(file.filename, lambda file=file: file.stream))
+        else:
+            raise ErrorLote({"error": f"Tipo de archivo no permitido: '{file.filename}'."})
+    return archivos
+
+
+def leer_mapeo(valor):
+    """
+    Interpreta el campo `proyectos` de la solicitud: un objeto JSON que asocia el nombre
+    de cada archivo (o su ruta dentro del ZIP) con el ID de su proyecto.
+
+    Lanza:
+    - ErrorLote: Si no es un objeto JSON de nombres a IDs enteros.
+    """
+    if not valor:
+        return {}
+    try:
+        mapeo = json.loads(valor)
+    except ValueError:
+        raise ErrorLote({"error": "El campo 'proyectos' debe ser un objeto JSON {\"archivo.csv\": project_id}."})
+    if not isinstance(mapeo, dict) or not all(isinstance(v, int) for v in mapeo.values()):
+        raise ErrorLote({"error": "El campo 'proyectos' debe ser un objeto JSON {\"archivo.csv\": project_id}."})
+    return mapeo
+
+
+def asignar_proyectos(archivos, mapeo):
+    """
+    Asigna a cada archivo su proyecto: el indicado en `mapeo` por su nombre completo o
+    por su nombre sin directorio y, si no está, el proyecto cuya `nombre_tabla` coincide
+    con el nombre del archivo sin extensión.
+
+    Lanza:
+    - ErrorLote: Si el lote está vacío, algún archivo no tiene proyecto, algún proyecto no
+      existe o dos archivos apuntan al mismo proyecto (se cargarían a la vez en la misma tabla).
+    """
+    if not archivos:
+        raise ErrorLote({"error": "El lote no contiene archivos de datos."})
+
+    sin_mapeo = [archivo for archivo in archivos
+                 if archivo.nombre not in mapeo and os.path.basename(archivo.nombre) not in mapeo]
+    nombres_tabla = {nombre_tabla_archivo(archivo.nombre) for archivo in sin_mapeo}
+    por_tabla = {
+        nombre_tabla.lower(): project_id
+        for project_id, nombre_tabla in ProyectoValidaciones.query.with_entities(
+            ProyectoValidaciones.id, ProyectoValidaciones.nombre_tabla
+        ).filter(func.lower(ProyectoValidaciones.nombre_tabla).in_(nombres_tabla)).all()
+    } if nombres_tabla else {}
+
+    sin_proyecto = []
+    for archivo in archivos:
+        archivo.project_id = mapeo.get(archivo.nombre, mapeo.get(os.path.basename(archivo.nombre)))
+        if archivo.project_id is None:
+            archivo.project_id = por_tabla.get(nombre_tabla_archivo(archivo.nombre))
+        if archivo.project_id is None:
+            sin_proyecto.append(archivo.nombre)
+    if sin_proyecto:
+        raise ErrorLote({
+            "error": "No se pudo asociar un proyecto a algunos archivos. Indíquelos en el campo 'proyectos'.",
+            "archivos_sin_proyecto": sin_proyecto
+        })
+
+    ids = [archivo.project_id for archivo in archivos]
+    existentes = {project_id for (project_id,) in ProyectoValidaciones.query.with_entities(
+        ProyectoValidaciones.id
+    ).filter(ProyectoValidaciones.id.in_(set(ids))).all()}
+    inexistentes = sorted(set(ids) - existentes)
+    if inexistentes:
+        raise ErrorLote({"error": "Algunos proyectos no existen.", "proyectos_inexistentes": inexistentes})
+
+    repetidos = sorted({project_id for project_id in ids if ids.count(project_id) > 1})
+    if repetidos:
+        raise ErrorLote({"error": "Cada proyecto puede recibir un solo archivo por lote.", "proyectos_repetidos": repetidos})
+
+
+def _cargar_archivo(app, archivo, modo, opciones):
+    # Cada hilo usa su propio contexto de aplicación y, por lo tanto, su propia sesión
+    with app.app_context():
+        try:
+            project = ProyectoValidaciones.query.get(archivo.project_id)
+            with archivo.abrir_datos() as stream:
+                respuesta, codigo = ejecutar_carga(project, stream, modo, dict(opciones), archivo.formato)
+        except Exception as e:
+            logger.error(f"Error al procesar el archivo '{archivo.nombre}' del lote: {str(e)}")
+            respuesta, codigo = {"error": f"Error al procesar el archivo: {str(e)}"}, 500
+    return {"archivo": archivo.nombre, "project_id": archivo.project_id, "codigo": codigo, "resultado": respuesta}
+
+
+def procesar_lote(app, archivos, modo, opciones, workers):
+    """
+    Carga los archivos de un lote en sus proyectos, hasta `workers` a la vez. Cada archivo
+    se carga en su propia transacción con `ejecutar_carga`, por lo que el rechazo de uno
+    no afecta a los demás.
+
+    Parámetros:
+    - app (Flask): Aplicación, para abrir un contexto en cada hilo.
+    - archivos (list): `ArchivoLote` con su proyecto asignado.
+    - modo (str): Modo de carga de todos los archivos.
+    - opciones (dict): Opciones de la carga (ver `ejecutar_carga`).
+    - workers (int): Cargas simultáneas como máximo.
+
+    Retorna:
+    - Lista de resultados {"archivo", "project_id", "codigo", "resultado"} en el orden de
+      `archivos`, donde `resultado` es la respuesta de la carga individual.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(archivos)))) as executor:
+        return list(executor.map(lambda archivo: _cargar_archivo(app, archivo, modo, opciones), archivos))
+
+
+def encolar_lote(archivos, modo, opciones):
+    """
+    Encola un trabajo de carga por archivo; los workers de cargas los procesan en paralelo.
+
+    Retorna:
+    - Lista de {"archivo", "project_id", "job_id"} en el orden de `archivos`.
+    """
+    trabajos = []
+    for archivo in archivos:
+        project = ProyectoValidaciones.query.get(archivo.project_id)
+        respuesta, _ = encolar_carga(project, archivo.como_file_storage(), modo, dict(opciones))
+        trabajos.append({"archivo": archivo.nombre, "project_id": archivo.project_id, "job_id": respuesta["job_id"]})
+    return trabajos
@@ -0,0 +1,215 @@
+# backend/app/services/metrics_service.py
+import os
+import time
+from collections import Counter as ConteoReglas
+from contextlib import contextmanager
+
+from flask import g, request, has_request_context
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, CONTENT_TYPE_LATEST, REGISTRY, generate_latest, multiprocess,
+    start_http_server
+)
+
+# Límites de los histogramas de duración, desde milisegundos hasta cargas de varios minutos
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+ETAPA_SEGUNDOS = Histogram(
+    'etapa_segundos', 'Duración de cada etapa de una carga o de una consulta.',
+    ['proyecto', 'etapa'], namespace='validador', buckets=BUCKETS_SEGUNDOS
+)
+REGLA_SEGUNDOS = Histogram(
+    'validacion_regla_segundos', 'Tiempo total de cada regla de validación en una carga.',
+    ['proyecto', 'regla'], namespace='validador', buckets=BUCKETS_SEGUNDOS
+)
+CARGA_SEGUNDOS = Histogram(
+    'carga_segundos', 'Duración total de la carga de un archivo.',
+    ['proyecto', 'modo'], namespace='validador', buckets=BUCKETS_SEGUNDOS
+)
+CARGAS = Counter(
+    'cargas', 'Cargas de archivos procesadas, por código de respuesta.',
+    ['proyecto', 'modo', 'codigo'], namespace='validador'
+)
+CARGA_FILAS = Counter(
+    'carga_filas', 'Filas leídas de los archivos cargados (`leidas`) y filas con errores (`con_errores`).',
+    ['proyecto', 'resultado'], namespace='validador'
+)
+CARGA_BYTES = Counter(
+    'carga_bytes', 'Bytes leídos de los archivos cargados.',
+    ['proyecto'], namespace='validador'
+)
+VALIDACION_ERRORES = Counter(
+    'validacion_errores', 'Errores de validación encontrados, por regla.',
+    ['proyecto', 'regla'], namespace='validador'
+)
+DATOS_FILAS = Counter(
+    'datos_filas', 'Filas devueltas por los endpoints de lectura de datos.',
+    ['proyecto'], namespace='validador'
+)
+SOLICITUD_SEGUNDOS = Histogram(
+    'http_solicitud_segundos', 'Duración de las solicitudes HTTP.',
+    ['endpoint', 'metodo', 'codigo'], namespace='validador', buckets=BUCKETS_SEGUNDOS
+)
+
+
+def registrar_server_timing(nombre, segundos):
+    """
+    Acumula la duración de una etapa para el encabezado `Server-Timing` de la solicitud
+    actual. Fuera de una solicitud (worker de cargas) no hace nada.
+    """
+    if not has_request_context():
+        return
+    tiempos = g.setdefault('server_timing', {})
+    tiempos[nombre] = tiempos.get(nombre, 0.0) + segundos
+
+
+class Cronometro:
+    """
+    Acumula la duración de las etapas de una carga o consulta y las registra al final, una
+    observación por etapa, en `ETAPA_SEGUNDOS` y en el encabezado `Server-Timing`.
+
+    Las etapas que se repiten por bloque (lectura, validación, carga) se suman, de modo que
+    el histograma mide cargas y no bloques.
+
+    Parámetros:
+    - proyecto (str): Etiqueta del proyecto (su `nombre_tabla`); vacía si no aplica.
+    """
+    def __init__(self, proyecto=''):
+        self.proyecto = proyecto
+        self.etapas = {}
+        self.reglas = {}
+
+    @contextmanager
+    def etapa(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas[nombre] = self.etapas.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    def iterar(self, iterador, nombre):
+        """
+        Recorre un iterador (por ejemplo los bloques de `leer_bloques`) sumando a la etapa
+        `nombre` el tiempo de obtener cada elemento.
+        """
+        iterador = iter(iterador)
+        fin = object()
+        while True:
+            with self.etapa(nombre):
+                elemento = next(iterador, fin)
+            if elemento is fin:
+                return
+            yield elemento
+
+    def agregar_reglas(self, tiempos):
+        """
+        Suma los tiempos por regla medidos por el `Validador` (nombre de regla → segundos).
+        """
+        for regla, segundos in tiempos.items():
+            self.reglas[regla] = self.reglas.get(regla, 0.0) + segundos
+
+    def registrar(self):
+        """
+        Registra las etapas y reglas acumuladas y las vacía.
+        """
+        for nombre, segundos in self.etapas.items():
+            ETAPA_SEGUNDOS.labels(self.proyecto, nombre).observe(segundos)
+            registrar_server_timing(nombre, segundos)
+        for regla, segundos in self.reglas.items():
+            REGLA_SEGUNDOS.labels(self.proyecto, regla).observe(segundos)
+            registrar_server_timing(f"regla.{regla}", segundos)
+        self.etapas = {}
+        self.reglas = {}
+
+
+def registrar_bloque(proyecto, filas, errores):
+    """
+    Cuenta las filas leídas de un bloque, las filas con errores y los errores por regla.
+
+    Parámetros:
+    - proyecto (str): `nombre_tabla` del proyecto.
+    - filas (int): Filas del bloque.
+    - errores (list): Errores del bloque, con las claves `fila` y `regla`.
+    """
+    CARGA_FILAS.labels(proyecto, 'leidas').inc(filas)
+    if not errores:
+        return
+    CARGA_FILAS.labels(proyecto, 'con_errores').inc(len({error["fila"] for error in errores}))
+    for regla, cantidad in ConteoReglas(error["regla"] for error in errores).items():
+        VALIDACION_ERRORES.labels(proyecto, regla).inc(cantidad)
+
+
+def bytes_leidos(stream):
+    """
+    Devuelve la posición de un flujo ya leído (los bytes consumidos), o 0 si el flujo no
+    la informa.
+    """
+    try:
+        return stream.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def registrar_carga(proyecto, modo, codigo, segundos, bytes_archivo):
+    """
+    Registra el resultado y la duración total de la carga de un archivo.
+    """
+    CARGAS.labels(proyecto, modo, str(codigo)).inc()
+    CARGA_SEGUNDOS.labels(proyecto, modo).observe(segundos)
+    if bytes_archivo:
+        CARGA_BYTES.labels(proyecto).inc(bytes_archivo)
+
+
+def _iniciar_solicitud():
+    g.inicio_solicitud = time.perf_counter()
+
+
+def _finalizar_solicitud(respuesta):
+    inicio = g.pop('inicio_solicitud', None)
+    if inicio is None:
+        return respuesta
+    segundos = time.perf_counter() - inicio
+
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+    SOLICITUD_SEGUNDOS.labels(endpoint, request.method, str(respuesta.status_code)).observe(segundos)
+
+    tiempos = g.pop('server_timing', {})
+    entradas = [f"{nombre};dur={valor * 1000:.1f}" for nombre, valor in tiempos.items()]
+    entradas.append(f"total;dur={segundos * 1000:.1f}")
+    respuesta.headers['Server-Timing'] = ", ".join(entradas)
+    return respuesta
+
+
+def instrumentar_app(app):
+    """
+    Mide la duración de cada solicitud en `SOLICITUD_SEGUNDOS` y agrega a la respuesta el
+    encabezado `Server-Timing` con las etapas registradas durante ella y el total.
+    """
+    app.before_request(_iniciar_solicitud)
+    app.after_request(_finalizar_solicitud)
+
+
+def generar_metricas():
+    """
+    Serializa las métricas en el formato de texto de Prometheus.
+
+    Si está definida `PROMETHEUS_MULTIPROC_DIR` (varios procesos de gunicorn, o el worker
+    de cargas compartiendo el directorio) se agregan las métricas de todos los procesos.
+
+    Retorna:
+    - Tupla (cuerpo en bytes, content type).
+    """
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
+
+
+def iniciar_servidor_metricas(puerto):
+    """
+    Expone las métricas del proceso actual en un servidor HTTP propio, para procesos sin
+    Flask sirviendo solicitudes (el worker de cargas). Con puerto 0 no hace nada.
+    """
+    if puerto:
+        start_http_server(puerto)
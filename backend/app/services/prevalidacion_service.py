@@ -0,0 +1,307 @@
+# backend/app/services/prevalidacion_service.py
+import logging
+import math
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from flask import current_app
+
+from app.services.arrow_service import FORMATO_CSV
+from app.services.error_report_service import crear_reporte
+from app.services.metrics_service import Cronometro
+from app.services.unicidad_service import VerificadorUnicidad
+from app.services.upload_service import verificar_archivo, leer_datos, ErrorCarga
+from app.services.validation_service import obtener_plan, crear_validador, ErrorConfiguracionValidacion
+
+logger = logging.getLogger(__name__)
+
+# Modos de muestreo: las primeras N filas del archivo o una muestra aleatoria de N filas de todo el archivo
+MUESTREO_PRIMERAS = 'primeras'
+MUESTREO_RESERVORIO = 'reservorio'
+
+# Valor z del intervalo de confianza del 95 % de las tasas estimadas
+Z_95 = 1.96
+
+
+def opciones_muestra(args):
+    """
+    Lee de los parámetros de la solicitud las opciones de muestreo de la validación previa.
+
+    Parámetros:
+    - args: Parámetros de consulta (`request.args`). Se usan `muestra` (filas a validar;
+      ausente o 0 valida el archivo completo), `muestreo` (`primeras` o `reservorio`) y
+      `semilla` (para repetir una muestra aleatoria).
+
+    Retorna:
+    - dict {"muestra", "muestreo", "semilla"}.
+
+    Lanza:
+    - ValueError: Si algún parámetro no es válido.
+    """
+    try:
+        muestra = int(args.get('muestra', 0))
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro 'muestra' debe ser un número entero.")
+    if muestra < 0:
+        raise ValueError("El parámetro 'muestra' no puede ser negativo.")
+
+    muestreo = args.get('muestreo', MUESTREO_PRIMERAS).lower()
+    if muestreo not in (MUESTREO_PRIMERAS, MUESTREO_RESERVORIO):
+        raise ValueError(f"El parámetro 'muestreo' debe ser '{MUESTREO_PRIMERAS}' o '{MUESTREO_RESERVORIO}'.")
+
+    semilla = args.get('semilla')
+    if semilla is not None:
+        try:
+            semilla = int(semilla)
+        except ValueError:
+            raise ValueError("El parámetro 'semilla' debe ser un número entero.")
+
+    return {"muestra": muestra or None, "muestreo": muestreo, "semilla": semilla}
+
+
+def primeras_filas(bloques, cantidad):
+    """
+    Recorta los bloques de un archivo a sus primeras `cantidad` filas y deja de leer el
+    archivo al alcanzarlas.
+    """
+    restantes = cantidad
+    for df in bloques:
+        if len(df) >= restantes:
+            yield df.iloc[:restantes]
+            return
+        restantes -= len(df)
+        yield df
+
+
+class Reservorio:
+    """
+    Muestra aleatoria uniforme de `tamano` filas de un archivo leído por bloques, sin
+    conocer de antemano su cantidad de filas (muestreo de reservorio, algoritmo R).
+
+    Cada bloque se procesa de forma vectorizada: la fila en la posición `i` del archivo
+    reemplaza a una posición al azar de `0..i` si esa posición es menor que `tamano`. En
+    memoria solo quedan las filas de la muestra.
+
+    Parámetros:
+    - tamano (int): Filas de la muestra.
+    - semilla (int): Semilla del generador aleatorio, para repetir la muestra.
+
+    Atributos:
+    - filas_leidas (int): Filas del archivo recorridas.
+    """
+    def __init__(self, tamano, semilla=None):
+        self.tamano = tamano
+        self.filas_leidas = 0
+        self._generador = np.random.default_rng(semilla)
+        self._muestra = None
+        self._posiciones = np.empty(0, dtype=np.int64)
+        self._tipos = None
+
+    def agregar(self, df):
+        """
+        Recorre un bloque del archivo y actualiza la muestra.
+        """
+        if self._tipos is None:
+            self._tipos = df.dtypes
+        inicio = self.filas_leidas
+        self.filas_leidas += len(df)
+
+        # Las primeras filas del archivo llenan la muestra
+        libres = max(0, min(self.tamano - inicio, len(df)))
+        if libres:
+            self._agregar_filas(df.iloc[:libres], np.arange(inicio, inicio + libres), reemplazar=False)
+        if libres == len(df):
+            return
+
+        filas = np.arange(libres, len(df))
+        posiciones = self._generador.integers(0, inicio + filas + 1)
+        elegidas = posiciones < self.tamano
+        filas, posiciones = filas[elegidas], posiciones[elegidas]
+        if not len(filas):
+            return
+        # Si varias filas del bloque caen en la misma posición queda la última, como al recorrerlas una a una
+        _, ultimas = np.unique(posiciones[::-1], return_index=True)
+        ultimas = len(posiciones) - 1 - ultimas
+        self._agregar_filas(df.iloc[filas[ultimas]], posiciones[ultimas], reemplazar=True)
+
+    def _agregar_filas(self, df, posiciones, reemplazar):
+        if self._muestra is None:
+            self._muestra, self._posiciones = df, posiciones
+            return
+        if reemplazar:
+            conservar = ~np.isin(self._posiciones, posiciones)
+            self._muestra = self._muestra[conservar]
+            self._posiciones = self._posiciones[conservar]
+        self._muestra = pd.concat([self._muestra, df])
+        self._posiciones = np.concatenate([self._posiciones, posiciones])
+
+    def muestra(self):
+        """
+        Retorna:
+        - DataFrame con las filas de la muestra en el orden del archivo. Su índice es el
+          del archivo, por lo que los errores informan la fila original.
+        """
+        if self._muestra is None:
+            return pd.DataFrame()
+        df = self._muestra.sort_index()
+        # Unir bloques con categorías distintas convierte las columnas `category` en objetos
+        categorias = [
+            columna for columna, tipo in self._tipos.items()
+            if isinstance(tipo, pd.CategoricalDtype) and not isinstance(df[columna].dtype, pd.CategoricalDtype)
+        ]
+        return df.astype({columna: 'category' for columna in categorias}) if categorias else df
+
+
+def intervalo_wilson(errores, filas, z=Z_95):
+    """
+    Intervalo de confianza de Wilson de una proporción de errores, que sigue siendo
+    válido con tasas cercanas a 0 o con pocas filas.
+
+    Retorna:
+    - Lista [mínimo, máximo], o None si no hay filas.
+    """
+    if not filas:
+        return None
+    p = errores / filas
+    denominador = 1 + z ** 2 / filas
+    centro = (p + z ** 2 / (2 * filas)) / denominador
+    margen = z * math.sqrt(p * (1 - p) / filas + z ** 2 / (4 * filas ** 2)) / denominador
+    return [round(max(0.0, centro - margen), 6), round(min(1.0, centro + margen), 6)]
+
+
+def tasas_error(plan, conteos, filas, estimadas):
+    """
+    Calcula la tasa de error de cada regla (errores por fila validada), con su intervalo
+    de confianza del 95 % si las filas validadas son una muestra del archivo.
+
+    Parámetros:
+    - plan (PlanValidacion): Plan del proyecto; se informan todas sus reglas, aun sin errores.
+    - conteos (Counter): Errores por (campo, regla), sin límite de `max_errores`.
+    - filas (int): Filas validadas.
+    - estimadas (bool): Si las filas validadas son una muestra del archivo.
+
+    Retorna:
+    - Lista de {"campo", "regla", "errores", "tasa", "intervalo_95"}.
+    """
+    claves = list(dict.fromkeys([(regla.campo, regla.nombre_regla) for regla in plan.reglas] + list(conteos)))
+    return [
+        {
+            "campo": campo,
+            "regla": regla,
+            "errores": conteos[(campo, regla)],
+            "tasa": round(conteos[(campo, regla)] / filas, 6) if filas else None,
+            "intervalo_95": intervalo_wilson(conteos[(campo, regla)], filas) if estimadas else None
+        }
+        for campo, regla in claves
+    ]
+
+
+def prevalidar_archivo(project, stream, opciones=None, formato=FORMATO_CSV, muestra=None,
+                       muestreo=MUESTREO_PRIMERAS, semilla=None):
+    """
+    Valida un archivo sin cargarlo: verifica el esquema y ejecuta las validaciones y la
+    unicidad dentro del archivo, sin crear ni modificar la tabla del proyecto ni eliminar
+    el proyecto si hay errores.
+
+    Con `muestra` se valida solo una muestra de filas:
+    - `MUESTREO_PRIMERAS`: las primeras `muestra` filas; se deja de leer el archivo al
+      alcanzarlas, por lo que responde en segundos aun con archivos de varios GB. La
+      muestra no es aleatoria: si los errores se concentran en alguna parte del archivo,
+      las tasas pueden no representarlo.
+    - `MUESTREO_RESERVORIO`: `muestra` filas al azar de todo el archivo, que se recorre
+      por bloques de `VALIDATION_SAMPLE_CHUNK_SIZE` filas sin guardarlo en memoria.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto cuyo esquema y validaciones se aplican.
+    - stream: Flujo binario del archivo.
+    - opciones (dict): Opciones del reporte de errores (ver `opciones_reporte`).
+    - formato (str): Formato del archivo (`FORMATO_CSV`, `FORMATO_PARQUET` o `FORMATO_ARROW`).
+    - muestra (int): Filas a validar; None valida el archivo completo.
+    - muestreo (str): `MUESTREO_PRIMERAS` o `MUESTREO_RESERVORIO`.
+    - semilla (int): Semilla de la muestra aleatoria.
+
+    Retorna:
+    - Tupla (respuesta, código HTTP). Con 200 la respuesta indica si las filas validadas
+      son `validas`, las filas leídas y validadas, el detalle y resumen de errores (como
+      la respuesta 400 de la carga) y en `tasas` la tasa de error de cada regla. Con 400,
+      el esquema no coincide o las validaciones del proyecto son inválidas.
+    """
+    opciones = opciones or {}
+    cronometro = Cronometro(project.nombre_tabla)
+    inicio = time.perf_counter()
+    try:
+        return _prevalidar_archivo(project, stream, opciones, formato, muestra, muestreo, semilla, cronometro, inicio)
+    except (ErrorConfiguracionValidacion, ErrorCarga) as e:
+        return e.respuesta, 400
+    except Exception as e:
+        logger.error(f"Error al validar el archivo: {str(e)}")
+        return {"error": f"Error al validar el archivo: {str(e)}"}, 500
+    finally:
+        cronometro.registrar()
+
+
+def _prevalidar_archivo(project, stream, opciones, formato, muestra, muestreo, semilla, cronometro, inicio):
+    with cronometro.etapa('plan'):
+        plan = obtener_plan(project)
+    with cronometro.etapa('esquema'):
+        origen = verificar_archivo(stream, plan, project, formato)
+
+    if muestra and muestreo == MUESTREO_PRIMERAS:
+        chunksize = min(muestra, current_app.config['VALIDATION_SAMPLE_CHUNK_SIZE'])
+    elif muestra:
+        chunksize = current_app.config['VALIDATION_SAMPLE_CHUNK_SIZE']
+    else:
+        chunksize = current_app.config['UPLOAD_CHUNK_SIZE']
+    bloques = leer_datos(stream, origen, plan, chunksize)
+
+    if muestra and muestreo == MUESTREO_RESERVORIO:
+        reservorio = Reservorio(muestra, semilla)
+        for df in cronometro.iterar(bloques, 'lectura'):
+            with cronometro.etapa('muestreo'):
+                reservorio.agregar(df)
+        with cronometro.etapa('muestreo'):
+            bloques = iter([reservorio.muestra()])
+        filas_leidas = reservorio.filas_leidas
+    elif muestra:
+        bloques = primeras_filas(bloques, muestra)
+
+    conteos = Counter()
+    filas_con_errores = 0
+    filas = 0
+    unicidad = VerificadorUnicidad(plan.esquemas)
+    with crear_reporte(opciones) as reporte, crear_validador(plan.reglas) as validador:
+        for df in cronometro.iterar(bloques, 'lectura'):
+            # Sin límite de errores: las tasas se calculan con todos los errores de cada bloque
+            with cronometro.etapa('validacion'):
+                errores = validador.validar(df, 0)
+            with cronometro.etapa('unicidad'):
+                errores += unicidad.validar(df)
+            errores.sort(key=lambda error: error["fila"])
+            filas += len(df)
+            conteos.update((error["campo"], error["regla"]) for error in errores)
+            filas_con_errores += len({error["fila"] for error in errores})
+            if reporte.agregar(errores):
+                break
+        cronometro.agregar_reglas(validador.tiempos)
+        resultado = reporte.respuesta()
+
+    if not muestra or muestreo == MUESTREO_PRIMERAS:
+        filas_leidas = filas
+    # Las tasas son estimaciones si no se validó el archivo completo
+    estimadas = bool(muestra) or reporte.limite_alcanzado
+    resultado.pop("error")
+    return {
+        "validas": not reporte.total,
+        "muestreo": muestreo if muestra else None,
+        "muestra": muestra,
+        "filas_leidas": filas_leidas,
+        "filas_validadas": filas,
+        "filas_con_errores": filas_con_errores,
+        "tasa_filas_con_errores": round(filas_con_errores / filas, 6) if filas else None,
+        "tasas_estimadas": estimadas,
+        "tasas": tasas_error(plan, conteos, filas, estimadas),
+        **resultado,
+        "segundos": round(time.perf_counter() - inicio, 3)
+    }, 200
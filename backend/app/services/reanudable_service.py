@@ -0,0 +1,368 @@
+# backend/app/services/reanudable_service.py
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Tamaño mínimo de bloque (salvo el último) y tamaño de lectura del cuerpo de cada bloque
+TAMANO_BLOQUE_MINIMO = 1024 * 1024
+TAMANO_LECTURA = 1024 * 1024
+
+ARCHIVO_SESION = 'sesion.json'
+ARCHIVO_DATOS = 'datos'
+DIRECTORIO_BLOQUES = 'bloques'
+
+
+class ErrorCargaReanudable(Exception):
+    """
+    Error en una carga reanudable (carga inexistente, bloque fuera de rango, checksum
+    distinto, carga incompleta).
+
+    Atributos:
+    - respuesta (dict): Cuerpo de la respuesta de error.
+    - codigo (int): Código HTTP de la respuesta.
+    """
+    def __init__(self, respuesta, codigo=400):
+        super().__init__(respuesta.get("error"))
+        self.respuesta = respuesta
+        self.codigo = codigo
+
+
+def directorio_carga(upload_id):
+    """
+    Devuelve el directorio de una carga reanudable existente.
+
+    Lanza:
+    - ErrorCargaReanudable (404): Si el ID no tiene el formato de los generados por
+      `crear_carga` o la carga no existe (finalizada, cancelada o expirada).
+    """
+    if re.fullmatch(r'[0-9a-f]{32}', upload_id):
+        directorio = os.path.join(current_app.config['UPLOAD_RESUMABLE_DIR'], upload_id)
+        if os.path.isfile(os.path.join(directorio, ARCHIVO_SESION)):
+            return directorio
+    raise ErrorCargaReanudable({"error": "Carga reanudable no encontrada."}, 404)
+
+
+def leer_sesion(upload_id):
+    """
+    Lee los datos de una carga reanudable guardados por `crear_carga`.
+
+    Lanza:
+    - ErrorCargaReanudable (404): Si la carga no existe.
+    """
+    directorio = directorio_carga(upload_id)
+    with open(os.path.join(directorio, ARCHIVO_SESION), encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def limpiar_cargas(directorio, ttl):
+    """
+    Elimina las cargas reanudables sin actividad (sin bloques recibidos) en los últimos
+    `ttl` segundos.
+    """
+    limite = time.time() - ttl
+    for entrada in os.scandir(directorio):
+        try:
+            if entrada.is_dir() and entrada.stat().st_mtime < limite:
+                shutil.rmtree(entrada.path)
+        except OSError as e:
+            logger.error(f"No se pudo eliminar la carga reanudable {entrada.name}: {str(e)}")
+
+
+def crear_carga(project, nombre_archivo, tamano, modo, opciones, tamano_bloque=None, sha256=None):
+    """
+    Inicia una carga reanudable: reserva en `UPLOAD_RESUMABLE_DIR` un archivo del tamaño
+    total donde cada bloque se escribe en su posición a medida que llega.
+
+    Los datos de la carga se guardan en disco (y no en memoria del proceso) para que
+    cualquier worker de gunicorn pueda recibir los bloques y la carga sobreviva a un
+    reinicio.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto destino.
+    - nombre_archivo (str): Nombre del archivo; determina el formato y la compresión.
+    - tamano (int): Tamaño total del archivo en bytes.
+    - modo (str): Modo de la carga al finalizar.
+    - opciones (dict): Opciones de la carga (ver `ejecutar_carga`).
+    - tamano_bloque (int): Bytes de cada bloque (salvo el último); por defecto
+      `UPLOAD_RESUMABLE_CHUNK_SIZE`.
+    - sha256 (str): Checksum SHA-256 opcional del archivo completo, que se verifica al
+      finalizar.
+
+    Retorna:
+    - dict con los datos de la carga (ver `estado_carga`).
+
+    Lanza:
+    - ErrorCargaReanudable: 400 si el tamaño, el tamaño de bloque o el checksum no son
+      válidos; 413 si el tamaño supera `UPLOAD_RESUMABLE_MAX_SIZE`; 507 si no se puede
+      reservar el archivo en disco.
+    """
+    tamano_maximo = current_app.config['UPLOAD_RESUMABLE_MAX_CHUNK_SIZE']
+    if tamano_bloque is None:
+        tamano_bloque = current_app.config['UPLOAD_RESUMABLE_CHUNK_SIZE']
+    if not isinstance(tamano, int) or isinstance(tamano, bool) or tamano <= 0:
+        raise ErrorCargaReanudable({"error": "El campo 'tamano' debe ser un número entero positivo."})
+    if tamano > current_app.config['UPLOAD_RESUMABLE_MAX_SIZE']:
+        raise ErrorCargaReanudable({
+            "error": f"El archivo no puede superar {current_app.config['UPLOAD_RESUMABLE_MAX_SIZE']} bytes."
+        }, 413)
+    if not isinstance(tamano_bloque, int) or isinstance(tamano_bloque, bool) \
+            or not TAMANO_BLOQUE_MINIMO <= tamano_bloque <= tamano_maximo:
+        raise ErrorCargaReanudable({
+            "error": f"El campo 'tamano_bloque' debe estar entre {TAMANO_BLOQUE_MINIMO} y {tamano_maximo} bytes."
+        })
+    if sha256 is not None and not (isinstance(sha256, str) and re.fullmatch(r'[0-9a-fA-F]{64}', sha256)):
+        raise ErrorCargaReanudable({"error": "El campo 'sha256' debe ser un SHA-256 en hexadecimal."})
+
+    raiz = current_app.config['UPLOAD_RESUMABLE_DIR']
+    os.makedirs(raiz, exist_ok=True)
+    limpiar_cargas(raiz, current_app.config['UPLOAD_RESUMABLE_TTL'])
+
+    upload_id = uuid.uuid4().hex
+    directorio = os.path.join(raiz, upload_id)
+    os.makedirs(os.path.join(directorio, DIRECTORIO_BLOQUES))
+    try:
+        # Archivo disperso: no ocupa disco hasta que se escriben los bloques
+        with open(os.path.join(directorio, ARCHIVO_DATOS), 'wb') as archivo:
+            archivo.truncate(tamano)
+    except OSError as e:
+        # Sin sesión el directorio nunca se completaría: se elimina en lugar de esperar al TTL
+        shutil.rmtree(directorio, ignore_errors=True)
+        logger.error(f"No se pudo reservar el archivo de la carga reanudable: {str(e)}")
+        raise ErrorCargaReanudable({"error": "No se pudo reservar espacio en disco para la carga."}, 507)
+
+    sesion = {
+        "upload_id": upload_id,
+        "project_id": project.id,
+        "nombre_archivo": nombre_archivo,
+        "tamano": tamano,
+        "tamano_bloque": tamano_bloque,
+        "total_bloques": -(-tamano // tamano_bloque),
+        "sha256": sha256.lower() if sha256 else None,
+        "modo": modo,
+        "opciones": opciones,
+        "fecha_creacion": datetime.utcnow().isoformat()
+    }
+    # La sesión se escribe al final: su existencia indica que la carga está lista
+    with open(os.path.join(directorio, ARCHIVO_SESION), 'w', encoding='utf-8') as archivo:
+        json.dump(sesion, archivo)
+    return estado_carga(upload_id)
+
+
+def _bloques_recibidos(directorio):
+    # Cada bloque recibido tiene un archivo `<índice>.sha256` con su checksum
+    bloques = {}
+    for entrada in os.scandir(os.path.join(directorio, DIRECTORIO_BLOQUES)):
+        indice, _, extension = entrada.name.partition('.')
+        if extension == 'sha256' and indice.isdigit():
+            with open(entrada.path, encoding='utf-8') as archivo:
+                bloques[int(indice)] = archivo.read().strip()
+    return bloques
+
+
+def recibir_bloque(upload_id, offset, stream, longitud=None, sha256=None):
+    """
+    Escribe un bloque de una carga reanudable en su posición del archivo, leyendo el
+    cuerpo de la solicitud por partes y calculando su SHA-256 al mismo tiempo.
+
+    El bloque solo se marca como recibido si llegó completo y su checksum coincide con
+    `sha256` (si se indica); si no, se puede volver a enviar. Reenviar un bloque ya
+    recibido lo reemplaza.
+
+    Parámetros:
+    - upload_id (str): ID de la carga.
+    - offset (int): Posición del bloque en el archivo; múltiplo de `tamano_bloque`.
+    - stream: Flujo binario con el contenido del bloque (`request.stream`).
+    - longitud (int): `Content-Length` de la solicitud, si se envió.
+    - sha256 (str): Checksum SHA-256 del bloque enviado por el cliente.
+
+    Retorna:
+    - dict {"indice", "offset", "tamano", "sha256"} del bloque recibido.
+
+    Lanza:
+    - ErrorCargaReanudable: 404 si la carga no existe; 400 si el offset o el tamaño del
+      bloque no corresponden o el checksum no coincide; 409 si la carga se finalizó o
+      canceló mientras se recibía el bloque.
+    """
+    sesion = leer_sesion(upload_id)
+    directorio = directorio_carga(upload_id)
+    tamano_bloque = sesion["tamano_bloque"]
+    if offset < 0 or offset >= sesion["tamano"] or offset % tamano_bloque:
+        raise ErrorCargaReanudable({
+            "error": f"El offset debe ser un múltiplo de {tamano_bloque} menor que {sesion['tamano']}."
+        })
+    esperado = min(tamano_bloque, sesion["tamano"] - offset)
+    if longitud is not None and longitud != esperado:
+        raise ErrorCargaReanudable({"error": f"El bloque en el offset {offset} debe tener {esperado} bytes."})
+
+    indice = offset // tamano_bloque
+    marca = os.path.join(directorio, DIRECTORIO_BLOQUES, f"{indice}.sha256")
+
+    checksum = hashlib.sha256()
+    recibidos = 0
+    try:
+        # El bloque deja de estar recibido mientras se reescribe; `finalizar_carga` vuelve
+        # a contar los bloques después de reclamar el archivo
+        if os.path.exists(marca):
+            os.remove(marca)
+        # Cada bloque ocupa una región distinta del archivo, por lo que varios procesos pueden escribir a la vez
+        with open(os.path.join(directorio, ARCHIVO_DATOS), 'r+b') as archivo:
+            archivo.seek(offset)
+            while recibidos <= esperado:
+                parte = stream.read(min(TAMANO_LECTURA, esperado + 1 - recibidos))
+                if not parte:
+                    break
+                recibidos += len(parte)
+                if recibidos > esperado:
+                    break
+                checksum.update(parte)
+                archivo.write(parte)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+    except FileNotFoundError:
+        # `finalizar_carga` renombró el archivo o `cancelar_carga` eliminó el directorio
+        raise ErrorCargaReanudable({"error": "La carga se está finalizando o fue cancelada."}, 409)
+
+    if recibidos != esperado:
+        raise ErrorCargaReanudable({
+            "error": f"El bloque en el offset {offset} debe tener {esperado} bytes.",
+            "bytes_recibidos": recibidos
+        })
+    calculado = checksum.hexdigest()
+    if sha256 and sha256.lower() != calculado:
+        raise ErrorCargaReanudable({
+            "error": "El checksum del bloque no coincide; vuelva a enviarlo.",
+            "offset": offset,
+            "sha256_esperado": sha256.lower(),
+            "sha256_calculado": calculado
+        })
+
+    temporal = f"{marca}.{uuid.uuid4().hex}"
+    try:
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(calculado)
+        os.replace(temporal, marca)
+        # Actividad reciente: la carga no se descarta por `UPLOAD_RESUMABLE_TTL`
+        os.utime(directorio)
+    except FileNotFoundError:
+        raise ErrorCargaReanudable({"error": "La carga se está finalizando o fue cancelada."}, 409)
+    return {"indice": indice, "offset": offset, "tamano": esperado, "sha256": calculado}
+
+
+def estado_carga(upload_id):
+    """
+    Informa el avance de una carga reanudable, para que el cliente reenvíe solo los
+    bloques que faltan.
+
+    Retorna:
+    - dict con los datos de la carga, `bytes_recibidos`, `completa`, los bloques
+      recibidos (`indice`, `offset`, `tamano`, `sha256`) y los offsets de los faltantes.
+
+    Lanza:
+    - ErrorCargaReanudable (404): Si la carga no existe.
+    """
+    sesion = leer_sesion(upload_id)
+    recibidos = _bloques_recibidos(directorio_carga(upload_id))
+    tamano_bloque = sesion["tamano_bloque"]
+    bloques = [
+        {
+            "indice": indice,
+            "offset": indice * tamano_bloque,
+            "tamano": min(tamano_bloque, sesion["tamano"] - indice * tamano_bloque),
+            "sha256": recibidos[indice]
+        }
+        for indice in sorted(recibidos) if indice < sesion["total_bloques"]
+    ]
+    faltantes = [indice * tamano_bloque for indice in range(sesion["total_bloques"]) if indice not in recibidos]
+    return {
+        "upload_id": sesion["upload_id"],
+        "project_id": sesion["project_id"],
+        "nombre_archivo": sesion["nombre_archivo"],
+        "tamano": sesion["tamano"],
+        "tamano_bloque": tamano_bloque,
+        "total_bloques": sesion["total_bloques"],
+        "bytes_recibidos": sum(bloque["tamano"] for bloque in bloques),
+        "completa": not faltantes,
+        "bloques": bloques,
+        "offsets_faltantes": faltantes
+    }
+
+
+def _sha256_archivo(ruta):
+    checksum = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for parte in iter(lambda: archivo.read(TAMANO_LECTURA), b''):
+            checksum.update(parte)
+    return checksum.hexdigest()
+
+
+def finalizar_carga(upload_id, destino):
+    """
+    Cierra una carga reanudable completa: verifica que se recibieron todos los bloques
+    (y el SHA-256 del archivo, si se indicó al iniciarla) y mueve el archivo armado a
+    `destino`, sin copiarlo si está en el mismo sistema de archivos.
+
+    Parámetros:
+    - upload_id (str): ID de la carga.
+    - destino (str): Ruta final del archivo (ver `ruta_spool`).
+
+    Retorna:
+    - dict con los datos de la sesión (`project_id`, `nombre_archivo`, `modo`, `opciones`).
+
+    Lanza:
+    - ErrorCargaReanudable: 404 si la carga no existe; 409 si faltan bloques o la carga
+      ya se está finalizando; 400 si el SHA-256 del archivo no coincide.
+    """
+    estado = estado_carga(upload_id)
+    if not estado["completa"]:
+        raise ErrorCargaReanudable({
+            "error": "Faltan bloques de la carga.",
+            "offsets_faltantes": estado["offsets_faltantes"]
+        }, 409)
+
+    sesion = leer_sesion(upload_id)
+    directorio = directorio_carga(upload_id)
+    # Renombrar el archivo reclama la carga: una segunda finalización simultánea no lo encuentra
+    reclamado = os.path.join(directorio, f"{ARCHIVO_DATOS}.finalizando")
+    try:
+        os.rename(os.path.join(directorio, ARCHIVO_DATOS), reclamado)
+    except FileNotFoundError:
+        raise ErrorCargaReanudable({"error": "La carga ya se está finalizando."}, 409)
+    # Un bloque que se reescribía al reclamar el archivo quitó su marca antes de abrirlo
+    faltantes = sesion["total_bloques"] - len(_bloques_recibidos(directorio))
+    if faltantes:
+        os.rename(reclamado, os.path.join(directorio, ARCHIVO_DATOS))
+        raise ErrorCargaReanudable({"error": "Se está reenviando un bloque de la carga; vuelva a intentarlo."}, 409)
+
+    if sesion["sha256"]:
+        calculado = _sha256_archivo(reclamado)
+        if calculado != sesion["sha256"]:
+            os.rename(reclamado, os.path.join(directorio, ARCHIVO_DATOS))
+            raise ErrorCargaReanudable({
+                "error": "El checksum del archivo no coincide con el indicado al iniciar la carga.",
+                "sha256_esperado": sesion["sha256"],
+                "sha256_calculado": calculado
+            })
+
+    shutil.move(reclamado, destino)
+    shutil.rmtree(directorio, ignore_errors=True)
+    return sesion
+
+
+def cancelar_carga(upload_id):
+    """
+    Descarta una carga reanudable y los bloques recibidos.
+
+    Lanza:
+    - ErrorCargaReanudable (404): Si la carga no existe.
+    """
+    shutil.rmtree(directorio_carga(upload_id))
@@ -0,0 +1,134 @@
+# backend/app/services/staging_service.py
+import logging
+import re
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+
+class TablaStaging:
+    """
+    Tabla auxiliar donde se carga el contenido nuevo de `datos.<tabla>` en un reemplazo,
+    para intercambiarla con la original al final sin bloquear a los lectores durante la
+    carga.
+
+    Atributos:
+    - tabla (str): Tabla del proyecto en el esquema `datos`.
+    - staging (str): Tabla donde se cargan los datos (`<tabla>__staging_<n>`).
+    - anterior (str): Nombre que recibe la tabla original al intercambiarlas
+      (`<tabla>__old_<n>`).
+    """
+    def __init__(self, tabla):
+        sufijo = uuid.uuid4().hex[:8]
+        self.tabla = tabla
+        self.sufijo = sufijo
+        self.staging = f"{tabla}__staging_{sufijo}"
+        self.anterior = f"{tabla}__old_{sufijo}"
+        self._indices = []
+
+    def crear(self):
+        """
+        Crea la tabla staging con las columnas, valores por defecto y restricciones de
+        comprobación de la original, pero sin índices: se construyen después de cargar.
+
+        Retorna:
+        - Nombre calificado de la tabla staging.
+        """
+        self._indices = db.session.execute(text("""
+            SELECT i.relname AS nombre,
+                   pg_get_indexdef(x.indexrelid) AS definicion,
+                   c.conname AS restriccion,
+                   pg_get_constraintdef(c.oid) AS definicion_restriccion
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            LEFT JOIN pg_constraint c
+                ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid AND c.contype IN ('p', 'u')
+            WHERE x.indrelid = CAST(:tabla AS regclass)
+            ORDER BY i.relname;
+        """), {"tabla": f"datos.{self.tabla}"}).mappings().all()
+
+        db.session.execute(text(
+            f"CREATE TABLE datos.{self.staging} (LIKE datos.{self.tabla} INCLUDING ALL EXCLUDING INDEXES);"
+        ))
+        return f"datos.{self.staging}"
+
+    def construir_indices(self):
+        """
+        Crea en la tabla staging, ya cargada, los índices y restricciones únicas de la
+        original con nombres temporales.
+        """
+        for numero, indice in enumerate(self._indices):
+            nombre = f"stg_{self.sufijo}_{numero}"
+            if indice["restriccion"]:
+                db.session.execute(text(
+                    f"ALTER TABLE datos.{self.staging} ADD CONSTRAINT {nombre} {indice['definicion_restriccion']};"
+                ))
+            else:
+                definicion = re.sub(
+                    r"^CREATE (UNIQUE )?INDEX \S+ ON \S+ ",
+                    lambda coincidencia: f"CREATE {coincidencia.group(1) or ''}INDEX {nombre} ON datos.{self.staging} ",
+                    indice["definicion"]
+                )
+                db.session.execute(text(definicion))
+
+    def intercambiar(self):
+        """
+        Reemplaza la tabla original por la staging renombrando ambas, renombra sus
+        índices para que la nueva tabla conserve los nombres originales y elimina la
+        original (`eliminar_anterior`).
+
+        Son cambios solo de catálogo: el bloqueo exclusivo sobre la tabla original dura
+        lo que tarde en confirmarse la transacción, sin importar el tamaño del archivo.
+        """
+        # La secuencia de `id` pasa a la tabla nueva para que no se elimine con la anterior
+        secuencia = db.session.execute(
+            text("SELECT pg_get_serial_sequence(:tabla, 'id');"),
+            {"tabla": f"datos.{self.tabla}"}
+        ).scalar()
+        if secuencia:
+            db.session.execute(text(f"ALTER SEQUENCE {secuencia} OWNED BY datos.{self.staging}.id;"))
+
+        db.session.execute(text(f"ALTER TABLE datos.{self.tabla} RENAME TO {self.anterior};"))
+        db.session.execute(text(f"ALTER TABLE datos.{self.staging} RENAME TO {self.tabla};"))
+
+        for numero, indice in enumerate(self._indices):
+            temporal = f"stg_{self.sufijo}_{numero}"
+            anterior = f"old_{self.sufijo}_{numero}"
+            if indice["restriccion"]:
+                db.session.execute(text(
+                    f"ALTER TABLE datos.{self.anterior} RENAME CONSTRAINT {indice['restriccion']} TO {anterior};"
+                ))
+                db.session.execute(text(
+                    f"ALTER TABLE datos.{self.tabla} RENAME CONSTRAINT {temporal} TO {indice['restriccion']};"
+                ))
+            else:
+                db.session.execute(text(f"ALTER INDEX datos.{indice['nombre']} RENAME TO {anterior};"))
+                db.session.execute(text(f"ALTER INDEX datos.{temporal} RENAME TO {indice['nombre']};"))
+
+        self.eliminar_anterior()
+
+    def eliminar_anterior(self):
+        """
+        Elimina la tabla original ya renombrada, en la misma transacción del intercambio:
+        el bloqueo exclusivo que necesita ya lo tomó el `RENAME`, y se elimina solo si el
+        reemplazo se confirma.
+
+        Un error al eliminarla (por ejemplo una vista que depende de ella) no cancela el
+        reemplazo: se revierte solo el `DROP` y se registra con el nombre de la tabla
+        para eliminarla a mano.
+
+        Retorna:
+        - True si la tabla se eliminó.
+        """
+        try:
+            with db.session.begin_nested():
+                db.session.execute(text(f"DROP TABLE datos.{self.anterior};"))
+        except SQLAlchemyError as e:
+            logger.error(f"No se pudo eliminar la tabla anterior datos.{self.anterior}: {str(e)}")
+            return False
+        return True
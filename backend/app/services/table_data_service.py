@@ -0,0 +1,117 @@
+# backend/app/services/table_data_service.py
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app import db
+
+
+def serializar_valor(valor):
+    """
+    Convierte los tipos devueltos por PostgreSQL que no son serializables en JSON.
+    """
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return valor
+
+
+def serializar_fila(row):
+    """
+    Convierte una fila (mapping) de la tabla de datos en un diccionario serializable.
+    """
+    return {columna: serializar_valor(valor) for columna, valor in row.items()}
+
+
+def tabla_existe(table_name):
+    """
+    Indica si la tabla `datos.<table_name>` existe.
+    """
+    table_exists_query = text("""
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = 'datos'
+            AND table_name = :table_name
+        );
+    """)
+    return db.session.execute(table_exists_query, {"table_name": table_name}).scalar()
+
+
+def tiene_columna_id(table_name):
+    """
+    Indica si la tabla `datos.<table_name>` tiene la columna `id` que generan las cargas
+    (`id SERIAL PRIMARY KEY`), necesaria para paginar por cursor.
+    """
+    columna_query = text("""
+        SELECT EXISTS (
+            SELECT FROM information_schema.columns
+            WHERE table_schema = 'datos'
+            AND table_name = :table_name
+            AND column_name = 'id'
+        );
+    """)
+    return db.session.execute(columna_query, {"table_name": table_name}).scalar()
+
+
+def leer_pagina(table_name, after_id=None, limit=100):
+    """
+    Lee una página de filas de `datos.<table_name>` ordenadas por `id`, a partir del cursor
+    `after_id` (paginación por clave, sin OFFSET).
+
+    Parámetros:
+    - table_name (str): Tabla en el esquema `datos`.
+    - after_id (int): Devuelve filas con `id` mayor a este valor; None desde el inicio.
+    - limit (int): Cantidad máxima de filas.
+
+    Retorna:
+    - Tupla (filas serializadas, next_after_id). `next_after_id` es None en la última página.
+    """
+    condicion = "WHERE id > :after_id" if after_id is not None else ""
+    filas = db.session.execute(
+        text(f"SELECT * FROM datos.{table_name} {condicion} ORDER BY id LIMIT :limit;"),
+        {"after_id": after_id, "limit": limit}
+    ).mappings().all()
+
+    next_after_id = filas[-1]["id"] if len(filas) == limit else None
+    return [serializar_fila(fila) for fila in filas], next_after_id
+
+
+def leer_muestra(table_name, limit):
+    """
+    Lee las primeras `limit` filas de `datos.<table_name>`, ordenadas por `id` si la tabla
+    tiene esa columna.
+
+    Retorna:
+    - Tupla (filas serializadas, next_after_id) como `leer_pagina`.
+    """
+    if tiene_columna_id(table_name):
+        return leer_pagina(table_name, None, limit)
+
+    filas = db.session.execute(text(f"SELECT * FROM datos.{table_name} LIMIT :limit;"), {"limit": limit}).mappings().all()
+    return [serializar_fila(fila) for fila in filas], None
+
+
+def stream_ndjson(table_name, after_id=None, filas_por_lote=1000):
+    """
+    Genera las filas de `datos.<table_name>` como NDJSON (un objeto JSON por línea)
+    usando un cursor del lado del servidor, sin cargar la tabla en memoria.
+
+    Parámetros:
+    - table_name (str): Tabla en el esquema `datos`.
+    - after_id (int): Empieza después de este `id`; None desde el inicio.
+    - filas_por_lote (int): Filas que se traen del servidor en cada lectura del cursor.
+
+    Retorna:
+    - Generador de líneas de texto.
+    """
+    condicion = "WHERE id > :after_id" if after_id is not None else ""
+    with db.engine.connect() as conexion:
+        resultado = conexion.execution_options(stream_results=True, max_row_buffer=filas_por_lote).execute(
+            text(f"SELECT * FROM datos.{table_name} {condicion} ORDER BY id;"),
+            {"after_id": after_id}
+        )
+        for fila in resultado.mappings():
+            yield json.dumps(serializar_fila(fila), ensure_ascii=False) + "\n"
@@ -0,0 +1,267 @@
+# backend/app/services/unicidad_service.py
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from app import db
+from app.services.ddl_service import tipo_base
+from app.services.load_service import cargar_dataframe
+from app.services.validation_service import mascara, valores_nativos
+
+# Nombres de regla con los que se informan los errores de unicidad
+REGLA_CLAVE_PRIMARIA = 'es_clave_primaria'
+REGLA_UNICO = 'es_unico'
+
+
+
+def normalizar_clave(serie, tipo):
+    """
+    Convierte una columna de clave a un tipo fijo según el tipo base de su campo, para que
+    el hash de un mismo valor no dependa del tipo con que se leyó cada bloque (`1` leído
+    como int64 en un bloque y como float64 en otro).
+
+    Los números pasan a `Int64` si son enteros (campos `integer` y `bigint`, sin perder
+    precisión) o a `Float64`, las fechas a `datetime64[ns]`, los booleanos a `boolean` y
+    el texto a `string`. Si algún valor no se puede convertir, la columna se compara como
+    texto.
+    """
+    try:
+        if tipo in ('integer', 'bigint', 'numeric'):
+            numeros = pd.to_numeric(serie, errors='coerce')
+            if (numeros.isna() == serie.isna()).all():
+                no_nulos = numeros.dropna()
+                if tipo != 'numeric' and (no_nulos == no_nulos.round()).all():
+                    return numeros.astype('Int64')
+                return numeros.astype('Float64')
+        elif tipo in ('date', 'timestamp'):
+            fechas = pd.to_datetime(serie, errors='coerce')
+            if (fechas.isna() == serie.isna()).all():
+                if getattr(fechas.dt, 'tz', None) is not None:
+                    fechas = fechas.dt.tz_convert(None)
+                return fechas.astype('datetime64[ns]')
+        elif tipo == 'boolean':
+            return serie.astype('boolean')
+    except (TypeError, ValueError):
+        pass
+    return serie.astype('string')
+
+
+class ClavesVistas:
+    """
+    Claves ya vistas de un grupo de campos en los bloques anteriores, para buscar en ellas
+    las de un bloque nuevo.
+
+    Se guardan en niveles ordenados por hash, cada uno con sus claves normalizadas en el
+    mismo orden. Un nivel se fusiona con el anterior cuando lo alcanza en tamaño, por lo
+    que cada clave se reordena O(log n) veces en toda la carga y no en cada bloque. Un hash
+    coincidente solo cuenta si también coinciden los valores: una colisión de hash no
+    produce un falso duplicado.
+    """
+    def __init__(self):
+        self._niveles = []
+
+    def contiene(self, hashes, claves):
+        """
+        Devuelve la máscara de las filas de `claves` (con sus `hashes`) ya vistas.
+        """
+        encontradas = np.zeros(len(hashes), dtype=bool)
+        # Buscar los hashes ordenados recorre cada nivel en orden, mucho más rápido que al azar
+        orden = np.argsort(hashes)
+        hashes_ordenados = hashes[orden]
+        for hashes_nivel, claves_nivel in self._niveles:
+            inicio = np.empty(len(hashes), dtype=np.int64)
+            fin = np.empty(len(hashes), dtype=np.int64)
+            inicio[orden] = np.searchsorted(hashes_nivel, hashes_ordenados, side='left')
+            fin[orden] = np.searchsorted(hashes_nivel, hashes_ordenados, side='right')
+            # Casi siempre hay a lo sumo una clave por hash; con colisiones se prueban todas
+            desplazamiento = 0
+            while True:
+                probar = np.flatnonzero(~encontradas & (inicio + desplazamiento < fin))
+                if not len(probar):
+                    break
+                vistas = claves_nivel.iloc[inicio[probar] + desplazamiento]
+                iguales = np.ones(len(probar), dtype=bool)
+                for campo in claves.columns:
+                    iguales &= mascara(vistas[campo].to_numpy() == claves[campo].iloc[probar].to_numpy())
+                encontradas[probar[iguales]] = True
+                desplazamiento += 1
+        return encontradas
+
+    def agregar(self, hashes, claves):
+        """
+        Agrega claves no vistas (sin repetir entre sí) con sus hashes.
+        """
+        if not len(hashes):
+            return
+        nivel = (hashes, claves.reset_index(drop=True))
+        while self._niveles and len(self._niveles[-1][0]) <= len(nivel[0]):
+            hashes_anterior, claves_anterior = self._niveles.pop()
+            nivel = (
+                np.concatenate([hashes_anterior, nivel[0]]),
+                pd.concat([claves_anterior, nivel[1]], ignore_index=True)
+            )
+        orden = np.argsort(nivel[0], kind='stable')
+        self._niveles.append((nivel[0][orden], nivel[1].iloc[orden].reset_index(drop=True)))
+
+
+class VerificadorUnicidad:
+    """
+    Verifica los campos `es_clave_primaria` (en conjunto) y `es_unico` (cada uno por
+    separado) de un archivo, bloque a bloque.
+
+    Las repeticiones dentro del archivo se detectan sobre los campos involucrados,
+    normalizados con `normalizar_clave`: en cada bloque se marcan con `duplicated` y se
+    buscan, por hash y luego por valor, entre las claves de los bloques anteriores
+    (`ClavesVistas`). Si se indica una tabla existente, las filas restantes se
+    buscan en ella a través de una tabla temporal con sus claves.
+
+    Parámetros:
+    - esquemas (list): Esquemas del proyecto (`CampoEsquema`).
+    - tabla_existente (str): Tabla del esquema `datos` con la que no deben chocar las
+      filas nuevas; None para verificar solo el archivo.
+    - actualiza_existentes (bool): Si es True (modo upsert) una clave primaria existente
+      no es un error, y un valor único solo choca con filas de otra clave.
+    """
+    def __init__(self, esquemas, tabla_existente=None, actualiza_existentes=False):
+        self.claves = [esquema.campo_nombre for esquema in esquemas if esquema.es_clave_primaria]
+        self.unicos = [
+            esquema.campo_nombre for esquema in esquemas
+            if esquema.es_unico and [esquema.campo_nombre] != self.claves
+        ]
+        self.tabla_existente = tabla_existente
+        self.actualiza_existentes = actualiza_existentes
+        self._buscados = list(dict.fromkeys(self.claves + self.unicos))
+        self._esquemas = esquemas
+        self._tipos = {esquema.campo_nombre: tipo_base(esquema.tipo_dato) for esquema in esquemas}
+        self._vistos = {}
+        self._tabla_claves = None
+
+    @property
+    def activo(self):
+        return bool(self.claves or self.unicos)
+
+    def validar(self, df):
+        """
+        Verifica un bloque y devuelve sus errores en el formato de `validar_dataframe`,
+        ordenados por fila.
+        """
+        if not self.activo or df.empty:
+            return []
+
+        errores = []
+        marcadas = np.zeros(len(df), dtype=bool)
+        if self.claves:
+            errores_grupo, marcadas_grupo = self._validar_grupo(df, self.claves, REGLA_CLAVE_PRIMARIA)
+            errores.extend(errores_grupo)
+            marcadas |= marcadas_grupo
+        for campo in self.unicos:
+            errores_grupo, marcadas_grupo = self._validar_grupo(df, [campo], REGLA_UNICO)
+            errores.extend(errores_grupo)
+            marcadas |= marcadas_grupo
+
+        if self.tabla_existente and not marcadas.all():
+            errores.extend(self._validar_existentes(df[~marcadas]))
+
+        errores.sort(key=lambda error: error["fila"])
+        return errores
+
+    def _validar_grupo(self, df, campos, regla):
+        valores = df[campos]
+        nulos = valores.isna().any(axis=1).to_numpy()
+        normalizados = pd.DataFrame({campo: normalizar_clave(valores[campo], self._tipos.get(campo)) for campo in campos})
+        hashes = pd.util.hash_pandas_object(normalizados, index=False).to_numpy()
+
+        candidatas = np.flatnonzero(~nulos)
+        claves = normalizados.iloc[candidatas].reset_index(drop=True)
+        hashes_candidatas = hashes[candidatas]
+        vistas = self._vistos.setdefault(tuple(campos), ClavesVistas())
+        # `duplicated` compara los valores: el hash solo acelera la búsqueda en bloques anteriores
+        repetidas_candidatas = claves.duplicated().to_numpy() | vistas.contiene(hashes_candidatas, claves)
+        vistas.agregar(hashes_candidatas[~repetidas_candidatas], claves[~repetidas_candidatas])
+        repetidas = np.zeros(len(df), dtype=bool)
+        repetidas[candidatas] = repetidas_candidatas
+
+        if regla == REGLA_CLAVE_PRIMARIA:
+            condiciones = [
+                (nulos, "La clave primaria no puede estar vacía"),
+                (repetidas, "La clave primaria está repetida en el archivo")
+            ]
+            marcadas = nulos | repetidas
+        else:
+            condiciones = [(repetidas, "El valor está repetido en el archivo")]
+            marcadas = repetidas
+
+        errores = []
+        for filas, mensaje in condiciones:
+            if filas.any():
+                errores.extend(self._errores(df, filas, campos, regla, mensaje))
+        return errores, marcadas
+
+    def _errores(self, df, filas, campos, regla, mensaje):
+        """
+        Construye los errores de las filas indicadas (máscara booleana o lista de etiquetas).
+        """
+        seleccion = df.loc[filas, campos]
+        if len(campos) == 1:
+            valores = valores_nativos(seleccion[campos[0]])
+        else:
+            valores = [list(fila) for fila in zip(*(valores_nativos(seleccion[campo]) for campo in campos))]
+        return [
+            {
+                "fila": etiqueta + 1,
+                "campo": ", ".join(campos),
+                "regla": regla,
+                "valor_incorrecto": valor,
+                "mensaje_error": mensaje
+            }
+            for etiqueta, valor in zip(seleccion.index.tolist(), valores)
+        ]
+
+    def _preparar_tabla_claves(self):
+        """
+        Crea (una vez por carga) la tabla temporal con la fila y los campos a buscar en la
+        tabla existente, con sus mismos tipos.
+        """
+        if self._tabla_claves is None:
+            nombre = f"claves_{self.tabla_existente}"
+            columnas = ", ".join(self._buscados)
+            db.session.execute(text(f"""
+                CREATE TEMP TABLE {nombre} ON COMMIT DROP AS
+                SELECT {columnas} FROM datos.{self.tabla_existente} WITH NO DATA;
+            """))
+            db.session.execute(text(f"ALTER TABLE {nombre} ADD COLUMN fila BIGINT;"))
+            self._tabla_claves = f"pg_temp.{nombre}"
+        else:
+            db.session.execute(text(f"TRUNCATE {self._tabla_claves};"))
+        return self._tabla_claves
+
+    def _validar_existentes(self, df):
+        tabla_claves = self._preparar_tabla_claves()
+        claves_df = df[self._buscados].assign(fila=df.index + 1)
+        cargar_dataframe(claves_df, tabla_claves, self._esquemas)
+
+        consultas = []
+        if self.claves and not self.actualiza_existentes:
+            consultas.append((self.claves, REGLA_CLAVE_PRIMARIA, "La clave primaria ya existe en la tabla", ""))
+        for campo in self.unicos:
+            otra_clave = ""
+            if self.claves and self.actualiza_existentes:
+                otra_clave = (
+                    f" AND ({', '.join(f'existente.{clave}' for clave in self.claves)})"
+                    f" IS DISTINCT FROM ({', '.join(f'archivo.{clave}' for clave in self.claves)})"
+                )
+            consultas.append(([campo], REGLA_UNICO, "El valor ya existe en la tabla", otra_clave))
+
+        errores = []
+        for campos, regla, mensaje, condicion_extra in consultas:
+            filas = db.session.execute(text(f"""
+                SELECT archivo.fila FROM {tabla_claves} AS archivo
+                WHERE EXISTS (
+                    SELECT 1 FROM datos.{self.tabla_existente} AS existente
+                    WHERE {" AND ".join(f"existente.{campo} = archivo.{campo}" for campo in campos)}{condicion_extra}
+                )
+                ORDER BY archivo.fila;
+            """)).scalars().all()
+            if filas:
+                errores.extend(self._errores(df, [fila - 1 for fila in filas], campos, regla, mensaje))
+        return errores
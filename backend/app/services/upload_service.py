@@ -0,0 +1,614 @@
+# backend/app/services/upload_service.py
+import csv
+import logging
+import time
+from collections import Counter
+
+import pandas as pd
+from flask import current_app, request, has_request_context
+from sqlalchemy import text
+
+from app import db
+from app.services.arrow_service import LectorArrow, FORMATO_CSV, PYARROW_DISPONIBLE, leer_csv
+from app.services.cache_service import invalidar_proyecto
+from app.services.compresion_service import resumen_compresion
+from app.services.ddl_service import sentencia_crear_tabla, sentencias_indices, tipo_base
+from app.services.error_report_service import crear_reporte, ReporteErrores
+from app.services.load_service import cargar_dataframe, preparar_tipos
+from app.services.metrics_service import Cronometro, registrar_bloque, registrar_carga, bytes_leidos
+from app.services.staging_service import TablaStaging
+from app.services.unicidad_service import VerificadorUnicidad
+from app.services.validation_service import obtener_plan, crear_validador, ErrorConfiguracionValidacion
+
+logger = logging.getLogger(__name__)
+
+# Modos de carga: crear la tabla del proyecto o reemplazar su contenido
+MODO_CREAR = 'crear'
+MODO_REEMPLAZAR = 'reemplazar'
+# Inserta o actualiza filas según los campos `es_clave_primaria`, sin vaciar la tabla
+MODO_UPSERT = 'upsert'
+# Agrega las filas a la tabla existente
+MODO_AGREGAR = 'agregar'
+
+
+class ErrorCarga(Exception):
+    """
+    Error que invalida la carga de un archivo (esquema incorrecto, errores de validación,
+    tabla destino inválida).
+
+    Atributos:
+    - respuesta (dict): Cuerpo de la respuesta 400 que debe devolver el endpoint.
+    """
+    def __init__(self, respuesta):
+        super().__init__(respuesta.get("error"))
+        self.respuesta = respuesta
+
+
+def leer_encabezado(stream):
+    """
+    Lee solo la línea de encabezado de un CSV, dejando el flujo posicionado en la primera
+    fila de datos.
+
+    Parámetros:
+    - stream: Flujo binario del archivo subido.
+
+    Retorna:
+    - Lista con los nombres de las columnas, o una lista vacía si el archivo está vacío.
+    """
+    linea = stream.readline()
+    if not linea.strip():
+        return []
+    return next(csv.reader([linea.decode('utf-8-sig')]))
+
+
+def tipos_lectura(esquemas):
+    """
+    Deriva del esquema del proyecto los tipos con los que se leen las columnas de texto.
+
+    Las columnas de texto con `valores_permitidos` se leen como `category` (cada valor
+    distinto se guarda una sola vez) y el resto como `string` (respaldado por Arrow si
+    está disponible). Los demás tipos se infieren al leer y los enteros y las fechas se
+    ajustan después con `preparar_tipos`, para que un valor incorrecto no interrumpa la
+    lectura y lo informen las validaciones.
+    """
+    tipo_texto = pd.StringDtype('pyarrow' if PYARROW_DISPONIBLE else 'python')
+    tipos = {}
+    for esquema in esquemas:
+        if tipo_base(esquema.tipo_dato) != 'texto':
+            continue
+        tipos[esquema.campo_nombre] = 'category' if esquema.valores_permitidos else tipo_texto
+    return tipos
+
+
+def motor_lectura(chunksize):
+    """
+    Elige el motor de `pd.read_csv` según `CSV_PARSER_ENGINE`: con `auto` se usa pyarrow
+    si está instalado y el archivo se lee en un único bloque. pyarrow no lee por bloques,
+    por lo que con `chunksize` se usa siempre el motor `c`, aunque se haya pedido pyarrow,
+    para no cargar el archivo completo en memoria.
+    """
+    motor = current_app.config['CSV_PARSER_ENGINE']
+    if motor == 'auto':
+        return 'pyarrow' if PYARROW_DISPONIBLE and not chunksize else 'c'
+    if motor == 'pyarrow' and chunksize:
+        logger.warning(
+            f"CSV_PARSER_ENGINE=pyarrow no lee por bloques: se usa el motor 'c' con bloques de {chunksize} filas"
+        )
+        return 'c'
+    return motor
+
+
+def leer_bloques(stream, columnas, esquemas, chunksize=None):
+    """
+    Lee las filas de datos de un CSV cuyo encabezado ya se consumió con `leer_encabezado`,
+    con los tipos derivados del esquema del proyecto.
+
+    Parámetros:
+    - stream: Flujo binario del archivo subido (por ejemplo `FileStorage.stream`).
+    - columnas (list): Nombres de las columnas del encabezado.
+    - esquemas (list): Esquemas del proyecto (`CampoEsquema`).
+    - chunksize (int): Filas por bloque. Si es `None` o 0, el archivo se lee completo
+      en un único bloque.
+
+    Retorna:
+    - Iterador de DataFrames. El índice de cada bloque continúa el del anterior, por lo
+      que `índice + 1` es siempre el número de fila en el archivo.
+    """
+    tipos = tipos_lectura(esquemas)
+    opciones = {"encoding": 'utf-8', "header": None, "names": columnas}
+    motor = motor_lectura(chunksize)
+    if motor == 'pyarrow':
+        # `pd.read_csv(engine='pyarrow')` infiere los tipos antes de aplicar `dtype` y pierde
+        # los ceros a la izquierda del texto: los tipos se pasan al lector de pyarrow
+        return iter([preparar_tipos(leer_csv(stream, columnas, tipos), esquemas)])
+
+    if not chunksize:
+        return iter([preparar_tipos(pd.read_csv(stream, engine=motor, dtype=tipos, **opciones), esquemas)])
+    lector = pd.read_csv(stream, engine=motor, dtype=tipos, chunksize=chunksize, **opciones)
+    return (preparar_tipos(df, esquemas) for df in lector)
+
+
+def verificar_esquema(columnas, plan, project):
+    """
+    Compara las columnas del encabezado del archivo con los campos del esquema del proyecto.
+
+    El orden de las columnas no impide la carga, pero se informa junto con las demás
+    diferencias para que el archivo pueda corregirse de una sola vez.
+
+    Lanza:
+    - ErrorCarga: Si faltan columnas, sobran, están duplicadas o el archivo está vacío.
+      La respuesta incluye `campos_esperados` (en el orden del esquema), las columnas
+      faltantes y sobrantes, las que solo difieren en mayúsculas y si el orden coincide.
+    """
+    campos_esperados = [esquema.campo_nombre for esquema in plan.esquemas]
+    duplicados = [columna for columna, cantidad in Counter(columnas).items() if cantidad > 1]
+    if set(columnas) == plan.campos and not duplicados:
+        return
+
+    faltantes = [campo for campo in campos_esperados if campo not in columnas]
+    sobrantes = [columna for columna in columnas if columna not in plan.campos]
+    por_minusculas = {campo.lower(): campo for campo in faltantes}
+    diferencias_mayusculas = [
+        {"campo_archivo": columna, "campo_esperado": por_minusculas[columna.lower()]}
+        for columna in sobrantes
+        if columna.lower() in por_minusculas
+    ]
+    columnas_del_esquema = [columna for columna in columnas if columna in plan.campos]
+
+    raise ErrorCarga({
+        "error": "El esquema del archivo no es correcto." if columnas else "El archivo está vacío.",
+        "campos_esperados": campos_esperados,
+        "nombre_proyecto": project.nombre_proyecto,
+        "campos_archivo": columnas,
+        "campos_faltantes": faltantes,
+        "campos_sobrantes": sobrantes,
+        "campos_duplicados": duplicados,
+        "diferencias_mayusculas": diferencias_mayusculas,
+        "orden_coincide": columnas_del_esquema == [campo for campo in campos_esperados if campo in columnas]
+    })
+
+
+def verificar_tipos_arrow(lector, plan, project):
+    """
+    Compara los tipos del esquema incluido en un archivo Parquet o Arrow con los tipos de
+    dato del proyecto, sin leer datos.
+
+    Lanza:
+    - ErrorCarga: Si alguna columna tiene un tipo que no puede cargarse en su campo.
+    """
+    incompatibles = lector.tipos_incompatibles(plan.esquemas)
+    if incompatibles:
+        raise ErrorCarga({
+            "error": "Los tipos de algunas columnas del archivo no corresponden al esquema del proyecto.",
+            "nombre_proyecto": project.nombre_proyecto,
+            "tipos_incompatibles": incompatibles
+        })
+
+
+def verificar_archivo(stream, plan, project, formato=FORMATO_CSV):
+    """
+    Verifica el esquema de un archivo con su encabezado (CSV) o sus metadatos (Parquet y
+    Arrow), antes de leer los datos.
+
+    Retorna:
+    - El origen de los datos para `leer_datos`: las columnas del encabezado en CSV o un
+      `LectorArrow`.
+
+    Lanza:
+    - ErrorCarga: Si el esquema o los tipos no coinciden o el archivo no es válido.
+    """
+    if formato == FORMATO_CSV:
+        columnas = leer_encabezado(stream)
+        verificar_esquema(columnas, plan, project)
+        return columnas
+
+    try:
+        lector = LectorArrow(stream, formato)
+    except (ValueError, OSError) as e:
+        raise ErrorCarga({"error": f"El archivo no es un archivo {formato} válido: {str(e)}"})
+    verificar_esquema(lector.columnas, plan, project)
+    verificar_tipos_arrow(lector, plan, project)
+    return lector
+
+
+def leer_datos(stream, origen, plan, chunksize=None):
+    """
+    Lee por bloques los datos de un archivo verificado con `verificar_archivo`, con los
+    tipos derivados del esquema del proyecto (ver `leer_bloques` y `LectorArrow.bloques`).
+    """
+    if isinstance(origen, LectorArrow):
+        return origen.bloques(plan.esquemas, tipos_lectura(plan.esquemas), chunksize)
+    return leer_bloques(stream, origen, plan.esquemas, chunksize)
+
+
+def procesar_archivo(stream, plan, project, preparar_tabla, chunksize=None, reporte=None, finalizar=None, unicidad=None,
+                     cronometro=None, formato=FORMATO_CSV):
+    """
+    Valida y carga un archivo CSV, Parquet o Arrow IPC en la tabla del proyecto, bloque
+    a bloque.
+
+    Cada bloque se valida y, mientras no haya errores, se carga en la transacción de la
+    sesión actual. Si aparece un error se deja de cargar, pero se siguen validando los
+    bloques restantes para informar los errores hasta el máximo del reporte; quien llama
+    debe hacer rollback.
+
+    Parámetros:
+    - stream: Flujo binario del archivo.
+    - plan (PlanValidacion): Plan de validación del proyecto.
+    - project (ProyectoValidaciones): Proyecto destino.
+    - preparar_tabla: Función sin argumentos que deja lista la tabla donde se cargan los
+      bloques (crearla, vaciarla o crear una tabla temporal) y devuelve su nombre
+      calificado. Se llama una sola vez, antes de cargar el primer bloque.
+    - chunksize (int): Filas por bloque; `None` o 0 lee un CSV completo (Parquet y Arrow
+      IPC se leen siempre por lotes, ver `LectorArrow.bloques`).
+    - reporte (ReporteErrores): Acumulador de errores; por defecto uno sin límite.
+    - finalizar: Función opcional sin argumentos que se llama después de cargar todos los
+      bloques sin errores; el dict que devuelve se agrega al resumen.
+    - unicidad (VerificadorUnicidad): Verificación de claves primarias y campos únicos;
+      por defecto solo dentro del archivo.
+    - cronometro (Cronometro): Acumula la duración de las etapas (`esquema`, `lectura`,
+      `validacion`, `unicidad`, `ddl`, `carga`) y de cada regla; por defecto uno propio
+      que se registra al terminar. Si se indica, quien llama debe registrarlo.
+    - formato (str): `FORMATO_CSV`, `FORMATO_PARQUET` o `FORMATO_ARROW`. En los formatos
+      columnares el esquema (nombres y tipos) se verifica con los metadatos del archivo y
+      los datos se leen por record batches.
+
+    Retorna:
+    - dict con el resumen de la carga (método, filas, segundos, filas por segundo).
+
+    Lanza:
+    - ErrorCarga: Si el esquema no coincide, hay errores de validación o
+      `preparar_tabla` rechaza la tabla destino.
+    """
+    if cronometro is None:
+        cronometro = Cronometro(project.nombre_tabla)
+        try:
+            return procesar_archivo(
+                stream, plan, project, preparar_tabla, chunksize, reporte, finalizar, unicidad, cronometro, formato
+            )
+        finally:
+            cronometro.registrar()
+
+    with cronometro.etapa('esquema'):
+        origen = verificar_archivo(stream, plan, project, formato)
+
+    if reporte is None:
+        reporte = ReporteErrores()
+    if unicidad is None:
+        unicidad = VerificadorUnicidad(plan.esquemas)
+    tabla_carga = None
+    metodo = None
+    filas = 0
+    segundos = 0.0
+
+    with crear_validador(plan.reglas) as validador:
+        bloques = leer_datos(stream, origen, plan, chunksize)
+        for df in cronometro.iterar(bloques, 'lectura'):
+            restantes = reporte.max_errores - reporte.total if reporte.max_errores else 0
+            with cronometro.etapa('validacion'):
+                errores = validador.validar(df, restantes)
+            with cronometro.etapa('unicidad'):
+                errores += unicidad.validar(df)
+            # Orden estable: en cada fila, los errores de las reglas antes que los de unicidad
+            errores.sort(key=lambda error: error["fila"])
+            registrar_bloque(project.nombre_tabla, len(df), errores)
+            if reporte.agregar(errores):
+                break
+            if reporte.total:
+                continue
+
+            if tabla_carga is None:
+                with cronometro.etapa('ddl'):
+                    tabla_carga = preparar_tabla()
+
+            with cronometro.etapa('carga'):
+                resultado = cargar_dataframe(df, tabla_carga, plan.esquemas)
+            metodo = resultado["metodo"]
+            filas += resultado["filas"]
+            segundos += resultado["segundos"]
+        cronometro.agregar_reglas(validador.tiempos)
+
+    if reporte.total:
+        raise ErrorCarga(reporte.respuesta())
+
+    if tabla_carga is None:
+        with cronometro.etapa('ddl'):
+            preparar_tabla()
+
+    resumen = {
+        "metodo": metodo,
+        "filas": filas,
+        "segundos": round(segundos, 3),
+        "filas_por_segundo": round(filas / segundos) if segundos > 0 else None
+    }
+    if finalizar is not None:
+        resumen.update(finalizar())
+    return resumen
+
+
+def crear_tabla(table_name, esquemas):
+    """
+    Crea la tabla `datos.<table_name>` a partir del esquema del proyecto, sin índices
+    (ver `crear_indices`).
+
+    Lanza:
+    - ErrorCarga: Si la tabla ya existe.
+    """
+    # Validar si la tabla ya existe
+    table_exists_query = text("""
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = 'datos'
+            AND table_name = :table_name
+        );
+    """)
+    table_exists = db.session.execute(table_exists_query, {"table_name": table_name}).scalar()
+
+    if table_exists:
+        raise ErrorCarga({"error": f"La tabla '{table_name}' ya existe en el esquema 'datos'."})
+
+    # Crear la tabla si no existe
+    db.session.execute(text(sentencia_crear_tabla(table_name, esquemas)))
+    return f"datos.{table_name}"
+
+
+def crear_indices(table_name, esquemas):
+    """
+    Construye la clave primaria y los índices únicos de `datos.<table_name>` una vez
+    cargados los datos, en lugar de mantenerlos fila a fila durante la carga.
+    """
+    for sentencia in sentencias_indices(table_name, esquemas):
+        db.session.execute(text(sentencia))
+
+
+def campos_clave(esquemas):
+    """
+    Devuelve los nombres de los campos marcados como `es_clave_primaria`, en el orden
+    del esquema.
+    """
+    return [esquema.campo_nombre for esquema in esquemas if esquema.es_clave_primaria]
+
+
+def crear_tabla_temporal(table_name, esquemas):
+    """
+    Prepara una carga incremental: crea una tabla temporal con las columnas del esquema
+    (mismos tipos que `datos.<table_name>`, sin `id`) que se elimina al terminar la
+    transacción.
+
+    El índice único sobre los campos clave que necesita `ON CONFLICT` se construye al
+    crear la tabla (`crear_indices`); no se crea aquí porque bloquearía las escrituras
+    sobre la tabla mientras dura la carga.
+
+    Retorna:
+    - Nombre calificado de la tabla temporal.
+
+    Lanza:
+    - ErrorCarga: Si la tabla no tiene un índice único sobre los campos clave.
+    """
+    claves = campos_clave(esquemas)
+    if not tiene_indice_clave(table_name, claves):
+        raise ErrorCarga({
+            "error": f"La tabla '{table_name}' no tiene un índice único sobre los campos clave "
+                     f"({', '.join(claves)}); reemplace la tabla o cree el índice antes de usar el modo 'upsert'."
+        })
+
+    columnas = ", ".join(esquema.campo_nombre for esquema in esquemas)
+    temporal = f"carga_{table_name}"
+    db.session.execute(text(f"""
+        CREATE TEMP TABLE {temporal} ON COMMIT DROP AS
+        SELECT {columnas} FROM datos.{table_name} WITH NO DATA;
+    """))
+    return f"pg_temp.{temporal}"
+
+
+def tiene_indice_clave(table_name, claves):
+    """
+    Indica si `datos.<table_name>` tiene un índice único, válido y sin predicado cuyas
+    columnas son exactamente `claves` (en cualquier orden), que `ON CONFLICT` pueda usar.
+    """
+    return db.session.execute(text("""
+        SELECT EXISTS (
+            SELECT 1
+            FROM pg_index x
+            WHERE x.indrelid = CAST(:tabla AS regclass)
+              AND x.indisunique AND x.indisvalid
+              AND x.indpred IS NULL AND x.indexprs IS NULL
+              AND (
+                  SELECT array_agg(a.attname::text ORDER BY a.attname::text COLLATE "C")
+                  FROM pg_attribute a
+                  WHERE a.attrelid = x.indrelid AND a.attnum = ANY(x.indkey)
+              ) = CAST(:claves AS text[])
+        );
+    """), {"tabla": f"datos.{table_name}", "claves": sorted(claves)}).scalar()
+
+
+def fusionar_tabla(table_name, temporal, esquemas, eliminar_faltantes=False):
+    """
+    Aplica a `datos.<table_name>` las filas cargadas en la tabla temporal con
+    `INSERT ... ON CONFLICT DO UPDATE` sobre los campos clave. Las filas cuyo contenido
+    no cambia no se reescriben.
+
+    Parámetros:
+    - table_name (str): Tabla del proyecto en el esquema `datos`.
+    - temporal (str): Nombre calificado de la tabla temporal (`crear_tabla_temporal`).
+    - esquemas (list): Esquemas del proyecto.
+    - eliminar_faltantes (bool): Si es True, elimina las filas cuya clave no está en el archivo.
+
+    Las claves nulas o repetidas del archivo ya fueron rechazadas por
+    `VerificadorUnicidad` al validar.
+
+    Retorna:
+    - dict con las filas insertadas, actualizadas, sin cambios y eliminadas.
+
+    Lanza:
+    - ErrorCarga: Si `eliminar_faltantes` es True y el archivo no tiene filas de datos,
+      lo que vaciaría la tabla (por ejemplo un archivo con solo el encabezado).
+    """
+    total = db.session.execute(text(f"SELECT count(*) FROM {temporal}")).scalar()
+    if eliminar_faltantes and total == 0:
+        raise ErrorCarga({
+            "error": "El archivo no tiene filas de datos; con 'eliminar_faltantes' se eliminarían todas las filas de la tabla."
+        })
+
+    claves = campos_clave(esquemas)
+    columnas = [esquema.campo_nombre for esquema in esquemas]
+    no_claves = [columna for columna in columnas if columna not in claves]
+    lista_claves = ", ".join(claves)
+
+    if no_claves:
+        accion = "DO UPDATE SET " + ", ".join(f"{columna} = EXCLUDED.{columna}" for columna in no_claves) + (
+            f" WHERE ({', '.join(f'destino.{columna}' for columna in no_claves)})"
+            f" IS DISTINCT FROM ({', '.join(f'EXCLUDED.{columna}' for columna in no_claves)})"
+        )
+    else:
+        accion = "DO NOTHING"
+
+    # xmax = 0 identifica las filas insertadas; las omitidas por el WHERE no se devuelven
+    insertadas, actualizadas = db.session.execute(text(f"""
+        WITH cambios AS (
+            INSERT INTO datos.{table_name} AS destino ({", ".join(columnas)})
+            SELECT {", ".join(columnas)} FROM {temporal}
+            ON CONFLICT ({lista_claves}) {accion}
+            RETURNING (xmax = 0) AS insertada
+        )
+        SELECT count(*) FILTER (WHERE insertada), count(*) FILTER (WHERE NOT insertada) FROM cambios;
+    """)).one()
+
+    eliminadas = 0
+    if eliminar_faltantes:
+        eliminadas = db.session.execute(text(f"""
+            DELETE FROM datos.{table_name} AS destino
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {temporal} AS archivo
+                WHERE {" AND ".join(f"archivo.{clave} = destino.{clave}" for clave in claves)}
+            );
+        """)).rowcount
+
+    return {
+        "insertadas": insertadas,
+        "actualizadas": actualizadas,
+        "sin_cambios": total - insertadas - actualizadas,
+        "eliminadas": eliminadas
+    }
+
+
+def ejecutar_carga(project, stream, modo, opciones=None, formato=FORMATO_CSV, chunksize=None):
+    """
+    Ejecuta la carga completa de un archivo en la tabla del proyecto y confirma la
+    transacción.
+
+    Si el archivo es rechazado (esquema, validaciones, tabla existente) el proyecto se
+    elimina, igual que si ocurre cualquier otro error en el modo `crear`. En los modos
+    `upsert` y `agregar` el proyecto y su tabla se conservan siempre.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto destino.
+    - stream: Flujo binario del archivo.
+    - modo (str): `MODO_CREAR` crea la tabla; `MODO_REEMPLAZAR` carga una tabla staging
+      y la intercambia con la existente, que se elimina en la misma transacción; `MODO_UPSERT`
+      inserta o actualiza por los campos clave; `MODO_AGREGAR` inserta las filas en la
+      tabla existente.
+    - opciones (dict): Opciones del reporte de errores (ver `opciones_reporte`) y, para
+      `MODO_UPSERT`, `eliminar_faltantes`.
+    - formato (str): Formato del archivo (`FORMATO_CSV`, `FORMATO_PARQUET` o `FORMATO_ARROW`).
+    - chunksize (int): Filas por bloque; `None` usa `UPLOAD_CHUNK_SIZE`.
+
+    La duración de cada etapa, el resultado y los bytes leídos se registran en las
+    métricas (ver `metrics_service`). Si el archivo o el cuerpo de la solicitud venían
+    comprimidos, el resumen de la carga incluye `compresion` (ver `resumen_compresion`).
+
+    Retorna:
+    - Tupla (respuesta, código HTTP), con el mismo formato que los endpoints de carga.
+    """
+    # El nombre se toma antes de la carga: si el archivo es rechazado el proyecto se elimina
+    proyecto = project.nombre_tabla
+    inicio = time.perf_counter()
+    cronometro = Cronometro(proyecto)
+    if chunksize is None:
+        chunksize = current_app.config['UPLOAD_CHUNK_SIZE']
+    respuesta, codigo = _ejecutar_carga(project, stream, modo, opciones or {}, cronometro, formato, chunksize)
+    cronometro.registrar()
+    if codigo == 200:
+        compresion = resumen_compresion(stream, request.environ if has_request_context() else None)
+        if compresion is not None:
+            respuesta["carga"]["compresion"] = compresion
+    registrar_carga(proyecto, modo, codigo, time.perf_counter() - inicio, bytes_leidos(stream))
+    return respuesta, codigo
+
+
+def _ejecutar_carga(project, stream, modo, opciones, cronometro, formato, chunksize):
+    table_name = project.nombre_tabla
+    project_id = project.id
+    plan = None
+    tabla_carga = None
+    staging = TablaStaging(table_name) if modo == MODO_REEMPLAZAR else None
+
+    def preparar_tabla():
+        nonlocal tabla_carga
+        if modo == MODO_CREAR:
+            tabla_carga = crear_tabla(table_name, plan.esquemas)
+        elif modo == MODO_UPSERT:
+            tabla_carga = crear_tabla_temporal(table_name, plan.esquemas)
+        elif modo == MODO_AGREGAR:
+            tabla_carga = f"datos.{table_name}"
+        else:
+            tabla_carga = staging.crear()
+        return tabla_carga
+
+    def finalizar():
+        if modo == MODO_CREAR:
+            with cronometro.etapa('indices'):
+                crear_indices(table_name, plan.esquemas)
+            return {}
+        if modo == MODO_AGREGAR:
+            return {}
+        if modo == MODO_UPSERT:
+            with cronometro.etapa('fusion'):
+                return fusionar_tabla(table_name, tabla_carga, plan.esquemas, opciones.get("eliminar_faltantes", False))
+        with cronometro.etapa('indices'):
+            staging.construir_indices()
+        with cronometro.etapa('intercambio'):
+            staging.intercambiar()
+        return {}
+
+    try:
+        try:
+            with cronometro.etapa('plan'):
+                plan = obtener_plan(project)
+            incremental = modo in (MODO_UPSERT, MODO_AGREGAR)
+            unicidad = VerificadorUnicidad(
+                plan.esquemas,
+                tabla_existente=table_name if incremental else None,
+                actualiza_existentes=modo == MODO_UPSERT
+            )
+            with crear_reporte(opciones) as reporte:
+                resultado_carga = procesar_archivo(
+                    stream, plan, project, preparar_tabla, chunksize, reporte,
+                    finalizar=finalizar,
+                    unicidad=unicidad,
+                    cronometro=cronometro,
+                    formato=formato
+                )
+        except (ErrorConfiguracionValidacion, ErrorCarga) as e:
+            db.session.rollback()
+            if modo not in (MODO_UPSERT, MODO_AGREGAR):
+                db.session.delete(project)
+                db.session.commit()
+                invalidar_proyecto(project_id)
+            return e.respuesta, 400
+
+        with cronometro.etapa('commit'):
+            db.session.commit()
+        invalidar_proyecto(project_id)
+
+        return {"message": "Archivo procesado e insertado exitosamente", "carga": resultado_carga}, 200
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error al procesar el archivo: {str(e)}")
+        if modo == MODO_CREAR:
+            # Eliminar el proyecto en caso de cualquier error
+            db.session.delete(project)
+            db.session.commit()
+            invalidar_proyecto(project_id)
+        return {"error": f"Error al procesar el archivo y el proyecto fue eliminado: {str(e)}"}, 500
@@ -0,0 +1,577 @@
+# backend/app/services/validation_service.py
+import importlib
+import math
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from inspect import signature
+
+import numpy as np
+import pandas as pd
+
+from flask import current_app
+
+from app.models.project import ProyectoEsquemas, ValidacionesCampos, ValidacionesDefinidas
+from app.services.ddl_service import tipo_base
+
+
+class ErrorConfiguracionValidacion(Exception):
+    """
+    Error en la definición de las validaciones de un proyecto (regla inexistente,
+    módulo o función no encontrados, parámetros faltantes).
+
+    Atributos:
+    - respuesta (dict): Cuerpo de la respuesta 400 que debe devolver el endpoint.
+    """
+    def __init__(self, respuesta):
+        super().__init__(respuesta.get("error"))
+        self.respuesta = respuesta
+
+
+class ReglaValidacion:
+    """
+    Regla de validación resuelta para un campo: función escalar `validate`,
+    versión columnar `validate_series` (si el módulo la define) y parámetros.
+    """
+    def __init__(self, campo, nombre_regla, validate, validate_series, parametros):
+        self.campo = campo
+        self.nombre_regla = nombre_regla
+        self.validate = validate
+        self.validate_series = validate_series
+        self.parametros = parametros
+
+
+def get_required_params(func):
+    """
+    Extrae los nombres de los parámetros requeridos por la función de validación.
+
+    Parámetros:
+    - func: La función de validación de la que se extraerán los parámetros.
+
+    Retorna:
+    - Lista de nombres de parámetros requeridos.
+    """
+    sig = signature(func)
+    return [param.name for param in sig.parameters.values() if param.default == param.empty and param.name != "value"]
+
+
+def compilar_reglas(validaciones):
+    """
+    Resuelve las validaciones de un proyecto a funciones ejecutables.
+
+    Parámetros:
+    - validaciones (list): Registros `ValidacionesCampos` del proyecto.
+
+    Retorna:
+    - Lista de `ReglaValidacion`, en el mismo orden que `validaciones`.
+
+    Lanza:
+    - ErrorConfiguracionValidacion: Si alguna regla no existe, no tiene módulo o función
+      `validate`, o le faltan parámetros requeridos.
+    """
+    ids_reglas = {validacion.validacion_id for validacion in validaciones}
+    definidas = {v.id: v for v in ValidacionesDefinidas.query.filter(ValidacionesDefinidas.id.in_(ids_reglas)).all()} if ids_reglas else {}
+
+    reglas = []
+    for validacion in validaciones:
+        validacion_definida = definidas.get(validacion.validacion_id)
+        if not validacion_definida:
+            raise ErrorConfiguracionValidacion({
+                "error": f"No se encontró la validación para la regla con id {validacion.validacion_id}."
+            })
+
+        try:
+            validation_module = importlib.import_module(f'app.services.validations.{validacion_definida.nombre_regla}')
+            validate = validation_module.validate
+        except ModuleNotFoundError:
+            expected_modules = [f'app.services.validations.{v.nombre_regla}' for v in ValidacionesDefinidas.query.all()]
+            raise ErrorConfiguracionValidacion({
+                "error": f"Módulo de validación no encontrado para la regla '{validacion_definida.nombre_regla}'.",
+                "modulos_esperados": expected_modules
+            })
+        except AttributeError:
+            raise ErrorConfiguracionValidacion({
+                "error": f"La función de validación no se encontró para la regla '{validacion_definida.nombre_regla}'"
+            })
+
+        # Extraer los parámetros necesarios desde el valor JSON
+        parametros = validacion.valor if validacion.valor else {}
+
+        parametros_faltantes = [param for param in get_required_params(validate) if param not in parametros]
+        if parametros_faltantes:
+            raise ErrorConfiguracionValidacion({
+                "error": f"Faltan parámetros requeridos para la validación '{validacion_definida.nombre_regla}'. Parámetros faltantes: {parametros_faltantes}"
+            })
+
+        reglas.append(ReglaValidacion(
+            campo=validacion.campo_nombre,
+            nombre_regla=validacion_definida.nombre_regla,
+            validate=validate,
+            validate_series=getattr(validation_module, 'validate_series', None),
+            parametros=parametros
+        ))
+    return reglas
+
+
+# Reglas que se derivan del esquema de cada campo; su nombre es el del atributo del esquema
+REGLA_REQUERIDO = 'requerido'
+REGLA_LONGITUD_MAXIMA = 'longitud_maxima'
+
+
+def validar_requerido(value):
+    if pd.isna(value):
+        return False, "El campo es obligatorio"
+    return True, None
+
+
+def validar_requerido_series(values):
+    return mensajes_error(values, [(values.isna(), "El campo es obligatorio")])
+
+
+def validar_longitud_maxima(value, max):
+    if isinstance(value, str) and len(value) > max:
+        return False, f"El campo no debe exceder {max} caracteres"
+    return True, None
+
+
+def validar_longitud_maxima_series(values, max):
+    return mensajes_error(values, [(longitudes_texto(values) > max, f"El campo no debe exceder {max} caracteres")])
+
+
+def reglas_esquema(esquemas):
+    """
+    Deriva del esquema las reglas que corresponden a las restricciones de la tabla
+    (`NOT NULL` de los campos `requerido` y `VARCHAR(longitud_maxima)` del texto), para
+    que un valor que no las cumple se informe en los errores de validación y no como un
+    error de la base de datos al cargar.
+
+    Las claves primarias vacías las informa `VerificadorUnicidad`.
+
+    Parámetros:
+    - esquemas (list): Esquemas del proyecto (`CampoEsquema`).
+
+    Retorna:
+    - Lista de `ReglaValidacion`.
+    """
+    reglas = []
+    for esquema in esquemas:
+        if esquema.requerido and not esquema.es_clave_primaria:
+            reglas.append(ReglaValidacion(
+                esquema.campo_nombre, REGLA_REQUERIDO, validar_requerido, validar_requerido_series, {}
+            ))
+        if esquema.longitud_maxima and tipo_base(esquema.tipo_dato) == 'texto':
+            reglas.append(ReglaValidacion(
+                esquema.campo_nombre, REGLA_LONGITUD_MAXIMA, validar_longitud_maxima, validar_longitud_maxima_series,
+                {"max": esquema.longitud_maxima}
+            ))
+    return reglas
+
+
+class CampoEsquema:
+    """
+    Copia desacoplada de la sesión de un registro `ProyectoEsquemas`, apta para
+    guardarse en caché entre solicitudes.
+    """
+    def __init__(self, esquema):
+        self.campo_nombre = esquema.campo_nombre
+        self.tipo_dato = esquema.tipo_dato
+        self.requerido = esquema.requerido
+        self.longitud_maxima = esquema.longitud_maxima
+        self.valores_permitidos = esquema.valores_permitidos
+        self.es_clave_primaria = esquema.es_clave_primaria
+        self.es_unico = esquema.es_unico
+
+
+class PlanValidacion:
+    """
+    Plan de validación compilado de un proyecto: esquema de columnas esperado y
+    reglas resueltas con sus parámetros ya verificados.
+
+    Atributos:
+    - proyecto_id (int): ID del proyecto.
+    - version: `fecha_actualizacion` del proyecto cuando se compiló el plan.
+    - esquemas (list): Lista de `CampoEsquema`.
+    - campos (set): Nombres de las columnas esperadas en el archivo.
+    - reglas (list): Lista de `ReglaValidacion`.
+    """
+    def __init__(self, proyecto_id, version, esquemas, reglas):
+        self.proyecto_id = proyecto_id
+        self.version = version
+        self.esquemas = esquemas
+        self.campos = {esquema.campo_nombre for esquema in esquemas}
+        self.reglas = reglas
+
+
+_planes = OrderedDict()
+_planes_lock = threading.Lock()
+
+
+def compilar_plan(project):
+    """
+    Compila el plan de validación de un proyecto consultando sus esquemas y validaciones.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto a compilar.
+
+    Retorna:
+    - PlanValidacion.
+
+    Lanza:
+    - ErrorConfiguracionValidacion: Si alguna validación del proyecto es inválida.
+    """
+    esquemas = [
+        CampoEsquema(esquema)
+        for esquema in ProyectoEsquemas.query.filter_by(proyecto_id=project.id).order_by(ProyectoEsquemas.id).all()
+    ]
+    validaciones = ValidacionesCampos.query.filter_by(proyecto_id=project.id).all()
+    return PlanValidacion(
+        proyecto_id=project.id,
+        version=project.fecha_actualizacion,
+        esquemas=esquemas,
+        # Las restricciones del esquema se validan antes que las reglas del proyecto
+        reglas=reglas_esquema(esquemas) + compilar_reglas(validaciones)
+    )
+
+
+def obtener_plan(project):
+    """
+    Devuelve el plan de validación del proyecto desde la caché del proceso, compilándolo
+    si no existe o si el proyecto se modificó después de compilarlo.
+
+    La caché tiene un tamaño máximo (`VALIDATION_PLAN_CACHE_SIZE`) y descarta el plan
+    usado menos recientemente.
+
+    Parámetros:
+    - project (ProyectoValidaciones): Proyecto cuyo plan se necesita.
+
+    Retorna:
+    - PlanValidacion.
+
+    Lanza:
+    - ErrorConfiguracionValidacion: Si alguna validación del proyecto es inválida.
+    """
+    with _planes_lock:
+        plan = _planes.get(project.id)
+        if plan is not None and plan.version == project.fecha_actualizacion:
+            _planes.move_to_end(project.id)
+            return plan
+
+    plan = compilar_plan(project)
+
+    with _planes_lock:
+        _planes[project.id] = plan
+        _planes.move_to_end(project.id)
+        while len(_planes) > current_app.config['VALIDATION_PLAN_CACHE_SIZE']:
+            _planes.popitem(last=False)
+    return plan
+
+
+def invalidar_plan(project_id):
+    """
+    Elimina de la caché el plan de validación de un proyecto.
+
+    Parámetros:
+    - project_id (int): ID del proyecto modificado o eliminado.
+    """
+    with _planes_lock:
+        _planes.pop(project_id, None)
+
+
+def validar_escalar(values, validate, **parametros):
+    """
+    Aplica la función escalar `validate` celda a celda. Es el respaldo para las reglas
+    sin versión columnar y para los valores que una versión columnar no puede decidir.
+
+    Parámetros:
+    - values (pd.Series): Columna a validar.
+    - validate: Función `validate(value, **parametros)` de la regla.
+
+    Retorna:
+    - pd.Series con el mensaje de error de cada fila inválida, indexada por fila.
+    """
+    etiquetas = []
+    mensajes = []
+    for etiqueta, valor in values.items():
+        is_valid, error_message = validate(valor, **parametros)
+        if not is_valid:
+            etiquetas.append(etiqueta)
+            mensajes.append(error_message)
+    return pd.Series(mensajes, index=pd.Index(etiquetas, dtype=values.index.dtype), dtype=object)
+
+
+def es_nulo(value):
+    """
+    Indica si una celda es nula (None, NaN, NA o NaT), sin fallar con listas u otros
+    objetos que no son escalares.
+    """
+    return value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and math.isnan(value))
+
+
+def numeros_series(values):
+    """
+    Convierte una columna a números como `float(valor)` celda a celda, para las reglas
+    numéricas.
+
+    Retorna:
+    - Tupla (números, no_convertidos): los números, con NaN en los nulos y en las celdas
+      que no se pudieron convertir, y la máscara de estas últimas, que la regla resuelve
+      con su función escalar.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        # `pd.to_numeric` convertiría las fechas a nanosegundos; `float(fecha)` falla
+        numeros = pd.Series(np.nan, index=values.index)
+    else:
+        numeros = pd.to_numeric(values, errors='coerce').astype('Float64').astype(float)
+    no_convertidos = mascara(numeros.isna()) & mascara(values.notna())
+    return numeros, no_convertidos
+
+
+def mascara(condicion):
+    """
+    Convierte una condición columnar en un arreglo booleano de NumPy, tratando los
+    valores nulos (NaN, NA) como falsos.
+    """
+    return pd.Series(condicion).to_numpy(dtype=bool, na_value=False)
+
+
+def mensajes_error(values, condiciones):
+    """
+    Construye la serie de errores de una regla columnar.
+
+    Parámetros:
+    - values (pd.Series): Columna validada.
+    - condiciones (list): Pares (máscara booleana, mensaje). Si una fila cumple varias
+      condiciones se usa el mensaje de la primera.
+
+    Retorna:
+    - pd.Series con el mensaje de error de cada fila inválida, indexada por fila.
+    """
+    mensajes = np.full(len(values), None, dtype=object)
+    pendientes = np.ones(len(values), dtype=bool)
+    for condicion, mensaje in condiciones:
+        aplica = mascara(condicion) & pendientes
+        mensajes[aplica] = mensaje
+        pendientes &= ~aplica
+    invalidas = ~pendientes
+    return pd.Series(mensajes[invalidas], index=values.index[invalidas], dtype=object)
+
+
+def longitudes_texto(values):
+    """
+    Calcula la longitud de cada celda que sea una cadena de texto; el resto queda en NaN.
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return pd.Series(np.nan, index=values.index)
+    # `.str.len()` también mide listas y tuplas: solo se usa si todas las celdas son texto
+    if pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+        return values.str.len()
+    return values.map(lambda valor: len(valor) if isinstance(valor, str) else np.nan)
+
+
+def aplicar_regla(values, regla):
+    """
+    Aplica una regla a una columna con su función `validate_series` si existe; si no,
+    con la función escalar `validate` celda a celda.
+
+    En las columnas categóricas la regla se evalúa una sola vez por categoría (más una
+    para los nulos) y el resultado se propaga a las filas por su código.
+
+    Retorna:
+    - pd.Series con el mensaje de error de cada fila inválida, indexada por fila.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # El código -1 de los nulos apunta al último elemento, que es el nulo agregado
+        categorias = pd.Series(list(values.cat.categories) + [np.nan], dtype=object)
+        errores = aplicar_regla(categorias, regla)
+        mensajes = np.full(len(categorias), None, dtype=object)
+        mensajes[errores.index.to_numpy()] = errores.to_numpy()
+        mensajes_filas = mensajes[values.cat.codes.to_numpy()]
+        invalidas = pd.notna(mensajes_filas)
+        return pd.Series(mensajes_filas[invalidas], index=values.index[invalidas], dtype=object)
+
+    if regla.validate_series is not None:
+        return regla.validate_series(values, **regla.parametros)
+    return validar_escalar(values, regla.validate, **regla.parametros)
+
+
+def valores_nativos(values):
+    """
+    Convierte los valores de una columna en tipos nativos serializables en JSON: fechas
+    como `YYYY-MM-DD` y nulos (NaN, NA, NaT) como None.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime('%Y-%m-%d')
+    return [None if pd.isna(valor) else valor for valor in values.tolist()]
+
+
+def validar_dataframe(df, reglas, tiempos=None):
+    """
+    Ejecuta las reglas de validación sobre un DataFrame, una vez por columna.
+
+    Cada regla se aplica con `aplicar_regla`.
+
+    Parámetros:
+    - df (pd.DataFrame): Datos leídos del archivo.
+    - reglas (list): Lista de `ReglaValidacion`.
+    - tiempos (dict): Si se indica, se le suman los segundos de cada regla por su nombre.
+
+    Retorna:
+    - Lista de errores con el formato {"fila", "campo", "regla", "valor_incorrecto",
+      "mensaje_error"}, ordenada por fila y, dentro de cada fila, por el orden de las reglas.
+    """
+    if df.empty:
+        return []
+
+    etiquetas = []
+    ordenes = []
+    campos = []
+    nombres_reglas = []
+    valores = []
+    mensajes = []
+    for orden, regla in enumerate(reglas):
+        columna = df[regla.campo]
+        inicio = time.perf_counter()
+        errores_regla = aplicar_regla(columna, regla)
+        if tiempos is not None:
+            tiempos[regla.nombre_regla] = tiempos.get(regla.nombre_regla, 0.0) + time.perf_counter() - inicio
+        if errores_regla.empty:
+            continue
+
+        etiquetas.append(errores_regla.index.to_numpy())
+        ordenes.append(np.full(len(errores_regla), orden))
+        campos.extend([regla.campo] * len(errores_regla))
+        nombres_reglas.extend([regla.nombre_regla] * len(errores_regla))
+        valores.extend(valores_nativos(columna.loc[errores_regla.index]))
+        mensajes.extend(errores_regla.tolist())
+
+    if not etiquetas:
+        return []
+
+    etiquetas = np.concatenate(etiquetas)
+    posiciones = np.lexsort((np.concatenate(ordenes), etiquetas))
+    return [
+        {
+            "fila": etiquetas[i].item() + 1,
+            "campo": campos[i],
+            "regla": nombres_reglas[i],
+            "valor_incorrecto": valores[i],
+            "mensaje_error": mensajes[i]
+        }
+        for i in posiciones
+    ]
+
+
+# Reglas del plan en cada proceso del pool; se reciben una sola vez al iniciar el proceso
+_reglas_worker = None
+
+
+def _inicializar_worker(reglas):
+    global _reglas_worker
+    _reglas_worker = reglas
+
+
+def _validar_fragmento(df):
+    tiempos = {}
+    return validar_dataframe(df, _reglas_worker, tiempos), tiempos
+
+
+class Validador:
+    """
+    Ejecuta las reglas de un plan sobre los bloques de un archivo, en serie o repartiendo
+    fragmentos de filas entre un pool de procesos.
+
+    Se usa como gestor de contexto para que el pool viva durante toda la carga y las
+    reglas se envíen a cada proceso una sola vez, no por fragmento. Los procesos se crean
+    con `forkserver`: un `fork` desde un worker gthread de gunicorn puede copiar locks
+    tomados por otros hilos y bloquearse.
+
+    Parámetros:
+    - reglas (list): Lista de `ReglaValidacion`.
+    - workers (int): Procesos del pool; con 0 o 1 se valida en el proceso actual.
+    - filas_por_fragmento (int): Filas de cada fragmento enviado a un proceso.
+
+    Atributos:
+    - tiempos (dict): Segundos acumulados por cada regla (por nombre) en todas las
+      validaciones, incluidas las ejecutadas en el pool.
+    """
+    def __init__(self, reglas, workers=0, filas_por_fragmento=100000):
+        self.reglas = reglas
+        self.workers = workers
+        self.filas_por_fragmento = filas_por_fragmento
+        self.tiempos = {}
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_inicializar_worker,
+                initargs=(self.reglas,)
+            )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        return False
+
+    def validar(self, df, max_errores=0):
+        """
+        Valida un DataFrame y devuelve sus errores en el mismo formato y orden que
+        `validar_dataframe`.
+
+        Con `max_errores` mayor a 0 se deja de validar en el primer fragmento que alcanza
+        esa cantidad de errores; la lista puede tener más, pero nunca omite filas previas.
+        """
+        if len(df) <= self.filas_por_fragmento or (self._executor is None and not max_errores):
+            return validar_dataframe(df, self.reglas, self.tiempos)
+
+        fragmentos = (
+            df.iloc[inicio:inicio + self.filas_por_fragmento]
+            for inicio in range(0, len(df), self.filas_por_fragmento)
+        )
+        if self._executor is None:
+            resultados = ((validar_dataframe(fragmento, self.reglas, self.tiempos), {}) for fragmento in fragmentos)
+        else:
+            resultados = self._validar_en_pool(fragmentos)
+
+        errores = []
+        for errores_fragmento, tiempos_fragmento in resultados:
+            errores.extend(errores_fragmento)
+            for regla, segundos in tiempos_fragmento.items():
+                self.tiempos[regla] = self.tiempos.get(regla, 0.0) + segundos
+            if max_errores and len(errores) >= max_errores:
+                break
+        return errores
+
+    def _validar_en_pool(self, fragmentos):
+        # Como máximo `workers` fragmentos enviados a la vez, devueltos en orden para que
+        # los errores queden por fila; al cortar por `max_errores` se cancelan los que
+        # quedan en vuelo en lugar de validar el resto del bloque
+        enviados = deque()
+        try:
+            for fragmento in fragmentos:
+                if len(enviados) >= self.workers:
+                    yield enviados.popleft().result()
+                enviados.append(self._executor.submit(_validar_fragmento, fragmento))
+            while enviados:
+                yield enviados.popleft().result()
+        finally:
+            for futuro in enviados:
+                futuro.cancel()
+
+
+def crear_validador(reglas):
+    """
+    Crea un `Validador` según la configuración (`VALIDATION_WORKERS` y
+    `VALIDATION_SHARD_SIZE`).
+    """
+    return Validador(
+        reglas,
+        workers=current_app.config['VALIDATION_WORKERS'],
+        filas_por_fragmento=current_app.config['VALIDATION_SHARD_SIZE']
+    )
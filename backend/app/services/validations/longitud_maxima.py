@@ -1,6 +1,15 @@
+from app.services.validation_service import longitudes_texto, mensajes_error
+
 def validate(value, max):
     if not isinstance(value, str):
         return False, "El valor no es una cadena de texto"
     if len(value) > max:
         return False, f"El campo no debe exceder {max} caracteres"
     return True, None
+
+def validate_series(values, max):
+    longitudes = longitudes_texto(values)
+    return mensajes_error(values, [
+        (longitudes.isna(), "El valor no es una cadena de texto"),
+        (longitudes > max, f"El campo no debe exceder {max} caracteres")
+    ])
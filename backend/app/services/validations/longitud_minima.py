@@ -1,6 +1,15 @@
+from app.services.validation_service import longitudes_texto, mensajes_error
+
 def validate(value, min):
     if not isinstance(value, str):
         return False, "El valor no es una cadena de texto"
     if len(value) < min:
         return False, f"El campo debe tener al menos {min} caracteres"
     return True, None
+
+def validate_series(values, min):
+    longitudes = longitudes_texto(values)
+    return mensajes_error(values, [
+        (longitudes.isna(), "El valor no es una cadena de texto"),
+        (longitudes < min, f"El campo debe tener al menos {min} caracteres")
+    ])
@@ -1,7 +1,18 @@
+import pandas as pd
+from app.services.validation_service import es_nulo, mensajes_error, numeros_series, validar_escalar
+
 def validate(value):
+    # Los nulos no se evalúan: de los campos vacíos se ocupan `no_vacio` y `requerido`
+    if es_nulo(value):
+        return True, None
     try:
         if float(value) <= 0:
             return False, "El campo debe ser mayor a cero"
-    except ValueError:
+    except (TypeError, ValueError):
         return False, "El valor no es un número"
     return True, None
+
+def validate_series(values):
+    numeros, no_convertidos = numeros_series(values)
+    errores = mensajes_error(values, [(numeros <= 0, "El campo debe ser mayor a cero")])
+    return pd.concat([errores, validar_escalar(values[no_convertidos], validate)])
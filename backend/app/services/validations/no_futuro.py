@@ -1,10 +1,32 @@
-from datetime import datetime
+from datetime import date, datetime
+import pandas as pd
+from app.services.validation_service import es_nulo, mascara, mensajes_error, validar_escalar
 
 def validate(value):
     try:
-        fecha = datetime.strptime(value, "%Y-%m-%d")
+        # Las columnas de fecha de Parquet y Arrow llegan como fechas, no como texto
+        if isinstance(value, datetime) and not es_nulo(value):
+            fecha = value
+        elif isinstance(value, date) and not isinstance(value, datetime):
+            fecha = datetime(value.year, value.month, value.day)
+        else:
+            fecha = datetime.strptime(value, "%Y-%m-%d")
         if fecha > datetime.now():
             return False, "La fecha no puede estar en el futuro"
-    except ValueError:
+    except (TypeError, ValueError):
         return False, "El valor no es una fecha válida"
     return True, None
+
+def validate_series(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return mensajes_error(values, [
+            (values.isna(), "El valor no es una fecha válida"),
+            (values > pd.Timestamp(datetime.now()), "La fecha no puede estar en el futuro")
+        ])
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return validar_escalar(values, validate)
+    formato_iso = mascara(values.str.fullmatch(r"[0-9]{4}-[0-9]{2}-[0-9]{2}", na=False))
+    fechas = pd.to_datetime(values.where(formato_iso), format="%Y-%m-%d", errors='coerce')
+    decididas = formato_iso & mascara(fechas.notna())
+    errores = mensajes_error(values, [(decididas & mascara(fechas > pd.Timestamp(datetime.now())), "La fecha no puede estar en el futuro")])
+    return pd.concat([errores, validar_escalar(values[~decididas], validate)])
@@ -1,9 +1,16 @@
-import pandas as pd 
+from app.services.validation_service import es_nulo, longitudes_texto, mensajes_error
+
 def validate(value):
-    if isinstance(value, float) and pd.isna(value):
+    if es_nulo(value):
         return False, "El campo no puede estar vacío"
     
     if not str(value).strip():
         return False, "El campo no puede estar vacío"
     
     return True, None
+
+def validate_series(values):
+    vacios = values.isna()
+    if longitudes_texto(values).notna().any():
+        vacios |= values.str.strip().eq('')
+    return mensajes_error(values, [(vacios, "El campo no puede estar vacío")])
@@ -1,8 +1,21 @@
+import pandas as pd
+from app.services.validation_service import es_nulo, mensajes_error, numeros_series, validar_escalar
+
 def validate(value, min, max):
+    # Los nulos no se evalúan: de los campos vacíos se ocupan `no_vacio` y `requerido`
+    if es_nulo(value):
+        return True, None
     try:
         valor_numerico = float(value)
         if valor_numerico < min or valor_numerico > max:
             return False, f"El campo debe estar dentro del rango de {min} a {max}"
-    except ValueError:
+    except (TypeError, ValueError):
         return False, "El valor no es un número"
     return True, None
+
+def validate_series(values, min, max):
+    numeros, no_convertidos = numeros_series(values)
+    errores = mensajes_error(values, [
+        ((numeros < min) | (numeros > max), f"El campo debe estar dentro del rango de {min} a {max}")
+    ])
+    return pd.concat([errores, validar_escalar(values[no_convertidos], validate, min=min, max=max)])
@@ -0,0 +1,51 @@
+# backend/app/services/warmup_service.py
+import importlib
+import logging
+import pkgutil
+
+from app import db
+from app.services import validations
+
+logger = logging.getLogger(__name__)
+
+
+def precargar_validaciones():
+    """
+    Importa todos los módulos de `app.services.validations` para que la primera carga no
+    pague su importación (y la de sus dependencias). Con `preload_app` de gunicorn se
+    ejecuta una sola vez en el proceso maestro y los workers heredan los módulos.
+
+    Retorna:
+    - Lista con los nombres de las reglas importadas.
+    """
+    reglas = []
+    for modulo in pkgutil.iter_modules(validations.__path__):
+        importlib.import_module(f'{validations.__name__}.{modulo.name}')
+        reglas.append(modulo.name)
+    return reglas
+
+
+def abrir_conexiones(app):
+    """
+    Abre a la vez `DB_POOL_WARMUP` conexiones del pool de SQLAlchemy (por defecto el
+    tamaño del pool) y las devuelve, para que las primeras solicitudes del worker no
+    esperen a conectarse con PostgreSQL. Debe llamarse en cada worker, después del fork.
+
+    Si la base de datos no está disponible solo se registra el error: el pool abrirá las
+    conexiones cuando se necesiten.
+
+    Retorna:
+    - Cantidad de conexiones abiertas.
+    """
+    cantidad = app.config['DB_POOL_WARMUP']
+    conexiones = []
+    with app.app_context():
+        try:
+            for _ in range(cantidad):
+                conexiones.append(db.engine.connect())
+        except Exception as e:
+            logger.error(f"No se pudieron abrir las conexiones iniciales del pool: {str(e)}")
+        finally:
+            for conexion in conexiones:
+                conexion.close()
+    return len(conexiones)
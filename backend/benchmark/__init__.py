@@ -0,0 +1,24 @@
+# backend/benchmark/__init__.py
+"""
+Benchmark reproducible del pipeline de carga.
+
+Genera archivos CSV sintéticos a partir de la definición de un proyecto (el mismo JSON
+que recibe `PUT /projects/`) o de una mezcla de columnas, con una tasa de errores
+configurable, y mide cada etapa del pipeline por separado: verificación del esquema,
+lectura, cada regla de validación, unicidad y, con una base de datos, DDL, carga e
+índices. Los resultados se escriben en JSON para comparar corridas.
+
+Uso (desde `backend/`):
+
+    python -m benchmark --definicion benchmark/definiciones/ejemplo.json \
+        --filas 10000 100000 1000000 --tasa-errores 0.01 --salida resultados.json
+
+    python -m benchmark --columnas texto=4,integer=2,numeric=2,date=1 --filas 1000000 \
+        --postgres-temporal --salida resultados.json
+
+    python -m benchmark.comparar base.json resultados.json
+
+Las etapas de base de datos se ejecutan con `--dsn` (por ejemplo el Postgres de
+`docker compose up -d db`) o con `--postgres-temporal`, que levanta un clúster temporal
+con `initdb`/`pg_ctl`. Sin ninguno de los dos solo se miden las etapas en memoria.
+"""
@@ -0,0 +1,135 @@
+# backend/benchmark/__main__.py
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+
+from app import db
+from app.services.upload_service import PYARROW_DISPONIBLE
+from benchmark.definicion import cargar_definicion, definicion_por_mezcla, construir_plan
+from benchmark.etapas import Medidor, ejecutar_corrida
+from benchmark.generador import generar_csv
+from benchmark.postgres import postgres_temporal
+from config import Config
+
+
+def crear_app_benchmark(dsn=None, **configuracion):
+    """
+    Crea una aplicación Flask mínima con la configuración del backend, sin endpoints.
+    Con `dsn` se conecta la base de datos a esa URI.
+    """
+    app = Flask('benchmark')
+    app.config.from_object(Config)
+    app.config.update(configuracion)
+    if dsn:
+        app.config['SQLALCHEMY_DATABASE_URI'] = dsn
+        db.init_app(app)
+    return app
+
+
+def version_codigo():
+    """
+    Devuelve el commit actual del repositorio, o None si no se puede obtener.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def leer_argumentos():
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Benchmark del pipeline de carga.')
+    origen = parser.add_mutually_exclusive_group()
+    origen.add_argument('--definicion', help='JSON con la definición del proyecto (formato de PUT /projects/).')
+    origen.add_argument('--columnas', default='texto=4,integer=2,numeric=2,date=1',
+                        help='Mezcla de columnas si no se indica definición, por ejemplo "texto=4,integer=2".')
+    parser.add_argument('--filas', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Cantidades de filas a generar y medir.')
+    parser.add_argument('--tasa-errores', type=float, default=0.01, help='Fracción de celdas con valores incorrectos.')
+    parser.add_argument('--semilla', type=int, default=42, help='Semilla de la generación de datos.')
+    parser.add_argument('--directorio', help='Directorio de los archivos generados (se reutilizan si existen).')
+    parser.add_argument('--chunksize', type=int, default=0, help='Filas por bloque de lectura; 0 lee el archivo completo.')
+    parser.add_argument('--motor', choices=['auto', 'c', 'pyarrow'], default='auto', help='Motor de lectura de CSV.')
+    base_datos = parser.add_mutually_exclusive_group()
+    base_datos.add_argument('--dsn', help='URI de SQLAlchemy de un PostgreSQL para las etapas de base de datos.')
+    base_datos.add_argument('--postgres-temporal', action='store_true',
+                            help='Levanta un PostgreSQL temporal con initdb/pg_ctl para las etapas de base de datos.')
+    parser.add_argument('--trazar-memoria', action='store_true',
+                        help='Mide el pico de memoria de cada etapa con tracemalloc (más lento).')
+    parser.add_argument('--salida', default='resultados_benchmark.json', help='Archivo JSON de resultados.')
+    return parser.parse_args()
+
+
+def main():
+    args = leer_argumentos()
+    definicion = cargar_definicion(args.definicion) if args.definicion else definicion_por_mezcla(args.columnas)
+    plan = construir_plan(definicion)
+    directorio = args.directorio or os.path.join(tempfile.gettempdir(), 'benchmark_carga')
+
+    if args.trazar_memoria:
+        tracemalloc.start()
+
+    base_datos = postgres_temporal() if args.postgres_temporal else nullcontext(args.dsn)
+    corridas = []
+    with base_datos as dsn:
+        app = crear_app_benchmark(dsn, CSV_PARSER_ENGINE=args.motor)
+        with app.app_context():
+            for filas in args.filas:
+                nombre = f"{definicion['nombre_tabla']}_{filas}_{args.tasa_errores}_{args.semilla}.csv"
+                ruta = os.path.join(directorio, nombre)
+                if not os.path.exists(ruta):
+                    print(f"Generando {ruta} ...")
+                    generar_csv(definicion, filas, ruta, args.tasa_errores, args.semilla)
+
+                print(f"Midiendo {filas} filas ...")
+                medidor = Medidor(args.trazar_memoria)
+                ejecutar_corrida(ruta, plan, medidor, con_base_datos=bool(dsn), chunksize=args.chunksize)
+                corridas.append({
+                    "filas": filas,
+                    "archivo_mb": round(os.path.getsize(ruta) / 2 ** 20, 2),
+                    "segundos_total": round(sum(etapa["segundos"] for etapa in medidor.etapas), 4),
+                    "etapas": medidor.etapas
+                })
+                for etapa in medidor.etapas:
+                    print(f"  {etapa['etapa']:<45} {etapa['segundos']:>10.4f} s  {etapa['filas_por_segundo'] or '':>12} filas/s")
+
+    resultados = {
+        "fecha": datetime.now().isoformat(timespec='seconds'),
+        "entorno": {
+            "commit": version_codigo(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "pyarrow_disponible": PYARROW_DISPONIBLE,
+            "cpus": os.cpu_count()
+        },
+        "parametros": {
+            "definicion": args.definicion or f"columnas:{args.columnas}",
+            "tasa_errores": args.tasa_errores,
+            "semilla": args.semilla,
+            "chunksize": args.chunksize,
+            "motor": args.motor,
+            "base_datos": bool(args.dsn or args.postgres_temporal),
+            "trazar_memoria": args.trazar_memoria
+        },
+        "corridas": corridas
+    }
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados escritos en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
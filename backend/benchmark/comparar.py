@@ -0,0 +1,65 @@
+# backend/benchmark/comparar.py
+import argparse
+import json
+
+
+def indexar(resultados):
+    """
+    Indexa las etapas de un archivo de resultados por (filas, etapa).
+    """
+    return {
+        (corrida["filas"], etapa["etapa"]): etapa
+        for corrida in resultados["corridas"]
+        for etapa in corrida["etapas"]
+    }
+
+
+def comparar(base, nuevo, umbral=0.1):
+    """
+    Compara dos archivos de resultados etapa por etapa.
+
+    Retorna:
+    - Lista de dicts {"filas", "etapa", "segundos_base", "segundos_nuevo", "cambio"}, donde
+      `cambio` es la variación relativa del tiempo (positiva si es más lento) y
+      `regresion` indica si supera `umbral`.
+    """
+    etapas_base = indexar(base)
+    etapas_nuevo = indexar(nuevo)
+    filas = []
+    for clave in sorted(etapas_base.keys() & etapas_nuevo.keys()):
+        segundos_base = etapas_base[clave]["segundos"]
+        segundos_nuevo = etapas_nuevo[clave]["segundos"]
+        cambio = (segundos_nuevo - segundos_base) / segundos_base if segundos_base > 0 else None
+        filas.append({
+            "filas": clave[0],
+            "etapa": clave[1],
+            "segundos_base": segundos_base,
+            "segundos_nuevo": segundos_nuevo,
+            "cambio": round(cambio, 3) if cambio is not None else None,
+            "regresion": cambio is not None and cambio > umbral
+        })
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmark.comparar', description='Compara dos corridas del benchmark.')
+    parser.add_argument('base', help='JSON de resultados de referencia.')
+    parser.add_argument('nuevo', help='JSON de resultados a comparar.')
+    parser.add_argument('--umbral', type=float, default=0.1, help='Variación relativa a partir de la cual se marca una regresión.')
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding='utf-8') as archivo:
+        nuevo = json.load(archivo)
+
+    filas = comparar(base, nuevo, args.umbral)
+    for fila in filas:
+        cambio = f"{fila['cambio']:+.1%}" if fila['cambio'] is not None else '-'
+        marca = '  REGRESIÓN' if fila['regresion'] else ''
+        print(f"{fila['filas']:>10} {fila['etapa']:<45} {fila['segundos_base']:>10.4f} {fila['segundos_nuevo']:>10.4f} {cambio:>8}{marca}")
+    return 1 if any(fila['regresion'] for fila in filas) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+# backend/benchmark/definicion.py
+import importlib
+import json
+from types import SimpleNamespace
+
+from app.services.validation_service import (
+    CampoEsquema, PlanValidacion, ReglaValidacion, get_required_params, reglas_esquema, ErrorConfiguracionValidacion
+)
+
+# Regla que se aplica a cada columna de una mezcla según su tipo de dato
+REGLAS_POR_TIPO = {
+    'varchar': [("no_vacio", None), ("longitud_maxima", {"max": 20})],
+    'integer': [("positivo", None)],
+    'number': [("rango", {"min": 0, "max": 100000})],
+    'date': [("no_futuro", None)],
+}
+
+
+def cargar_definicion(ruta):
+    """
+    Lee la definición de un proyecto desde un JSON con el formato de `PUT /projects/`
+    (`nombre_proyecto`, `nombre_tabla`, `esquemas`, `validaciones`).
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def definicion_por_mezcla(mezcla, con_clave=True):
+    """
+    Genera la definición de un proyecto sintético a partir de una mezcla de columnas.
+
+    Parámetros:
+    - mezcla (str): Cantidad de columnas por tipo, por ejemplo `texto=4,integer=2,numeric=1,date=1`.
+      `texto` equivale a `varchar` y `numeric` a `number`.
+    - con_clave (bool): Si es True se agrega una columna `codigo` como clave primaria.
+
+    Retorna:
+    - dict con el formato de `cargar_definicion`.
+    """
+    alias = {"texto": "varchar", "numeric": "number"}
+    esquemas = []
+    validaciones = []
+    if con_clave:
+        esquemas.append({"campo_nombre": "codigo", "tipo_dato": "varchar", "longitud_maxima": 12, "requerido": True, "es_clave_primaria": True})
+
+    for parte in mezcla.split(','):
+        tipo, _, cantidad = parte.partition('=')
+        tipo = alias.get(tipo.strip(), tipo.strip())
+        if tipo not in REGLAS_POR_TIPO:
+            raise ValueError(f"Tipo de columna desconocido en la mezcla: '{tipo}'.")
+        for numero in range(1, int(cantidad or 1) + 1):
+            campo = f"{tipo}_{numero}"
+            esquemas.append({
+                "campo_nombre": campo,
+                "tipo_dato": tipo,
+                "longitud_maxima": 20 if tipo == 'varchar' else None
+            })
+            for nombre_regla, valor in REGLAS_POR_TIPO[tipo]:
+                validaciones.append({"campo_nombre": campo, "nombre_regla": nombre_regla, "valor": valor})
+
+    return {
+        "nombre_proyecto": "benchmark_mezcla",
+        "nombre_tabla": "benchmark_mezcla",
+        "esquemas": esquemas,
+        "validaciones": validaciones
+    }
+
+
+def construir_plan(definicion):
+    """
+    Construye el `PlanValidacion` de una definición sin consultar la base de datos,
+    resolviendo las reglas por nombre igual que `compilar_reglas`.
+
+    Lanza:
+    - ErrorConfiguracionValidacion: Si una regla no existe o le faltan parámetros.
+    """
+    esquemas = [
+        CampoEsquema(SimpleNamespace(
+            campo_nombre=esquema["campo_nombre"].lower(),
+            tipo_dato=esquema["tipo_dato"],
+            requerido=esquema.get("requerido", False),
+            longitud_maxima=esquema.get("longitud_maxima"),
+            valores_permitidos=esquema.get("valores_permitidos"),
+            es_clave_primaria=esquema.get("es_clave_primaria", False),
+            es_unico=esquema.get("es_unico", False)
+        ))
+        for esquema in definicion["esquemas"]
+    ]
+
+    # Igual que `compilar_plan`: primero las restricciones del esquema
+    reglas = reglas_esquema(esquemas)
+    for validacion in definicion["validaciones"]:
+        nombre_regla = validacion["nombre_regla"]
+        try:
+            modulo = importlib.import_module(f'app.services.validations.{nombre_regla}')
+        except ModuleNotFoundError:
+            raise ErrorConfiguracionValidacion({"error": f"Módulo de validación no encontrado para la regla '{nombre_regla}'."})
+        parametros = validacion.get("valor") or {}
+        faltantes = [param for param in get_required_params(modulo.validate) if param not in parametros]
+        if faltantes:
+            raise ErrorConfiguracionValidacion({
+                "error": f"Faltan parámetros requeridos para la validación '{nombre_regla}'. Parámetros faltantes: {faltantes}"
+            })
+        reglas.append(ReglaValidacion(
+            campo=validacion["campo_nombre"].lower(),
+            nombre_regla=nombre_regla,
+            validate=modulo.validate,
+            validate_series=getattr(modulo, 'validate_series', None),
+            parametros=parametros
+        ))
+
+    return PlanValidacion(proyecto_id=None, version=None, esquemas=esquemas, reglas=reglas)
@@ -0,0 +1,125 @@
+# backend/benchmark/etapas.py
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from app import db
+from app.services.load_service import cargar_dataframe
+from app.services.unicidad_service import VerificadorUnicidad
+from app.services.upload_service import leer_encabezado, leer_bloques, verificar_esquema, crear_tabla, crear_indices
+from app.services.validation_service import aplicar_regla
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def rss_maximo_mb():
+    """
+    Devuelve el máximo de memoria residente del proceso hasta ahora, en MB, o None si la
+    plataforma no lo informa.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss está en KB en Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class Medidor:
+    """
+    Registra la duración de cada etapa y, con `trazar_memoria`, el pico de memoria
+    asignada durante ella según `tracemalloc` (incluye los arreglos de NumPy y pandas,
+    pero hace más lenta la ejecución).
+    """
+    def __init__(self, trazar_memoria=False):
+        self.trazar_memoria = trazar_memoria
+        self.etapas = []
+
+    @contextmanager
+    def etapa(self, nombre, filas=0):
+        registro = {"etapa": nombre, "filas": filas}
+        if self.trazar_memoria:
+            tracemalloc.reset_peak()
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        yield registro
+        segundos = time.perf_counter() - inicio
+
+        registro["segundos"] = round(segundos, 4)
+        registro["filas_por_segundo"] = round(registro["filas"] / segundos) if segundos > 0 and registro["filas"] else None
+        if self.trazar_memoria:
+            registro["memoria_pico_mb"] = round((tracemalloc.get_traced_memory()[1] - memoria_inicial) / 2 ** 20, 1)
+        registro["rss_maximo_mb"] = rss_maximo_mb()
+        self.etapas.append(registro)
+
+
+def ejecutar_corrida(ruta, plan, medidor, con_base_datos=False, chunksize=0):
+    """
+    Ejecuta sobre un archivo cada etapa del pipeline de carga por separado.
+
+    Etapas: `esquema` (lectura del encabezado y verificación), `lectura` (CSV a
+    DataFrames tipados), `validacion:<campo>:<regla>` por cada regla, `unicidad` y, con
+    base de datos, `ddl`, `carga` (solo las filas sin errores) e `indices`. La tabla de
+    la corrida se elimina al terminar.
+
+    Parámetros:
+    - ruta (str): Archivo CSV.
+    - plan (PlanValidacion): Plan del proyecto.
+    - medidor (Medidor): Registro de las etapas.
+    - con_base_datos (bool): Si es True se ejecutan las etapas de base de datos.
+    - chunksize (int): Filas por bloque de lectura; 0 lee el archivo completo.
+    """
+    proyecto = SimpleNamespace(nombre_proyecto='benchmark')
+    with open(ruta, 'rb') as stream:
+        with medidor.etapa('esquema'):
+            columnas = leer_encabezado(stream)
+            verificar_esquema(columnas, plan, proyecto)
+        with medidor.etapa('lectura') as registro:
+            bloques = list(leer_bloques(stream, columnas, plan.esquemas, chunksize))
+            registro["filas"] = sum(len(df) for df in bloques)
+    filas = sum(len(df) for df in bloques)
+
+    invalidas = [set() for _ in bloques]
+    for regla in plan.reglas:
+        with medidor.etapa(f"validacion:{regla.campo}:{regla.nombre_regla}", filas) as registro:
+            errores = 0
+            for numero, df in enumerate(bloques):
+                errores_regla = aplicar_regla(df[regla.campo], regla)
+                invalidas[numero].update(errores_regla.index.tolist())
+                errores += len(errores_regla)
+            registro["errores"] = errores
+
+    with medidor.etapa('unicidad', filas) as registro:
+        unicidad = VerificadorUnicidad(plan.esquemas)
+        errores = 0
+        for numero, df in enumerate(bloques):
+            errores_unicidad = unicidad.validar(df)
+            invalidas[numero].update(error["fila"] - 1 for error in errores_unicidad)
+            errores += len(errores_unicidad)
+        registro["errores"] = errores
+
+    if not con_base_datos:
+        return
+
+    tabla = f"benchmark_{uuid.uuid4().hex[:8]}"
+    validos = [df.drop(index=list(etiquetas)) for df, etiquetas in zip(bloques, invalidas)]
+    filas_validas = sum(len(df) for df in validos)
+    try:
+        db.session.execute(text("CREATE SCHEMA IF NOT EXISTS datos;"))
+        with medidor.etapa('ddl'):
+            crear_tabla(tabla, plan.esquemas)
+        with medidor.etapa('carga', filas_validas) as registro:
+            for df in validos:
+                registro["metodo"] = cargar_dataframe(df, f"datos.{tabla}", plan.esquemas)["metodo"]
+        with medidor.etapa('indices', filas_validas):
+            crear_indices(tabla, plan.esquemas)
+            db.session.commit()
+    finally:
+        db.session.rollback()
+        db.session.execute(text(f"DROP TABLE IF EXISTS datos.{tabla};"))
+        db.session.commit()
@@ -0,0 +1,99 @@
+# backend/benchmark/generador.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.services.ddl_service import tipo_base
+
+# Valores incorrectos que se inyectan según el tipo base de la columna
+VALORES_INCORRECTOS = {
+    'texto': [""],
+    'integer': ["abc", -5],
+    'bigint': ["abc", -5],
+    'numeric': ["n/a", -1.5],
+    'boolean': ["talvez"],
+    'date': ["2999-12-31", "31/12/2020"],
+    'timestamp': ["2999-12-31 00:00:00", "ayer"],
+}
+
+
+def generar_columna(esquema, inicio, cantidad, rng):
+    """
+    Genera `cantidad` valores válidos para un campo del esquema, a partir de la fila
+    `inicio` (los campos clave y únicos usan la posición de la fila para no repetirse).
+    """
+    tipo = tipo_base(esquema["tipo_dato"])
+    unico = esquema.get("es_clave_primaria") or esquema.get("es_unico")
+    longitud = esquema.get("longitud_maxima") or 20
+    posiciones = np.arange(inicio, inicio + cantidad)
+
+    if esquema.get("valores_permitidos"):
+        return pd.Series(rng.choice(esquema["valores_permitidos"], cantidad), dtype=object)
+    if tipo == 'texto':
+        numeros = posiciones if unico else rng.integers(0, 10 ** 6, cantidad)
+        return ("V" + pd.Series(numeros).astype(str)).str[:longitud]
+    if tipo in ('integer', 'bigint'):
+        return pd.Series(posiciones + 1 if unico else rng.integers(1, 10 ** 6, cantidad))
+    if tipo == 'numeric':
+        return pd.Series(rng.uniform(1, 100000, cantidad).round(2))
+    if tipo == 'boolean':
+        return pd.Series(rng.choice(["true", "false"], cantidad), dtype=object)
+    if tipo == 'date':
+        dias = np.datetime64('2015-01-01') + rng.integers(0, 3000, cantidad).astype('timedelta64[D]')
+        return pd.Series(np.datetime_as_string(dias, unit='D'), dtype=object)
+    segundos = np.datetime64('2015-01-01T00:00:00') + rng.integers(0, 3000 * 86400, cantidad).astype('timedelta64[s]')
+    return pd.Series(np.datetime_as_string(segundos, unit='s'), dtype=object).str.replace('T', ' ')
+
+
+def inyectar_errores(valores, esquema, tasa_errores, rng):
+    """
+    Reemplaza una fracción `tasa_errores` de los valores por valores incorrectos para su
+    tipo. En los campos clave y únicos los errores son valores repetidos.
+    """
+    marcadas = rng.random(len(valores)) < tasa_errores
+    if not marcadas.any():
+        return valores
+
+    valores = valores.astype(object)
+    if esquema.get("es_clave_primaria") or esquema.get("es_unico"):
+        valores[marcadas] = valores.iloc[0]
+        return valores
+
+    incorrectos = list(VALORES_INCORRECTOS[tipo_base(esquema["tipo_dato"])])
+    if esquema.get("longitud_maxima"):
+        incorrectos.append("X" * (esquema["longitud_maxima"] + 1))
+    seleccion = rng.integers(0, len(incorrectos), int(marcadas.sum()))
+    valores[marcadas] = np.array(incorrectos, dtype=object)[seleccion]
+    return valores
+
+
+def generar_csv(definicion, filas, ruta, tasa_errores=0.0, semilla=0, filas_por_bloque=500000):
+    """
+    Escribe un CSV sintético con las columnas de la definición, por bloques para no
+    mantener el archivo completo en memoria.
+
+    El contenido depende solo de la definición, la cantidad de filas, la tasa de errores,
+    la semilla y el tamaño de bloque, por lo que dos corridas con los mismos parámetros
+    generan el mismo archivo.
+
+    Retorna:
+    - Tamaño del archivo en bytes.
+    """
+    esquemas = definicion["esquemas"]
+    columnas = [esquema["campo_nombre"].lower() for esquema in esquemas]
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        for numero_bloque, inicio in enumerate(range(0, filas, filas_por_bloque)):
+            cantidad = min(filas_por_bloque, filas - inicio)
+            rng = np.random.default_rng([semilla, numero_bloque])
+            bloque = pd.DataFrame({
+                columna: inyectar_errores(generar_columna(esquema, inicio, cantidad, rng), esquema, tasa_errores, rng).to_numpy()
+                for columna, esquema in zip(columnas, esquemas)
+            })
+            bloque.to_csv(archivo, header=numero_bloque == 0, index=False)
+        if filas == 0:
+            archivo.write(",".join(columnas) + "\n")
+
+    return os.path.getsize(ruta)
@@ -0,0 +1,52 @@
+# backend/benchmark/postgres.py
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def postgres_temporal(puerto=55432):
+    """
+    Levanta un clúster de PostgreSQL temporal con `initdb` y `pg_ctl`, escuchando solo
+    en un socket Unix dentro de un directorio temporal, y lo elimina al salir.
+
+    Parámetros:
+    - puerto (int): Puerto del socket (solo identifica el archivo del socket).
+
+    Retorna:
+    - URI de SQLAlchemy para conectarse como `postgres` sin contraseña.
+
+    Lanza:
+    - RuntimeError: Si `initdb` o `pg_ctl` no están en el PATH.
+    """
+    initdb = shutil.which('initdb')
+    pg_ctl = shutil.which('pg_ctl')
+    if not initdb or not pg_ctl:
+        raise RuntimeError(
+            "No se encontraron 'initdb' y 'pg_ctl' en el PATH. Use --dsn con un PostgreSQL "
+            "existente, por ejemplo el de 'docker compose up -d db'."
+        )
+
+    directorio = tempfile.mkdtemp(prefix='benchmark_pg_')
+    datos = os.path.join(directorio, 'datos')
+    try:
+        subprocess.run(
+            [initdb, '-D', datos, '-U', 'postgres', '--auth=trust', '--no-sync'],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        subprocess.run(
+            [
+                pg_ctl, '-D', datos, '-l', os.path.join(directorio, 'postgres.log'), '-w',
+                '-o', f"-p {puerto} -k {directorio} -c listen_addresses=''",
+                'start'
+            ],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        try:
+            yield f"postgresql+psycopg2://postgres@/postgres?host={directorio}&port={puerto}"
+        finally:
+            subprocess.run([pg_ctl, '-D', datos, '-m', 'fast', '-w', 'stop'], stdout=subprocess.DEVNULL)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
@@ -11,3 +11,55 @@ class Config:
         f"@{os.getenv('POSTGRES_HOST_DB', 'localhost')}:{os.getenv('POSTGRES_PORT', 5432)}/{os.getenv('POSTGRES_DB')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de conexiones por proceso: por defecto una por hilo de gunicorn más 4 de desborde
+    # (hilos de las cargas en lote y tareas en segundo plano); gunicorn.conf.py limita los workers para que
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) no supere DB_MAX_CONNECTIONS
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv('DB_POOL_SIZE', os.getenv('GUNICORN_THREADS', 4))),
+        "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', 4)),
+        "pool_timeout": int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        "pool_pre_ping": os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+    # Conexiones que cada worker abre al iniciar (por defecto el tamaño del pool)
+    DB_POOL_WARMUP = int(os.getenv('DB_POOL_WARMUP', SQLALCHEMY_ENGINE_OPTIONS["pool_size"]))
+    VALIDATION_PLAN_CACHE_SIZE = int(os.getenv('VALIDATION_PLAN_CACHE_SIZE', 128))
+    BULK_LOAD_METHOD = os.getenv('BULK_LOAD_METHOD', 'copy')
+    BULK_LOAD_BATCH_SIZE = int(os.getenv('BULK_LOAD_BATCH_SIZE', 50000))
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 0))
+    UPLOAD_SPOOL_DIR = os.getenv('UPLOAD_SPOOL_DIR', '/var/app/spool')
+    UPLOAD_JOB_POLL_INTERVAL = float(os.getenv('UPLOAD_JOB_POLL_INTERVAL', 2))
+    # Intentos tras los que un trabajo abandonado (su worker cayó) se marca como error en lugar de reclamarse
+    UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv('UPLOAD_JOB_MAX_ATTEMPTS', 3))
+    # Procesos para validar en paralelo ("auto" = núcleos de la máquina, 0 = en serie)
+    VALIDATION_WORKERS = os.cpu_count() if os.getenv('VALIDATION_WORKERS') == 'auto' else int(os.getenv('VALIDATION_WORKERS', 0))
+    VALIDATION_SHARD_SIZE = int(os.getenv('VALIDATION_SHARD_SIZE', 100000))
+    PROJECT_DATA_PREVIEW_ROWS = int(os.getenv('PROJECT_DATA_PREVIEW_ROWS', 100))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+    # Errores de validación a partir de los cuales se detiene la carga (0 = sin límite, por
+    # defecto se informan todos; cada solicitud puede pedir un límite con `max_errores`)
+    VALIDATION_MAX_ERRORS = int(os.getenv('VALIDATION_MAX_ERRORS', 0))
+    VALIDATION_ERROR_EXAMPLES = int(os.getenv('VALIDATION_ERROR_EXAMPLES', 5))
+    ERROR_REPORT_DIR = os.getenv('ERROR_REPORT_DIR', os.path.join(UPLOAD_SPOOL_DIR, 'errores'))
+    ERROR_REPORT_TTL = int(os.getenv('ERROR_REPORT_TTL', 86400))
+    # Motor de lectura de CSV: "auto" (pyarrow si está instalado y no se lee por bloques), "c" o "pyarrow"
+    # (con UPLOAD_CHUNK_SIZE > 0 se usa siempre "c": pyarrow no lee por bloques)
+    CSV_PARSER_ENGINE = os.getenv('CSV_PARSER_ENGINE', 'auto')
+    # Puerto en el que el worker de cargas expone sus métricas de Prometheus (0 = no se exponen)
+    METRICS_WORKER_PORT = int(os.getenv('METRICS_WORKER_PORT', 0))
+    # Cargas simultáneas de un lote (cada una usa una conexión del pool) y archivos por lote
+    UPLOAD_BATCH_WORKERS = int(os.getenv('UPLOAD_BATCH_WORKERS', 4))
+    UPLOAD_BATCH_MAX_FILES = int(os.getenv('UPLOAD_BATCH_MAX_FILES', 100))
+    # Cargas reanudables por bloques: directorio (en el volumen de spool), tamaño de bloque por defecto y máximo, y segundos sin recibir bloques tras los que se descartan
+    UPLOAD_RESUMABLE_DIR = os.getenv('UPLOAD_RESUMABLE_DIR', os.path.join(UPLOAD_SPOOL_DIR, 'reanudables'))
+    UPLOAD_RESUMABLE_CHUNK_SIZE = int(os.getenv('UPLOAD_RESUMABLE_CHUNK_SIZE', 64 * 1024 * 1024))
+    UPLOAD_RESUMABLE_MAX_CHUNK_SIZE = int(os.getenv('UPLOAD_RESUMABLE_MAX_CHUNK_SIZE', 512 * 1024 * 1024))
+    # Tamaño máximo en bytes del archivo completo de una carga reanudable
+    UPLOAD_RESUMABLE_MAX_SIZE = int(os.getenv('UPLOAD_RESUMABLE_MAX_SIZE', 20 * 1024 * 1024 * 1024))
+    UPLOAD_RESUMABLE_TTL = int(os.getenv('UPLOAD_RESUMABLE_TTL', 86400))
+    # Filas por bloque al cargar archivos guardados en disco cuando UPLOAD_CHUNK_SIZE es 0
+    # (cola asíncrona y cargas reanudables: nunca se leen completos en memoria)
+    UPLOAD_FILE_CHUNK_SIZE = int(os.getenv('UPLOAD_FILE_CHUNK_SIZE', 100000)) or 100000
+    # Filas por bloque al leer un archivo para validarlo por muestreo (validación previa)
+    VALIDATION_SAMPLE_CHUNK_SIZE = int(os.getenv('VALIDATION_SAMPLE_CHUNK_SIZE', 100000))
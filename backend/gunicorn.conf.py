@@ -0,0 +1,60 @@
+# backend/gunicorn.conf.py
+# Configuración de gunicorn para producción: gunicorn -c gunicorn.conf.py wsgi:app
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:80')
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+# Cada worker abre hasta DB_POOL_SIZE (por defecto GUNICORN_THREADS) + DB_MAX_OVERFLOW conexiones
+# (ver SQLALCHEMY_ENGINE_OPTIONS en config.py): con los valores por defecto, 4 + 4 = 8
+conexiones_worker = int(os.getenv('DB_POOL_SIZE', threads)) + int(os.getenv('DB_MAX_OVERFLOW', 4))
+# Presupuesto total: workers * conexiones_worker <= DB_MAX_CONNECTIONS (max_connections de
+# Postgres, 100 por defecto) - DB_RESERVED_CONNECTIONS (workers de la cola, psql, migraciones);
+# con los valores por defecto, a lo sumo 10 workers * 8 = 80 conexiones
+presupuesto_conexiones = int(os.getenv('DB_MAX_CONNECTIONS', 100)) - int(os.getenv('DB_RESERVED_CONNECTIONS', 20))
+# Procesos: por defecto 2 * núcleos + 1, limitado por el presupuesto de conexiones
+workers = int(os.getenv(
+    'GUNICORN_WORKERS',
+    max(1, min(multiprocessing.cpu_count() * 2 + 1, presupuesto_conexiones // conexiones_worker))
+))
+# Las cargas síncronas de archivos grandes pueden tardar varios minutos
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 600))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Reinicia cada worker tras N solicitudes (0 = nunca), con variación para no reiniciarlos a la vez
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 50))
+# Carga la aplicación (pandas, reglas de validación) una vez en el maestro antes del fork
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Las métricas de los workers anteriores no deben sumarse a las de este arranque
+    directorio = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if directorio:
+        shutil.rmtree(directorio, ignore_errors=True)
+        os.makedirs(directorio, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # Las conexiones que el maestro haya abierto no se comparten entre procesos
+    from app import db
+    with worker.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from app.services.warmup_service import abrir_conexiones
+    abiertas = abrir_conexiones(worker.wsgi)
+    worker.log.info(f"Worker {worker.pid} listo con {abiertas} conexiones abiertas")
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
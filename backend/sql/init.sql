@@ -59,11 +59,49 @@ CREATE TABLE datos.validaciones_campos (
     mensaje_error VARCHAR(255) DEFAULT 'Error en la validación'
 );
 
+-- Las bases creadas con una versión anterior de este archivo se actualizan con los
+-- scripts de 'sql/migraciones' (ver el encabezado de cada uno)
+
+-- Índices para consultar en bloque los esquemas y validaciones de varios proyectos
+CREATE INDEX proyecto_esquemas_proyecto_id_idx ON datos.proyecto_esquemas (proyecto_id);
+CREATE INDEX validaciones_campos_proyecto_id_idx ON datos.validaciones_campos (proyecto_id);
+
+-- Crear la tabla 'trabajos_carga' en el esquema 'datos' (cola de cargas asíncronas)
+CREATE TABLE datos.trabajos_carga (
+    id SERIAL PRIMARY KEY,
+    proyecto_id INTEGER REFERENCES datos.proyecto_validaciones(id) ON DELETE SET NULL,
+    modo VARCHAR(20) NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+    nombre_archivo VARCHAR(255) NOT NULL,
+    ruta_archivo VARCHAR(500) NOT NULL,
+    opciones JSONB DEFAULT NULL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    worker VARCHAR(100) DEFAULT NULL,
+    codigo_respuesta INTEGER DEFAULT NULL,
+    resultado JSONB DEFAULT NULL,
+    fecha_creacion TIMESTAMP DEFAULT NOW(),
+    fecha_inicio TIMESTAMP DEFAULT NULL,
+    fecha_fin TIMESTAMP DEFAULT NULL
+);
+
+-- Índice para que los workers reclamen trabajos pendientes sin recorrer la tabla
+CREATE INDEX trabajos_carga_estado_idx ON datos.trabajos_carga (estado, id);
+
+-- Crear la tabla 'versiones_cache' en el esquema 'datos': un contador por recurso
+-- (`proyectos`, `proyecto:<id>`, `validaciones`) del que se derivan los ETag de las
+-- respuestas GET, compartido por todos los procesos
+CREATE TABLE datos.versiones_cache (
+    recurso VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
 -- Otorgar todos los privilegios en las tablas al usuario 'intanis'
 GRANT ALL PRIVILEGES ON TABLE datos.proyecto_validaciones TO intanis;
 GRANT ALL PRIVILEGES ON TABLE datos.proyecto_esquemas TO intanis;
 GRANT ALL PRIVILEGES ON TABLE datos.validaciones_definidas TO intanis;
 GRANT ALL PRIVILEGES ON TABLE datos.validaciones_campos TO intanis;
+GRANT ALL PRIVILEGES ON TABLE datos.trabajos_carga TO intanis;
+GRANT ALL PRIVILEGES ON TABLE datos.versiones_cache TO intanis;
 
 -- Crear el trigger para asignar un ID secuencial en la tabla 'proyecto_validaciones'
 CREATE OR REPLACE FUNCTION datos.set_sequential_id()
@@ -78,4 +116,21 @@ $$ LANGUAGE plpgsql;
 CREATE TRIGGER trg_set_sequential_id
 BEFORE INSERT ON datos.proyecto_validaciones
 FOR EACH ROW
-EXECUTE FUNCTION datos.set_sequential_id();
\ No newline at end of file
+EXECUTE FUNCTION datos.set_sequential_id();
+
+-- Incrementar la versión del catálogo de validaciones ante cualquier cambio en
+-- 'validaciones_definidas', que se modifica fuera de la API
+CREATE OR REPLACE FUNCTION datos.incrementar_version_validaciones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO datos.versiones_cache (recurso, version) VALUES ('validaciones', 1)
+    ON CONFLICT (recurso) DO UPDATE SET version = datos.versiones_cache.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Asignar el trigger a la tabla 'validaciones_definidas'
+CREATE TRIGGER trg_version_validaciones
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON datos.validaciones_definidas
+FOR EACH STATEMENT
+EXECUTE FUNCTION datos.incrementar_version_validaciones();
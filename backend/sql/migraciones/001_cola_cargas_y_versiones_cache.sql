@@ -0,0 +1,84 @@
+-- Migración para bases creadas con una versión anterior de init.sql: agrega la cola de
+-- cargas asíncronas ('trabajos_carga'), los contadores de versión de las respuestas
+-- GET ('versiones_cache'), los índices por proyecto y el trigger sobre
+-- 'validaciones_definidas'. Es idempotente: puede aplicarse más de una vez y sobre una
+-- base creada con el init.sql actual sin cambiar nada.
+--
+-- init.sql solo se ejecuta al crear el volumen de datos de PostgreSQL, por eso las bases
+-- existentes necesitan este script. Aplicarlo con el mismo usuario que ejecutó init.sql
+-- (el dueño de las tablas, normalmente el superusuario) antes de desplegar la nueva
+-- versión de la API y del worker:
+--
+--     psql -h <host> -U postgres -d levis -v ON_ERROR_STOP=1 \
+--         -f backend/sql/migraciones/001_cola_cargas_y_versiones_cache.sql
+--
+-- Con docker-compose:
+--
+--     docker compose exec -T db sh -c 'psql -U "$POSTGRES_USER" -d levis -v ON_ERROR_STOP=1' \
+--         < backend/sql/migraciones/001_cola_cargas_y_versiones_cache.sql
+--
+-- El entrypoint de la imagen de PostgreSQL no ejecuta los subdirectorios de
+-- /docker-entrypoint-initdb.d, así que este script no corre al crear una base nueva.
+--
+-- Los índices se crean sin CONCURRENTLY, dentro de la transacción: bloquean las
+-- escrituras sobre 'proyecto_esquemas' y 'validaciones_campos' mientras se construyen,
+-- que en estas tablas de catálogo es un instante.
+
+BEGIN;
+
+-- Índices para consultar en bloque los esquemas y validaciones de varios proyectos
+CREATE INDEX IF NOT EXISTS proyecto_esquemas_proyecto_id_idx ON datos.proyecto_esquemas (proyecto_id);
+CREATE INDEX IF NOT EXISTS validaciones_campos_proyecto_id_idx ON datos.validaciones_campos (proyecto_id);
+
+-- Crear la tabla 'trabajos_carga' en el esquema 'datos' (cola de cargas asíncronas)
+CREATE TABLE IF NOT EXISTS datos.trabajos_carga (
+    id SERIAL PRIMARY KEY,
+    proyecto_id INTEGER REFERENCES datos.proyecto_validaciones(id) ON DELETE SET NULL,
+    modo VARCHAR(20) NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+    nombre_archivo VARCHAR(255) NOT NULL,
+    ruta_archivo VARCHAR(500) NOT NULL,
+    opciones JSONB DEFAULT NULL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    worker VARCHAR(100) DEFAULT NULL,
+    codigo_respuesta INTEGER DEFAULT NULL,
+    resultado JSONB DEFAULT NULL,
+    fecha_creacion TIMESTAMP DEFAULT NOW(),
+    fecha_inicio TIMESTAMP DEFAULT NULL,
+    fecha_fin TIMESTAMP DEFAULT NULL
+);
+
+-- Índice para que los workers reclamen trabajos pendientes sin recorrer la tabla
+CREATE INDEX IF NOT EXISTS trabajos_carga_estado_idx ON datos.trabajos_carga (estado, id);
+
+-- Crear la tabla 'versiones_cache' en el esquema 'datos': un contador por recurso
+-- (`proyectos`, `proyecto:<id>`, `validaciones`) del que se derivan los ETag de las
+-- respuestas GET, compartido por todos los procesos
+CREATE TABLE IF NOT EXISTS datos.versiones_cache (
+    recurso VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Otorgar todos los privilegios en las tablas nuevas al usuario 'intanis'
+GRANT ALL PRIVILEGES ON TABLE datos.trabajos_carga TO intanis;
+GRANT ALL PRIVILEGES ON TABLE datos.versiones_cache TO intanis;
+
+-- Incrementar la versión del catálogo de validaciones ante cualquier cambio en
+-- 'validaciones_definidas', que se modifica fuera de la API
+CREATE OR REPLACE FUNCTION datos.incrementar_version_validaciones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO datos.versiones_cache (recurso, version) VALUES ('validaciones', 1)
+    ON CONFLICT (recurso) DO UPDATE SET version = datos.versiones_cache.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Asignar el trigger a la tabla 'validaciones_definidas'
+DROP TRIGGER IF EXISTS trg_version_validaciones ON datos.validaciones_definidas;
+CREATE TRIGGER trg_version_validaciones
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON datos.validaciones_definidas
+FOR EACH STATEMENT
+EXECUTE FUNCTION datos.incrementar_version_validaciones();
+
+COMMIT;
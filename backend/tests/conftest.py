@@ -0,0 +1,16 @@
+# backend/tests/conftest.py
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    """
+    Aplicación con la configuración del entorno; las pruebas no abren conexiones a la
+    base de datos.
+    """
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        yield app
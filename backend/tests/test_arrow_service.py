@@ -0,0 +1,26 @@
+# backend/tests/test_arrow_service.py
+import io
+from types import SimpleNamespace
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.services import arrow_service
+from app.services.arrow_service import FORMATO_PARQUET, LectorArrow
+
+
+def test_parquet_sin_chunksize_se_lee_por_lotes(app, monkeypatch):
+    monkeypatch.setattr(arrow_service, 'TAMANO_LOTE_PARQUET', 2)
+    esquemas = [SimpleNamespace(
+        campo_nombre='id', tipo_dato='integer', requerido=False, longitud_maxima=None,
+        valores_permitidos=None, es_clave_primaria=True, es_unico=False
+    )]
+    stream = io.BytesIO()
+    pq.write_table(pa.table({'id': [1, 2, 3, 4, 5]}), stream)
+    stream.seek(0)
+
+    bloques = list(LectorArrow(stream, FORMATO_PARQUET).bloques(esquemas, {}, 0))
+
+    assert [len(df) for df in bloques] == [2, 2, 1]
+    assert pd.concat(bloques).index.tolist() == [0, 1, 2, 3, 4]
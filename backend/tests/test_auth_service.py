@@ -0,0 +1,124 @@
+# backend/tests/test_auth_service.py
+import time
+import urllib.error
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from app.services import auth_service
+from app.services.auth_service import get_signing_key, validate_token
+
+ISSUER = "https://login.microsoftonline.com/tenant/v2.0"
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Jwks:
+    """
+    Reemplazo de `_descargar_jwks` que cuenta las descargas y devuelve las claves indicadas.
+    """
+    def __init__(self, *kids):
+        self.kids = list(kids)
+        self.descargas = 0
+        self.error = None
+
+    def __call__(self, jwks_url):
+        self.descargas += 1
+        if self.error is not None:
+            raise self.error
+        return {kid: SimpleNamespace(key_id=kid, key='clave') for kid in self.kids}
+
+
+def token(kid, exp):
+    return jwt.encode(
+        {"aud": "cliente", "iss": ISSUER, "exp": exp}, 'secreto' * 8, algorithm='HS256', headers={"kid": kid}
+    )
+
+
+@pytest.fixture
+def entorno(app, monkeypatch):
+    monkeypatch.setenv('JWKS_URL', 'file:///jwks.json')
+    monkeypatch.setenv('CLIENT_ID', 'cliente')
+    monkeypatch.setenv('TENANT_ID', 'tenant')
+    monkeypatch.setenv('JWKS_CACHE_TTL', '3600')
+    monkeypatch.setenv('JWKS_MIN_REFRESH', '30')
+    monkeypatch.setitem(auth_service._jwks_cache, "url", None)
+    monkeypatch.setitem(auth_service._jwks_cache, "claves", {})
+    monkeypatch.setitem(auth_service._jwks_cache, "fecha", 0.0)
+    monkeypatch.setattr(auth_service, '_tokens_cache', auth_service.OrderedDict())
+    reloj = Reloj()
+    monkeypatch.setattr(auth_service.time, 'monotonic', reloj)
+    jwks = Jwks('k1')
+    monkeypatch.setattr(auth_service, '_descargar_jwks', jwks)
+    return SimpleNamespace(reloj=reloj, jwks=jwks)
+
+
+def test_jwks_se_descarga_de_nuevo_al_vencer_el_ttl(entorno):
+    get_signing_key(token('k1', time.time() + 60))
+    entorno.reloj.ahora += 3599
+    get_signing_key(token('k1', time.time() + 60))
+    assert entorno.jwks.descargas == 1
+
+    entorno.reloj.ahora += 2
+    get_signing_key(token('k1', time.time() + 60))
+    assert entorno.jwks.descargas == 2
+
+
+def test_kid_desconocido_refresca_como_maximo_cada_jwks_min_refresh(entorno):
+    entorno.reloj.ahora += 1
+    get_signing_key(token('k1', time.time() + 60))
+    entorno.jwks.kids.append('k2')
+
+    # Dentro de JWKS_MIN_REFRESH un kid desconocido no vuelve a descargar el JWKS
+    entorno.reloj.ahora += 10
+    with pytest.raises(jwt.InvalidTokenError):
+        get_signing_key(token('k2', time.time() + 60))
+    assert entorno.jwks.descargas == 1
+
+    entorno.reloj.ahora += 21
+    assert get_signing_key(token('k2', time.time() + 60)).key_id == 'k2'
+    assert entorno.jwks.descargas == 2
+
+
+def test_error_de_descarga_conserva_las_claves_en_cache(entorno):
+    get_signing_key(token('k1', time.time() + 60))
+    entorno.jwks.error = urllib.error.URLError('sin conexión')
+    entorno.reloj.ahora += 3601
+
+    assert get_signing_key(token('k1', time.time() + 60)).key_id == 'k1'
+    assert entorno.jwks.descargas == 2
+
+
+@pytest.mark.parametrize("error", [urllib.error.URLError('sin conexión'), TimeoutError('timed out')])
+def test_error_de_descarga_sin_cache_responde_503(entorno, error):
+    entorno.jwks.error = error
+
+    respuesta, codigo = validate_token(token('k1', time.time() + 60))
+
+    assert codigo == 503
+
+
+def test_token_en_cache_vence_en_exp(entorno, monkeypatch):
+    ahora = time.time()
+    monkeypatch.setattr(auth_service.time, 'time', lambda: ahora)
+    valor = token('k1', ahora + 10)
+
+    assert validate_token(valor)["aud"] == "cliente"
+    # Se responde desde la caché aunque el JWKS ya no esté disponible
+    entorno.jwks.kids = []
+    entorno.reloj.ahora += 3601
+    assert validate_token(valor)["aud"] == "cliente"
+    assert entorno.jwks.descargas == 1
+
+    # Al llegar a `exp` la entrada se descarta y el token se valida de nuevo
+    monkeypatch.setattr(auth_service.time, 'time', lambda: ahora + 10)
+    respuesta, codigo = validate_token(valor)
+    assert codigo == 401
+    assert entorno.jwks.descargas == 2
@@ -0,0 +1,27 @@
+# backend/tests/test_error_report_service.py
+import pytest
+
+from app.services.error_report_service import FORMATO_CSV, FORMATO_JSON, crear_reporte, opciones_reporte
+
+
+def test_sin_max_errores_no_hay_limite(app):
+    opciones = opciones_reporte({})
+    errores = [
+        {"fila": fila, "campo": "codigo", "regla": "no_vacio", "valor_incorrecto": None, "mensaje_error": "vacío"}
+        for fila in range(2000)
+    ]
+
+    assert opciones == {"max_errores": 0, "formato": FORMATO_JSON}
+    with crear_reporte(opciones) as reporte:
+        assert not reporte.agregar(errores)
+    assert reporte.total == 2000
+
+
+def test_max_errores_de_la_solicitud(app):
+    assert opciones_reporte({'max_errores': '10', 'reporte_errores': 'CSV'}) == {"max_errores": 10, "formato": FORMATO_CSV}
+
+
+@pytest.mark.parametrize('valor', ['-1', 'diez'])
+def test_max_errores_invalido(app, valor):
+    with pytest.raises(ValueError):
+        opciones_reporte({'max_errores': valor})
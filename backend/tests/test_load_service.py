@@ -0,0 +1,40 @@
+# backend/tests/test_load_service.py
+from types import SimpleNamespace
+
+import pandas as pd
+
+from app.services.load_service import FlujoCsv
+
+
+def campo(nombre, tipo_dato):
+    return SimpleNamespace(campo_nombre=nombre, tipo_dato=tipo_dato)
+
+
+def test_flujo_csv_conserva_la_hora_de_los_timestamp():
+    df = pd.DataFrame({
+        "dia": pd.to_datetime(["2024-01-01", None]),
+        "momento": pd.to_datetime(["2024-01-01 10:30:00", "2024-02-03 04:05:06.789"], format="ISO8601"),
+        "utc": pd.to_datetime(["2024-01-01 10:30:00+02:00", None], utc=True),
+    })
+    esquemas = [campo("dia", "date"), campo("momento", "timestamp"), campo("utc", "timestamp")]
+
+    lineas = FlujoCsv(df, 1, esquemas).read().splitlines()
+
+    assert lineas == [
+        "2024-01-01,2024-01-01 10:30:00.000000,2024-01-01 08:30:00.000000",
+        ",2024-02-03 04:05:06.789000,",
+    ]
+
+
+def test_flujo_csv_lee_por_partes():
+    df = pd.DataFrame({"a": range(5)})
+    flujo = FlujoCsv(df, 2)
+
+    partes = []
+    while True:
+        parte = flujo.read(3)
+        if not parte:
+            break
+        partes.append(parte)
+
+    assert "".join(partes) == "0\n1\n2\n3\n4\n"
@@ -0,0 +1,81 @@
+# backend/tests/test_reanudable_service.py
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import reanudable_service
+from app.services.reanudable_service import (
+    ARCHIVO_DATOS, TAMANO_BLOQUE_MINIMO, ErrorCargaReanudable, crear_carga, finalizar_carga, recibir_bloque
+)
+
+PROYECTO = SimpleNamespace(id=1)
+
+
+@pytest.fixture
+def directorio(app, tmp_path):
+    app.config['UPLOAD_RESUMABLE_DIR'] = str(tmp_path)
+    return tmp_path
+
+
+def test_tamano_mayor_al_maximo(app, directorio):
+    app.config['UPLOAD_RESUMABLE_MAX_SIZE'] = 10 * TAMANO_BLOQUE_MINIMO
+
+    with pytest.raises(ErrorCargaReanudable) as error:
+        crear_carga(PROYECTO, 'datos.csv', 10 * TAMANO_BLOQUE_MINIMO + 1, 'agregar', {}, TAMANO_BLOQUE_MINIMO)
+
+    assert error.value.codigo == 413
+    assert os.listdir(directorio) == []
+
+
+def test_error_al_reservar_elimina_el_directorio(app, directorio, monkeypatch):
+    def abrir(ruta, modo='r', **kwargs):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(reanudable_service, 'open', abrir, raising=False)
+
+    with pytest.raises(ErrorCargaReanudable) as error:
+        crear_carga(PROYECTO, 'datos.csv', TAMANO_BLOQUE_MINIMO, 'agregar', {}, TAMANO_BLOQUE_MINIMO)
+
+    assert error.value.codigo == 507
+    assert os.listdir(directorio) == []
+
+
+def test_bloque_durante_la_finalizacion(app, directorio):
+    carga = crear_carga(PROYECTO, 'datos.csv', 3, 'agregar', {}, TAMANO_BLOQUE_MINIMO)
+    upload_id = carga["upload_id"]
+    recibir_bloque(upload_id, 0, io.BytesIO(b"a,b"), 3)
+    # `finalizar_carga` reclama la carga renombrando el archivo de datos
+    os.rename(
+        os.path.join(directorio, upload_id, ARCHIVO_DATOS),
+        os.path.join(directorio, upload_id, f"{ARCHIVO_DATOS}.finalizando")
+    )
+
+    with pytest.raises(ErrorCargaReanudable) as error:
+        recibir_bloque(upload_id, 0, io.BytesIO(b"a,b"), 3)
+
+    assert error.value.codigo == 409
+
+
+def test_finalizar_con_bloque_reescribiendose(app, directorio, tmp_path_factory, monkeypatch):
+    carga = crear_carga(PROYECTO, 'datos.csv', 3, 'agregar', {}, TAMANO_BLOQUE_MINIMO)
+    upload_id = carga["upload_id"]
+    recibir_bloque(upload_id, 0, io.BytesIO(b"a,b"), 3)
+    destino = str(tmp_path_factory.mktemp('spool') / 'datos.csv')
+    estado_carga = reanudable_service.estado_carga
+
+    def estado_y_reenvio(upload_id):
+        # Un reenvío del bloque quita su marca justo después de verificar que la carga está completa
+        estado = estado_carga(upload_id)
+        os.remove(os.path.join(directorio, upload_id, 'bloques', '0.sha256'))
+        return estado
+
+    monkeypatch.setattr(reanudable_service, 'estado_carga', estado_y_reenvio)
+
+    with pytest.raises(ErrorCargaReanudable) as error:
+        finalizar_carga(upload_id, destino)
+
+    assert error.value.codigo == 409
+    assert os.path.exists(os.path.join(directorio, upload_id, ARCHIVO_DATOS))
+    assert not os.path.exists(destino)
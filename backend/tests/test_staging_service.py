@@ -0,0 +1,44 @@
+# backend/tests/test_staging_service.py
+import contextlib
+import logging
+from types import SimpleNamespace
+
+from sqlalchemy.exc import ProgrammingError
+
+from app import db
+from app.services.staging_service import TablaStaging
+
+
+@contextlib.contextmanager
+def transaccion_anidada():
+    yield
+
+
+def test_intercambiar_elimina_la_tabla_anterior_en_la_transaccion(app, monkeypatch):
+    sentencias = []
+
+    def ejecutar(sentencia, *args, **kwargs):
+        sentencias.append(str(sentencia))
+        return SimpleNamespace(scalar=lambda: None)
+
+    monkeypatch.setattr(db.session, 'execute', ejecutar)
+    monkeypatch.setattr(db.session, 'begin_nested', transaccion_anidada)
+    staging = TablaStaging('clientes')
+
+    staging.intercambiar()
+
+    assert sentencias[-1].strip() == f"DROP TABLE datos.{staging.anterior};"
+
+
+def test_error_al_eliminar_la_tabla_anterior_se_registra(app, monkeypatch, caplog):
+    def ejecutar(sentencia, *args, **kwargs):
+        raise ProgrammingError(str(sentencia), {}, Exception('cannot drop table because other objects depend on it'))
+
+    monkeypatch.setattr(db.session, 'execute', ejecutar)
+    monkeypatch.setattr(db.session, 'begin_nested', transaccion_anidada)
+    staging = TablaStaging('clientes')
+
+    with caplog.at_level(logging.ERROR, logger='app.services.staging_service'):
+        assert not staging.eliminar_anterior()
+
+    assert staging.anterior in caplog.text
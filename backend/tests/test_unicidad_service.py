@@ -0,0 +1,85 @@
+# backend/tests/test_unicidad_service.py
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import unicidad_service
+from app.services.unicidad_service import VerificadorUnicidad
+from app.services.upload_service import leer_bloques, leer_encabezado
+
+
+def campo(nombre, tipo_dato, es_clave_primaria=False, es_unico=False):
+    return SimpleNamespace(
+        campo_nombre=nombre, tipo_dato=tipo_dato, requerido=False, longitud_maxima=None,
+        valores_permitidos=None, es_clave_primaria=es_clave_primaria, es_unico=es_unico
+    )
+
+
+def errores_por_bloques(app, esquemas, contenido, chunksize):
+    app.config['CSV_PARSER_ENGINE'] = 'c'
+    stream = io.BytesIO(contenido)
+    columnas = leer_encabezado(stream)
+    verificador = VerificadorUnicidad(esquemas)
+    errores = []
+    for df in leer_bloques(stream, columnas, esquemas, chunksize):
+        errores.extend(verificador.validar(df))
+    return [(error["fila"], error["regla"]) for error in errores]
+
+
+def test_unico_numerico_repetido_en_bloques_con_distinto_tipo(app):
+    # El primer bloque se lee como int64 y el segundo, por el 2.5, como float64
+    esquemas = [campo('id', 'integer', es_clave_primaria=True), campo('monto', 'number', es_unico=True)]
+    contenido = b"id,monto\n1,1\n2,2\n3,1\n4,2.5\n"
+
+    assert errores_por_bloques(app, esquemas, contenido, 2) == [(3, 'es_unico')]
+
+
+def test_clave_entera_repetida_con_nulos_en_otro_bloque(app):
+    # El bloque con un nulo se lee como float64; la clave repetida igual se detecta
+    esquemas = [campo('id', 'integer', es_clave_primaria=True), campo('codigo', 'integer', es_unico=True)]
+    contenido = b"id,codigo\n1,10\n2,20\n3,\n4,10\n"
+
+    assert errores_por_bloques(app, esquemas, contenido, 2) == [(4, 'es_unico')]
+
+
+@pytest.mark.parametrize("chunksize", [0, 1, 2])
+def test_clave_compuesta_igual_con_cualquier_tamano_de_bloque(app, chunksize):
+    esquemas = [campo('pais', 'varchar', es_clave_primaria=True), campo('numero', 'integer', es_clave_primaria=True)]
+    contenido = b"pais,numero\nAR,1\nCL,1\nAR,1\nAR,\n"
+
+    assert errores_por_bloques(app, esquemas, contenido, chunksize) == [(3, 'es_clave_primaria'), (4, 'es_clave_primaria')]
+
+
+def test_fechas_con_distinta_unidad():
+    esquemas = [campo('dia', 'date', es_unico=True)]
+    verificador = VerificadorUnicidad(esquemas)
+    primero = pd.DataFrame({'dia': pd.to_datetime(['2024-01-01']).astype('datetime64[ms]')})
+    segundo = pd.DataFrame({'dia': pd.to_datetime(['2024-01-01']).astype('datetime64[s]')}, index=[1])
+
+    assert verificador.validar(primero) == []
+    assert [error["fila"] for error in verificador.validar(segundo)] == [2]
+
+
+def test_colision_de_hash_no_es_un_duplicado(app, monkeypatch):
+    # Todos los valores con el mismo hash: solo los valores iguales cuentan como repetidos
+    monkeypatch.setattr(
+        unicidad_service.pd.util, 'hash_pandas_object',
+        lambda df, index=False: pd.Series(np.zeros(len(df), dtype=np.uint64))
+    )
+    esquemas = [campo('id', 'integer', es_clave_primaria=True), campo('codigo', 'varchar', es_unico=True)]
+    contenido = b"id,codigo\n1,a\n2,b\n3,c\n4,b\n5,d\n6,a\n"
+
+    assert errores_por_bloques(app, esquemas, contenido, 2) == [(4, 'es_unico'), (6, 'es_unico')]
+
+
+def test_muchos_bloques_detectan_repetidos_de_cualquier_bloque_anterior(app):
+    esquemas = [campo('id', 'integer', es_clave_primaria=True)]
+    ids = list(range(1, 201)) + [1, 57, 128, 200]
+    contenido = ("id\n" + "\n".join(str(valor) for valor in ids) + "\n").encode()
+
+    assert errores_por_bloques(app, esquemas, contenido, 7) == [
+        (201, 'es_clave_primaria'), (202, 'es_clave_primaria'), (203, 'es_clave_primaria'), (204, 'es_clave_primaria')
+    ]
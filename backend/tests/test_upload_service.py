@@ -0,0 +1,99 @@
+# backend/tests/test_upload_service.py
+import io
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app import db
+from app.services.upload_service import ErrorCarga, crear_tabla_temporal, fusionar_tabla, leer_bloques, leer_encabezado
+
+
+def campo(nombre, tipo_dato, valores_permitidos=None):
+    return SimpleNamespace(
+        campo_nombre=nombre, tipo_dato=tipo_dato, requerido=False, longitud_maxima=None,
+        valores_permitidos=valores_permitidos, es_clave_primaria=False, es_unico=False
+    )
+
+
+ESQUEMAS = [campo('codigo', 'varchar'), campo('importe', 'varchar'), campo('estado', 'varchar', ['A', 'B']), campo('n', 'integer')]
+CSV = b"codigo,importe,estado,n\n007,1.50,A,1\n0100,0100,B,\n,2,A,3\n"
+
+
+def leer(motor, chunksize):
+    stream = io.BytesIO(CSV)
+    columnas = leer_encabezado(stream)
+    bloques = list(leer_bloques(stream, columnas, ESQUEMAS, chunksize))
+    # Las columnas con valores permitidos se leen como `category` en cada bloque
+    assert all(isinstance(df['estado'].dtype, pd.CategoricalDtype) for df in bloques)
+    return pd.concat(bloques)
+
+
+@pytest.mark.parametrize("motor,chunksize", [("auto", 0), ("pyarrow", 0), ("c", 0), ("c", 2), ("auto", 2)])
+def test_texto_conserva_ceros_a_la_izquierda(app, motor, chunksize):
+    app.config['CSV_PARSER_ENGINE'] = motor
+    df = leer(motor, chunksize)
+
+    assert df['codigo'].tolist()[:2] == ['007', '0100']
+    assert pd.isna(df['codigo'].iloc[2])
+    assert df['importe'].tolist() == ['1.50', '0100', '2']
+    assert df['n'].dtype == 'Int64'
+
+
+def test_pyarrow_con_chunksize_lee_por_bloques(app):
+    app.config['CSV_PARSER_ENGINE'] = 'pyarrow'
+    stream = io.BytesIO(CSV)
+    columnas = leer_encabezado(stream)
+
+    bloques = list(leer_bloques(stream, columnas, ESQUEMAS, 2))
+
+    assert [len(df) for df in bloques] == [2, 1]
+    assert bloques[0]['codigo'].tolist() == ['007', '0100']
+
+
+def test_motores_leen_los_mismos_valores(app):
+    app.config['CSV_PARSER_ENGINE'] = 'pyarrow'
+    con_pyarrow = leer('pyarrow', 0)
+    app.config['CSV_PARSER_ENGINE'] = 'c'
+    con_c = leer('c', 2)
+
+    for columna in ('codigo', 'importe', 'estado', 'n'):
+        assert con_pyarrow[columna].astype(object).where(con_pyarrow[columna].notna(), None).tolist() == \
+            con_c[columna].astype(object).where(con_c[columna].notna(), None).tolist()
+
+
+def test_eliminar_faltantes_rechaza_archivo_sin_filas(app, monkeypatch):
+    sentencias = []
+
+    def ejecutar(sentencia, *args, **kwargs):
+        sentencias.append(str(sentencia))
+        return SimpleNamespace(scalar=lambda: 0)
+
+    monkeypatch.setattr(db.session, 'execute', ejecutar)
+    esquemas = [SimpleNamespace(campo_nombre='id', es_clave_primaria=True), campo('nombre', 'text')]
+
+    with pytest.raises(ErrorCarga):
+        fusionar_tabla('clientes', 'pg_temp.carga', esquemas, eliminar_faltantes=True)
+
+    assert not any('DELETE' in sentencia for sentencia in sentencias)
+
+
+def test_upsert_sin_indice_clave_no_lo_construye(app, monkeypatch):
+    sentencias = []
+
+    def ejecutar(sentencia, parametros=None, *args, **kwargs):
+        sentencias.append(str(sentencia))
+        return SimpleNamespace(scalar=lambda: False)
+
+    monkeypatch.setattr(db.session, 'execute', ejecutar)
+    esquemas = [
+        SimpleNamespace(campo_nombre='codigo', es_clave_primaria=True),
+        SimpleNamespace(campo_nombre='nombre', es_clave_primaria=False)
+    ]
+
+    with pytest.raises(ErrorCarga) as error:
+        crear_tabla_temporal('clientes', esquemas)
+
+    assert 'codigo' in error.value.respuesta["error"]
+    assert len(sentencias) == 1
+    assert not any('CREATE' in sentencia for sentencia in sentencias)
@@ -0,0 +1,89 @@
+# backend/tests/test_validation_service.py
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pandas as pd
+
+from app.services import validation_service
+from app.services.validation_service import Validador, reglas_esquema, validar_dataframe
+
+
+def campo(nombre, tipo_dato, requerido=False, longitud_maxima=None, es_clave_primaria=False):
+    return SimpleNamespace(
+        campo_nombre=nombre, tipo_dato=tipo_dato, requerido=requerido, longitud_maxima=longitud_maxima,
+        valores_permitidos=None, es_clave_primaria=es_clave_primaria, es_unico=False
+    )
+
+
+def test_restricciones_del_esquema_se_informan_como_errores():
+    esquemas = [
+        campo('id', 'integer', requerido=True, es_clave_primaria=True),
+        campo('nombre', 'varchar', requerido=True, longitud_maxima=3),
+        campo('nota', 'varchar', longitud_maxima=2),
+        campo('n', 'integer', requerido=True),
+    ]
+    df = pd.DataFrame({
+        'id': [1, 2, 3],
+        'nombre': pd.array(['abc', None, 'abcd'], dtype='string'),
+        'nota': pd.array([None, 'xyz', 'ok'], dtype='string'),
+        'n': [1.0, None, 3.0],
+    })
+
+    reglas = reglas_esquema(esquemas)
+    errores = validar_dataframe(df, reglas)
+
+    # La clave primaria vacía la informa la verificación de unicidad
+    assert [(regla.campo, regla.nombre_regla) for regla in reglas] == [
+        ('nombre', 'requerido'), ('nombre', 'longitud_maxima'), ('nota', 'longitud_maxima'), ('n', 'requerido')
+    ]
+    assert [(error["fila"], error["campo"], error["regla"]) for error in errores] == [
+        (2, 'nombre', 'requerido'), (2, 'nota', 'longitud_maxima'), (2, 'n', 'requerido'),
+        (3, 'nombre', 'longitud_maxima'),
+    ]
+
+
+def test_longitud_maxima_en_columnas_categoricas():
+    reglas = reglas_esquema([campo('estado', 'varchar', longitud_maxima=1)])
+    df = pd.DataFrame({'estado': pd.Categorical(['A', 'BB', None, 'A'])})
+
+    errores = validar_dataframe(df, reglas)
+
+    assert [(error["fila"], error["valor_incorrecto"]) for error in errores] == [(2, 'BB')]
+
+
+class EjecutorSerie:
+    """
+    Reemplazo del pool que valida al enviar y registra cuántos fragmentos recibió.
+    """
+    def __init__(self):
+        self.enviados = 0
+
+    def submit(self, funcion, fragmento):
+        self.enviados += 1
+        futuro = Future()
+        futuro.set_result(funcion(fragmento))
+        return futuro
+
+
+def test_max_errores_deja_de_enviar_fragmentos_al_pool(monkeypatch):
+    reglas = reglas_esquema([campo('nombre', 'varchar', requerido=True)])
+    monkeypatch.setattr(validation_service, '_reglas_worker', reglas)
+    df = pd.DataFrame({'nombre': pd.array([None] * 100, dtype='string')})
+    validador = Validador(reglas, workers=2, filas_por_fragmento=10)
+    validador._executor = EjecutorSerie()
+
+    errores = validador.validar(df, max_errores=15)
+
+    # Dos fragmentos alcanzan el límite; a lo sumo `workers` fragmentos más quedan enviados
+    assert [error["fila"] for error in errores] == list(range(1, 21))
+    assert validador._executor.enviados <= 4
+
+
+def test_pool_de_procesos_valida_igual_que_en_serie():
+    reglas = reglas_esquema([campo('nombre', 'varchar', requerido=True, longitud_maxima=2)])
+    df = pd.DataFrame({'nombre': pd.array(['ab', None, 'abc', 'a'] * 10, dtype='string')})
+
+    with Validador(reglas, workers=2, filas_por_fragmento=7) as validador:
+        errores = validador.validar(df)
+
+    assert errores == validar_dataframe(df, reglas)
@@ -0,0 +1,56 @@
+# backend/tests/test_validations.py
+import importlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.validation_service import validar_escalar
+
+HOY = datetime.now().strftime('%Y-%m-%d')
+MANANA = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+
+# Reglas de `app/services/validations` con sus parámetros
+REGLAS = [
+    ('longitud_maxima', {'max': 3}),
+    ('longitud_minima', {'min': 3}),
+    ('mayor_a_cero', {}),
+    ('no_futuro', {}),
+    ('no_vacio', {}),
+    ('positivo', {}),
+    ('rango', {'min': 0, 'max': 10}),
+]
+
+# Columnas con los tipos que producen la lectura de CSV, Parquet y Arrow
+COLUMNAS = {
+    'objeto': pd.Series([
+        'abc', 'ab', 'abcd', '', '   ', None, np.nan, pd.NA, 0, -1, 1, 0.0, 1.5, 10, 10.5, '5', '-3',
+        '0', '1e3', ' 7 ', 'x', True, False, '2020-01-01', HOY, MANANA, '2020-13-01', '2020-1-1',
+        datetime(2020, 1, 1), [1], float('inf'), '-inf'
+    ], dtype=object),
+    'texto': pd.Series(['abc', '', ' ', None, '5', '-1', '0', '10', '11', '2020-02-30', HOY, MANANA], dtype='string'),
+    'real': pd.Series([0.0, -1.0, 1.0, 10.0, 10.000001, np.nan, 1e-9, float('inf')]),
+    'entero': pd.Series([0, -1, 1, 10, 11, None], dtype='Int64'),
+    'entero_numpy': pd.Series([0, -1, 1, 10, 11], dtype='int64'),
+    'booleano': pd.Series([True, False, None], dtype='boolean'),
+    'fecha': pd.Series(pd.to_datetime(['2020-01-01', None, MANANA, HOY])),
+}
+
+
+def mensajes(errores):
+    return {etiqueta: mensaje for etiqueta, mensaje in errores.items()}
+
+
+@pytest.mark.parametrize("columna", list(COLUMNAS))
+@pytest.mark.parametrize("nombre_regla,parametros", REGLAS, ids=[nombre for nombre, _ in REGLAS])
+def test_validate_series_coincide_con_validate(nombre_regla, parametros, columna):
+    modulo = importlib.import_module(f'app.services.validations.{nombre_regla}')
+    values = COLUMNAS[columna]
+    # Desordenar el índice: los errores se informan por etiqueta de fila, no por posición
+    values = values.set_axis(pd.RangeIndex(len(values)) * 3 + 5)
+
+    columnar = modulo.validate_series(values, **parametros)
+    escalar = validar_escalar(values, modulo.validate, **parametros)
+
+    assert mensajes(columnar) == mensajes(escalar)
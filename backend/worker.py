@@ -0,0 +1,43 @@
+# backend/worker.py
+from app import create_app
+from app.services.job_service import reclamar_trabajo, procesar_trabajo
+from app.services.metrics_service import iniciar_servidor_metricas
+import logging
+import os
+import socket
+import time
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cargar la configuración de la aplicación
+app = create_app()
+
+
+def run_worker():
+    """
+    Bucle del worker de cargas: reclama trabajos pendientes de `datos.trabajos_carga` y
+    los procesa uno a uno. Se pueden ejecutar varios workers en paralelo.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    intervalo = app.config['UPLOAD_JOB_POLL_INTERVAL']
+    iniciar_servidor_metricas(app.config['METRICS_WORKER_PORT'])
+    logger.info(f"Worker de cargas {worker_id} iniciado")
+
+    while True:
+        with app.app_context():
+            try:
+                trabajo = reclamar_trabajo(worker_id)
+                if trabajo is None:
+                    time.sleep(intervalo)
+                    continue
+
+                logger.info(f"Procesando trabajo de carga {trabajo.id}")
+                procesar_trabajo(trabajo)
+            except Exception as e:
+                logger.error(f"Error en el worker de cargas: {str(e)}")
+                time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    run_worker()
@@ -0,0 +1,8 @@
+# backend/wsgi.py
+from app import create_app
+from app.services.warmup_service import precargar_validaciones
+
+# Punto de entrada de producción: gunicorn -c gunicorn.conf.py wsgi:app
+# (run.py queda para el servidor de desarrollo de Flask)
+app = create_app()
+precargar_validaciones()